@@ -14,7 +14,7 @@ current_dir = os.path.dirname(os.path.abspath(__file__))
 sys.path.append(current_dir)
 
 # 导入工具模块
-from utils.csv_handler import CSVHandler, create_default_goal_csv
+from utils.csv_handler import create_default_goal_csv, goal_csv_handler
 
 
 def setup_directories():
@@ -31,61 +31,63 @@ def setup_directories():
         print(f"创建目录: {directory}")
 
 
-def create_sample_goal():
+def create_sample_goal(file_path: str = 'data/goals.csv'):
     """
-    创建示例目标数据
+    创建示例目标数据（逐行追加到目标CSV的日志，不整体重写文件）
+    
+    Args:
+        file_path: 目标CSV文件路径
     """
-    try:
-        from tools.goal_tools import GoalManager
-        
-        goal_manager = GoalManager()
-        
-        # 检查是否已有目标数据
-        existing_goals = goal_manager.get_goals()
-        if existing_goals:
-            print(f"已存在 {len(existing_goals)} 个目标，跳过创建示例目标")
-            return
-        
-        # 创建示例目标
+    handler = goal_csv_handler(file_path)
+    
+    # 检查是否已有目标数据
+    existing_goals = handler.read_data()
+    if existing_goals:
+        print(f"已存在 {len(existing_goals)} 个目标，跳过创建示例目标")
+        return
+    
+    today = datetime.date.today()
+    now = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    sample_goals = [
+        # 阶段性目标示例
+        {
+            "title": "完成滴答清单MCP服务扩展功能",
+            "type": "phase",
+            "keywords": "滴答清单,MCP,目标管理,统计分析",
+            "description": "为滴答清单MCP服务添加目标管理和统计分析功能",
+            "start_date": today.strftime("%Y-%m-%d"),
+            "due_date": (today + datetime.timedelta(days=30)).strftime("%Y-%m-%d"),
+        },
+        # 习惯性目标示例
+        {
+            "title": "每周代码复查",
+            "type": "habit",
+            "keywords": "代码,复查,质量",
+            "description": "每周花时间复查代码，确保代码质量",
+            "frequency": "weekly:1,5",  # 周一和周五
+        },
+        # 永久性目标示例
+        {
+            "title": "保持代码库整洁",
+            "type": "permanent",
+            "keywords": "代码,整洁,维护",
+            "description": "持续保持代码库整洁，避免技术债务积累",
+        },
+    ]
+    
+    for goal in sample_goals:
         try:
-            # 阶段性目标示例
-            phase_goal = goal_manager.create_goal(
-                title="完成滴答清单MCP服务扩展功能",
-                goal_type="phase",
-                keywords="滴答清单,MCP,目标管理,统计分析",
-                description="为滴答清单MCP服务添加目标管理和统计分析功能",
-                start_date=datetime.date.today().strftime("%Y-%m-%d"),
-                due_date=(datetime.date.today() + datetime.timedelta(days=30)).strftime("%Y-%m-%d"),
-                progress=0
-            )
-            print(f"创建示例阶段性目标: {phase_goal['title']}")
-            
-            # 习惯性目标示例
-            habit_goal = goal_manager.create_goal(
-                title="每周代码复查",
-                goal_type="habit",
-                keywords="代码,复查,质量",
-                description="每周花时间复查代码，确保代码质量",
-                frequency="weekly:1,5",  # 周一和周五
-                progress=0
-            )
-            print(f"创建示例习惯性目标: {habit_goal['title']}")
-            
-            # 永久性目标示例
-            permanent_goal = goal_manager.create_goal(
-                title="保持代码库整洁",
-                goal_type="permanent",
-                keywords="代码,整洁,维护",
-                description="持续保持代码库整洁，避免技术债务积累",
-                progress=0
-            )
-            print(f"创建示例永久性目标: {permanent_goal['title']}")
-            
+            handler.append_row({
+                "id": str(uuid.uuid4()),
+                "status": "active",
+                "created_time": now,
+                "modified_time": now,
+                "progress": 0,
+                **goal,
+            })
+            print(f"创建示例目标: {goal['title']}")
         except Exception as e:
             print(f"创建示例目标失败: {str(e)}")
-    except ImportError as e:
-        print(f"导入GoalManager失败: {str(e)}")
-        print("跳过创建示例目标")
 
 
 def initialize_data():
@@ -6,15 +6,17 @@
 
 import os
 import sys
+import time
 import argparse
-import json
+import subprocess
+from collections import defaultdict
 from pathlib import Path
-import dotenv
-from mcp_server import create_server
-from tools.official_api import init_api
 
-# 加载环境变量（支持 .env）
-dotenv.load_dotenv()
+# 在导入任何 tools 模块之前载入 .env，导入时读取的配置（并发数、缓存路径、TTL 等）才能生效
+from utils.env import load_dotenv_once
+load_dotenv_once()
+
+# 服务模块导入较慢（fastmcp 等），在 main() 中按需导入，--profile-startup 时不加载
 
 def parse_args():
     """解析命令行参数"""
@@ -59,13 +61,64 @@ def parse_args():
         action="store_true",
         help="使用SSE传输方式而不是stdio"
     )
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="输出冷启动导入耗时分布后退出"
+    )
 
     return parser.parse_args()
 
+def profile_startup(top: int = 15) -> None:
+    """
+    在独立进程中以 -X importtime 冷启动导入服务模块，按顶层包汇总导入耗时，
+    再在当前进程计时 create_server（工具注册）
+    """
+    root = Path(__file__).resolve().parent
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import mcp_server"],
+        cwd=root, capture_output=True, text=True
+    )
+    by_package = defaultdict(int)
+    total_us = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        try:
+            self_us, cumulative_us = int(parts[0]), int(parts[1])
+        except ValueError:
+            # 表头行
+            continue
+        name = parts[2].strip()
+        by_package[name.split('.')[0]] += self_us
+        if name == "mcp_server":
+            total_us = cumulative_us
+
+    if result.returncode != 0:
+        print("导入 mcp_server 失败：")
+        print(result.stderr[-2000:])
+        return
+
+    print(f"冷启动导入 mcp_server 共 {total_us / 1000:.1f} ms，按顶层包汇总（前 {top} 项）：")
+    for package, us in sorted(by_package.items(), key=lambda item: item[1], reverse=True)[:top]:
+        print(f"  {package:<30} {us / 1000:8.1f} ms")
+
+    sys.path.insert(0, str(root))
+    from mcp_server import create_server
+    start = time.perf_counter()
+    try:
+        create_server({})
+    except Exception as e:
+        print(f"create_server 失败: {e}")
+        return
+    print(f"create_server（初始化与工具注册）: {(time.perf_counter() - start) * 1000:.1f} ms")
+
 def ensure_oauth_ready() -> bool:
-    """仅使用 .env 初始化官方API。"""
+    """仅使用 .env 初始化官方API（进程内只初始化一次）。"""
+    from tools.official_api import ensure_api
     try:
-        init_api()
+        ensure_api()
         return True
     except Exception as e:
         print("未检测到有效的 OAuth access_token。")
@@ -78,11 +131,16 @@ def ensure_oauth_ready() -> bool:
 def main():
     """主函数"""
     args = parse_args()
+    if args.profile_startup:
+        profile_startup()
+        return
+
     if not ensure_oauth_ready():
         # 不中止运行，允许用户仅安装/查看说明
         pass
 
     # 创建MCP服务器
+    from mcp_server import create_server
     server = create_server({})
 
     # 启动服务器
@@ -3,8 +3,12 @@
 """
 
 import os
-import dotenv
 from functools import wraps
+
+# 先载入 .env（若存在；入口已加载时不重复），工具模块导入时读取的环境变量才能生效
+from utils.env import load_dotenv_once
+load_dotenv_once()
+
 from fastmcp import FastMCP
 # 尝试导入可能的 AuthError，如果不存在也没关系
 try:
@@ -20,12 +24,10 @@ from tools.project_tools import register_project_tools
 from tools.tag_tools import register_tag_tools
 from tools.analytics_tools import register_analytics_tools
 from tools.goal_tools import register_goal_tools
-from tools.official_api import APIError, init_api
+from tools.official_api import APIError, ensure_api
+from utils.text.text_analysis import preload_jieba
 from utils.asgi_auth import with_api_key_auth
 
-# 载入 .env（若存在）
-dotenv.load_dotenv()
-
 # --- 鉴权逻辑 ---
 EXPECTED_API_KEY = os.environ.get("MCP_API_KEY", "123") # 从环境变量获取，默认'123'
 
@@ -75,9 +77,12 @@ def create_server(auth_info=None):
     Returns:
         配置好的MCP服务器实例
     """
-    # OAuth 初始化：仅使用 .env（.env-only）
+    # 后台预加载 jieba 词典，首个涉及分词的工具调用无需承担词典构建耗时
+    preload_jieba()
+
+    # OAuth 初始化：仅使用 .env（.env-only）；入口已初始化时直接复用
     try:
-        init_api()
+        ensure_api()
         print("已初始化官方API 客户端（.env-only）")
     except Exception as e:
         print(f"警告：未能初始化官方API（可能尚未完成 OAuth 认证 .env）：{e}")
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+首次导入：回溯拉取已完成任务并写入本地归档（data/archive）。
+
+用法：
+    python scripts/backfill_archive.py [--months 24] [--project-id PID ...]
+"""
+
+from __future__ import annotations
+
+import argparse
+
+from dotenv import load_dotenv
+from tools.official_api import init_api
+from tools.completed_sync import CompletedTaskSyncer
+from tools.task_archive import task_archive
+from tools.task_store import task_store
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="回溯导入已完成任务到本地归档")
+    parser.add_argument("--months", type=int, default=24, help="回溯的月数（按30天一个窗口）")
+    parser.add_argument("--project-id", action="append", dest="project_ids", help="只导入指定项目，可重复")
+    args = parser.parse_args()
+
+    load_dotenv()
+    init_api()
+
+    task_store.subscribe(task_archive.on_task_changes)
+    result = CompletedTaskSyncer().sync(args.project_ids, backfill_windows=args.months)
+    print(f"Fetched completed tasks: {result['fetched']}")
+    for pid, count in result['projects'].items():
+        print(f"- {pid}: {count}")
+    print(f"Archive partitions: {', '.join(task_archive.months()) or '(none)'}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
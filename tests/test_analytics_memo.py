@@ -0,0 +1,85 @@
+"""
+分析结果缓存：按数据版本失效且数量有界
+"""
+
+import os
+import sys
+from collections import OrderedDict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools import analytics_tools
+from tools.analytics_tools import _memoized
+
+
+class Manager:
+    def __init__(self):
+        self._memo = OrderedDict()
+        self.version = 1
+        self.calls = 0
+
+    def _refresh_sources(self, sources, force_refresh=False):
+        pass
+
+    def data_version(self):
+        return (self.version,)
+
+    @_memoized('tasks')
+    def stats(self, day):
+        self.calls += 1
+        return day * 2
+
+    @_memoized('tasks')
+    def summary(self):
+        return {"by_day": [1, 2]}
+
+
+def test_stale_versions_are_dropped_on_write():
+    manager = Manager()
+    manager.stats(1)
+    manager.stats(2)
+    assert manager.stats(1) == 2 and manager.calls == 2
+    manager.version = 2
+    manager.stats(3)
+    assert list(manager._memo) == [("stats", (3,), ())]
+
+
+def test_memo_is_bounded_lru(monkeypatch):
+    monkeypatch.setattr(analytics_tools, "ANALYTICS_MEMO_SIZE", 3)
+    manager = Manager()
+    for day in range(3):
+        manager.stats(day)
+    manager.stats(0)
+    manager.stats(10)
+    assert [key[1][0] for key in manager._memo] == [2, 0, 10]
+
+
+def test_callers_cannot_mutate_cached_results():
+    manager = Manager()
+    first = manager.summary()
+    first["by_day"].append(3)
+    manager.summary()["by_day"].append(4)
+    assert manager.summary() == {"by_day": [1, 2]}
+
+
+class FakeLinks:
+    def rollups(self):
+        return {}
+
+
+def test_goal_statistics_records_progress_on_cache_hit(tmp_path, monkeypatch):
+    manager = analytics_tools.AnalyticsManager(
+        goals_csv_path=str(tmp_path / "goals.csv"), tasks_csv_path=str(tmp_path / "tasks.csv")
+    )
+    goals = [{"id": "g1", "title": "读书", "type": "habit", "status": "active", "progress": "40"}]
+    monkeypatch.setattr(manager, "_refresh_sources", lambda sources, force_refresh=False: setattr(manager, "all_goals", goals))
+    monkeypatch.setattr(manager, "_get_all_goals", lambda force_refresh=False: goals)
+    monkeypatch.setattr(manager, "_get_goal_links", lambda: FakeLinks())
+    recorded = []
+    monkeypatch.setattr(manager, "_record_goal_progress", lambda goals, rollups=None: recorded.append(goals))
+
+    first = manager.get_goal_statistics()
+    second = manager.get_goal_statistics()
+    assert first == second and first["avg_progress"] == 40
+    # 第二次命中缓存，仍记录进度
+    assert len(recorded) == 2
@@ -0,0 +1,78 @@
+"""
+已完成任务同步：高水位推进到同步时间
+"""
+
+import os
+import sys
+from datetime import datetime, timedelta
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools import completed_sync
+from tools.completed_sync import CompletedTaskSyncer, _local_now, _TIME_FORMAT
+
+
+class FakeStore:
+    def __init__(self):
+        self.upserted = []
+
+    def upsert_tasks(self, tasks):
+        self.upserted.extend(tasks)
+
+
+@pytest.fixture
+def syncer(tmp_path, monkeypatch):
+    store = FakeStore()
+    monkeypatch.setattr(completed_sync, "task_store", store)
+    syncer = CompletedTaskSyncer(state_path=str(tmp_path / "state.json"))
+    completed_at = (_local_now() - timedelta(days=100)).strftime(_TIME_FORMAT)
+    windows = []
+
+    def fetch_window(project_id, start, end):
+        windows.append((start, end))
+        if start <= datetime.strptime(completed_at, _TIME_FORMAT) < end:
+            return [
+                {"id": "c1", "projectId": project_id, "kind": "TEXT", "completedTime": completed_at},
+                {"id": "n1", "projectId": project_id, "kind": "NOTE", "completedTime": completed_at},
+                {"id": "l1", "projectId": project_id, "kind": "CHECKLIST", "completedTime": completed_at},
+            ]
+        return []
+
+    monkeypatch.setattr(syncer, "_fetch_window", fetch_window)
+    syncer.windows = windows
+    syncer.completed_at = completed_at
+    syncer.store = store
+    return syncer
+
+
+def test_second_sync_without_new_completions_fetches_one_window(syncer):
+    old_mark = (_local_now() - timedelta(days=110)).strftime(_TIME_FORMAT)
+    syncer._marks = {"p1": old_mark}
+    first = syncer.sync(["p1"])
+    assert first["fetched"] == 1
+    assert len(syncer.windows) >= 4
+    # 高水位推进到同步时间附近，而不是停在最后一次完成时间
+    assert syncer.high_water_mark("p1") > syncer.completed_at
+
+    syncer.windows.clear()
+    second = syncer.sync(["p1"])
+    assert second["fetched"] == 0
+    assert len(syncer.windows) <= 1
+
+
+def test_mark_overlaps_sync_time_and_never_moves_back(syncer):
+    syncer.sync(["p1"])
+    mark = syncer.high_water_mark("p1")
+    assert mark <= (_local_now() - syncer.overlap).strftime(_TIME_FORMAT)
+    syncer._marks["p1"] = "2999-01-01 00:00:00"
+    syncer.sync(["p1"])
+    assert syncer.high_water_mark("p1") == "2999-01-01 00:00:00"
+
+
+def test_only_text_tasks_reach_task_store(syncer):
+    syncer._marks = {"p1": (_local_now() - timedelta(days=110)).strftime(_TIME_FORMAT)}
+    result = syncer.sync(["p1"])
+    assert [t["id"] for t in result["tasks"]] == ["c1"]
+    assert [t["id"] for t in syncer.store.upserted] == ["c1"]
@@ -0,0 +1,86 @@
+"""
+CSV 处理器日志模式：增量维护的缓存与重新读取文件的结果一致
+"""
+
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools.analytics_tools import AnalyticsManager
+from utils.csv_handler import CSVHandler, create_default_goal_csv, goal_csv_handler
+
+HEADERS = ["id", "status", "v"]
+
+
+def _handler(path):
+    return CSVHandler(str(path), journal=True, compact_threshold=1000, index_fields=["status"])
+
+
+def _assert_same_as_fresh(handler, path, values):
+    fresh = _handler(path)
+    assert handler.read_data() == fresh.read_data()
+    for field in ("id", "status"):
+        for value in values:
+            assert handler.find_by(field, value) == fresh.find_by(field, value)
+            assert handler.get_row(field, value) == fresh.get_row(field, value)
+
+
+def test_update_by_secondary_field_targets_first_row_in_order(tmp_path):
+    path = tmp_path / "rows.csv"
+    handler = _handler(path)
+    handler.create_file(HEADERS)
+    handler.append_row({"id": "a", "status": "x", "v": "1"})
+    handler.append_row({"id": "b", "status": "y", "v": "1"})
+    handler.update_row("id", "a", {"status": "y"})
+    handler.update_row("status", "y", {"v": "2"})
+    # 文件中 a 在前，更新应落在 a 上
+    assert handler.get_row("id", "a")["v"] == "2"
+    assert handler.get_row("id", "b")["v"] == "1"
+    _assert_same_as_fresh(handler, path, ["a", "b", "x", "y"])
+
+
+def test_random_operations_match_fresh_handler(tmp_path):
+    path = tmp_path / "rows.csv"
+    handler = _handler(path)
+    handler.create_file(HEADERS)
+    rnd = random.Random(7)
+    ids = ["r0", "r1", "r2", "r3"]
+    statuses = ["x", "y", "z"]
+    for row_id in ids:
+        handler.append_row({"id": row_id, "status": rnd.choice(statuses), "v": "0"})
+    for step in range(200):
+        op = rnd.random()
+        if op < 0.2:
+            handler.append_row({"id": rnd.choice(ids), "status": rnd.choice(statuses), "v": str(step)})
+        elif op < 0.5:
+            handler.update_row("id", rnd.choice(ids), {"status": rnd.choice(statuses)})
+        elif op < 0.65:
+            handler.update_row("id", rnd.choice(ids), {"id": rnd.choice(ids)})
+        elif op < 0.9:
+            handler.update_row("status", rnd.choice(statuses), {"v": str(step)})
+        elif len(handler.read_data()) > 2:
+            handler.delete_row("status", rnd.choice(statuses))
+        _assert_same_as_fresh(handler, path, ids + statuses)
+
+
+def test_goal_csv_writes_go_to_journal_and_analytics_reads_them(tmp_path):
+    path = str(tmp_path / "goals.csv")
+    create_default_goal_csv(path)
+    handler = goal_csv_handler(path)
+    for goal_id, goal_type in (("g1", "habit"), ("g2", "phase")):
+        handler.append_row({
+            "id": goal_id, "title": goal_id, "type": goal_type, "status": "active",
+            "created_time": "2026-01-01 00:00:00", "modified_time": "2026-01-01 00:00:00",
+            "keywords": "k", "progress": 0,
+        })
+    assert handler.update_row("id", "g2", {"progress": 50})
+    # 单行写入不重写 CSV、不产生备份
+    assert os.path.exists(path + ".journal")
+    assert os.listdir(tmp_path / "backups") == []
+    assert [g["id"] for g in handler.find_by("type", "habit")] == ["g1"]
+
+    manager = AnalyticsManager(goals_csv_path=path, tasks_csv_path=str(tmp_path / "tasks.csv"))
+    assert manager.goals_handler.journal
+    assert {g["id"]: g["progress"] for g in manager.goals_handler.read_data()} == {"g1": "0", "g2": "50"}
@@ -0,0 +1,26 @@
+"""
+入口模块在导入工具模块之前载入 .env
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.mark.parametrize("entry", ["mcp_server", "main"])
+def test_dotenv_applies_to_import_time_settings(tmp_path, entry):
+    (tmp_path / ".env").write_text("DIDA_ANALYTICS_TTL=7\nDIDA_BATCH_CONCURRENCY=9\n", encoding="utf-8")
+    env = {k: v for k, v in os.environ.items() if k not in ("DIDA_ANALYTICS_TTL", "DIDA_BATCH_CONCURRENCY")}
+    env["PYTHONPATH"] = ROOT
+    code = (
+        f"import {entry}\n"
+        "from tools import analytics_tools, task_tools\n"
+        "print(analytics_tools.ANALYTICS_REFRESH_TTL, task_tools.BATCH_MAX_WORKERS)\n"
+    )
+    result = subprocess.run([sys.executable, "-c", code], cwd=tmp_path, env=env, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip().splitlines()[-1] == "7 9"
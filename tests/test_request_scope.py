@@ -0,0 +1,181 @@
+"""
+请求级快照：每个工具调用的上游请求次数
+"""
+
+import os
+import sys
+from collections import Counter
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import tools.official_api as official_api
+from tools import goal_tools, task_tools
+from tools.adapter import adapter
+from tools.completed_sync import completed_syncer
+from tools.goal_tools import register_goal_tools, GOAL_PROJECT_NAME
+from tools.request_context import request_scope
+from tools.task_tools import register_task_tools
+
+GOAL_CONTENT = "描述\n\n--- Metadata ---\n[Type: permanent] [Keywords: 英语]"
+
+
+class FakeClient:
+    """按端点记录请求的假官方客户端"""
+
+    def __init__(self):
+        self.calls = Counter()
+        self.projects = [
+            {"id": "p1", "name": "工作"},
+            {"id": "p2", "name": "生活"},
+            {"id": "pg", "name": GOAL_PROJECT_NAME},
+        ]
+        self.tasks = {
+            "t1": {"id": "t1", "projectId": "p1", "title": "周报", "kind": "TEXT", "status": 0},
+            "t2": {"id": "t2", "projectId": "p2", "title": "买菜", "kind": "TEXT", "status": 0},
+            "g1": {"id": "g1", "projectId": "pg", "title": "学英语", "content": GOAL_CONTENT, "kind": "TEXT", "status": 0},
+        }
+
+    def get(self, endpoint, params=None):
+        parts = endpoint.strip('/').split('/')
+        if endpoint == "/project":
+            self.calls["list_projects"] += 1
+            return [dict(p) for p in self.projects]
+        if parts[-1] == "data":
+            self.calls["project_data"] += 1
+            return {"tasks": [dict(t) for t in self.tasks.values() if t["projectId"] == parts[1]]}
+        if parts[-1] == "completed":
+            self.calls["completed"] += 1
+            return []
+        raise AssertionError(endpoint)
+
+    def post(self, endpoint, data):
+        if endpoint == "/task":
+            self.calls["create_task"] += 1
+            task = dict(data, id=f"t{len(self.tasks) + 1}")
+            self.tasks[task["id"]] = task
+            return dict(task)
+        if endpoint.startswith("/task/"):
+            self.calls["update_task"] += 1
+            task = self.tasks[endpoint.split('/')[2]]
+            task.update(data)
+            return dict(task)
+        raise AssertionError(endpoint)
+
+    def delete(self, endpoint):
+        self.calls["delete_task"] += 1
+        self.tasks.pop(endpoint.split('/')[-1], None)
+        return True
+
+
+class FakeServer:
+    """收集注册的工具函数"""
+
+    def __init__(self):
+        self.tools = {}
+
+    def tool(self):
+        def decorator(func):
+            self.tools[func.__name__] = func
+            return func
+        return decorator
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    # 同步状态等文件写入临时目录，模块级缓存逐个重置
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(completed_syncer, "_marks", None)
+    monkeypatch.setattr(goal_tools, "_goal_project_cache", None)
+    fake = FakeClient()
+    monkeypatch.setattr(official_api, "_api_client", fake)
+    return fake
+
+
+@pytest.fixture
+def tools():
+    server = FakeServer()
+    register_task_tools(server, {})
+    register_goal_tools(server, {})
+    return server.tools
+
+
+def test_update_goal_fetches_goal_project_once(client, tools):
+    tools["update_goal"]("g1", title="学好英语")
+    assert client.calls == {"list_projects": 1, "project_data": 1, "completed": 1, "update_task": 1}
+
+
+def test_delete_goal_fetches_goal_project_once(client, tools):
+    tools["delete_goal"]("g1")
+    assert client.calls == {"list_projects": 1, "project_data": 1, "completed": 1, "delete_task": 1}
+
+
+def test_create_goal_lists_projects_once(client, tools):
+    tools["create_goal"]("读书", "permanent", "阅读")
+    assert client.calls == {"list_projects": 1, "create_task": 1}
+
+
+def test_get_goals_reuses_cached_goal_project(client, tools):
+    tools["get_goals"](status="active")
+    assert client.calls == {"list_projects": 1, "project_data": 1}
+    client.calls.clear()
+    tools["get_goals"](status="active")
+    assert client.calls == {"project_data": 1}
+
+
+def test_update_task_lists_projects_once_per_call(client, tools):
+    tools["update_task"]("t1", title="月报")
+    # 一次项目列表 + 每个项目一次 /data 与一次已完成窗口 + 一次写入
+    assert client.calls == {"list_projects": 1, "project_data": 3, "completed": 3, "update_task": 1}
+
+
+def test_snapshot_is_not_shared_between_calls(client, tools):
+    tools["get_tasks"]()
+    tools["get_tasks"]()
+    assert client.calls["list_projects"] == 2
+
+
+
+def test_batch_items_share_request_snapshot(client):
+    # 工作线程中的读取复用调用方的请求快照
+    with request_scope():
+        result = task_tools._run_batch(list(range(6)), lambda _: adapter.list_projects())
+    assert result["succeeded"] == 6
+    assert client.calls == {"list_projects": 1}
+
+
+def test_batch_writes_do_not_discard_snapshot_mid_batch(client):
+    with request_scope():
+        task_tools._get_all_tasks_logic()
+        client.calls.clear()
+
+        def write_then_read(task_id):
+            adapter.update_task(task_id, {"id": task_id, "title": "新标题"})
+            return task_tools._get_all_tasks_logic()[0]
+
+        result = task_tools._run_batch(["t1", "t2", "g1", "t1"], write_then_read)
+        assert result["succeeded"] == 4
+        # 批量期间的写入不清除其余项正在读取的快照
+        assert client.calls == {"update_task": 4}
+        # 批量结束后统一清除，之后的读取重新拉取任务；项目列表不受任务写入影响
+        task_tools._get_all_tasks_logic()
+        assert client.calls["project_data"] == 3
+        assert "list_projects" not in client.calls
+
+
+def test_task_write_keeps_project_list(client):
+    with request_scope():
+        adapter.list_projects()
+        adapter.update_task("t1", {"id": "t1", "title": "月报"})
+        adapter.list_projects()
+    assert client.calls == {"list_projects": 1, "update_task": 1}
+
+
+@pytest.mark.parametrize("count", [1, 3])
+def test_batch_update_request_count_independent_of_reads(client, tools, count):
+    targets = ["t1", "t2", "g1"][:count]
+    result = tools["batch_update_tasks"]([{"task_id_or_title": t, "title": "新标题"} for t in targets])
+    assert result["succeeded"] == count
+    # 读取只发生一次，每项只多一次写入
+    assert client.calls == {"list_projects": 1, "project_data": 3, "completed": 3, "update_task": count}
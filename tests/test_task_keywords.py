@@ -0,0 +1,20 @@
+"""
+任务分词缓存：首次使用时才读取缓存文件
+"""
+
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools.task_keywords import TaskKeywordCounter
+
+
+def test_cache_file_is_read_on_first_use(tmp_path):
+    path = tmp_path / "task_tokens.json"
+    path.write_text(json.dumps({"tasks": {"t1": ["m1", ["周报"]]}}), encoding="utf-8")
+    counter = TaskKeywordCounter(cache_path=str(path))
+    # 构造时不读取文件
+    path.write_text(json.dumps({"tasks": {"t1": ["m1", ["月报"]]}}), encoding="utf-8")
+    assert counter.tokens_for({"id": "t1", "modifiedTime": "m1", "title": "周报"}) == ["月报"]
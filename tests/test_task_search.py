@@ -0,0 +1,81 @@
+"""
+关键词筛选：倒排索引给出候选并排序，结果与子串匹配一致
+"""
+
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools import task_tools
+from utils.text import search_index
+from utils.text.search_index import InvertedIndex
+
+TASKS = [
+    {"id": "t1", "title": "team meeting", "content": ""},
+    {"id": "t2", "title": "meet the client", "content": ""},
+    {"id": "t3", "title": "整理项目文档", "content": "本季度目标复盘"},
+    {"id": "t4", "title": "项目标书", "content": ""},
+    {"id": "t5", "title": "买菜", "content": "Meeting notes v2"},
+]
+
+
+@pytest.fixture(autouse=True)
+def search_index_state(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+
+    # 任务检索索引不分词，不加载 jieba
+    def no_segment(text):
+        raise AssertionError("task search index must not segment")
+
+    monkeypatch.setattr(search_index, "segment_text", no_segment)
+    monkeypatch.setattr(task_tools, "_task_search_index", InvertedIndex(segment=False))
+    monkeypatch.setattr(task_tools, "_task_search_sources", {})
+    monkeypatch.setattr(task_tools, "_ensure_task_search_index", lambda: None)
+    task_tools._index_task_changes([dict(t) for t in TASKS], [])
+
+
+def _baseline(tasks, keyword):
+    k = keyword.lower()
+    return {t["id"] for t in tasks if k in (t["title"] or "").lower() or k in (t["content"] or "").lower()}
+
+
+def _filter(tasks, keyword):
+    return {t["id"] for t in task_tools._filter_tasks_logic(tasks, [], keyword=keyword)}
+
+
+@pytest.mark.parametrize("keyword", ["meet", "项目标", "项目", "目标", "MEET", "菜", "ee", "s v2", "复盘 "])
+def test_keyword_filter_matches_substring_baseline(keyword):
+    tasks = [dict(t) for t in TASKS]
+    assert _filter(tasks, keyword) == _baseline(tasks, keyword)
+
+
+def test_index_narrows_candidates():
+    scores = task_tools._task_search_index.candidates("meet")
+    assert set(scores) == {"t1", "t2", "t5"}
+    # t3 的 bigram 全部命中但不连续，只是候选，由子串确认排除
+    assert set(task_tools._task_search_index.candidates("项目标")) == {"t3", "t4"}
+    assert task_tools._task_search_index.candidates("me") is None
+
+
+def test_tasks_changed_since_indexing_are_matched_directly():
+    tasks = [dict(t) for t in TASKS]
+    tasks[4]["title"] = "买菜 项目标"
+    tasks.append({"id": "t6", "title": "新的项目标", "content": ""})
+    assert _filter(tasks, "项目标") == {"t4", "t5", "t6"}
+
+
+def test_random_texts_match_substring_baseline():
+    rnd = random.Random(3)
+    alphabet = "项目标书目abAB1 复盘"
+    tasks = [
+        {"id": f"r{i}", "title": "".join(rnd.choice(alphabet) for _ in range(rnd.randint(0, 12))), "content": ""}
+        for i in range(60)
+    ]
+    task_tools._index_task_changes(tasks, [])
+    for _ in range(200):
+        keyword = "".join(rnd.choice(alphabet) for _ in range(rnd.randint(1, 4)))
+        assert _filter(tasks, keyword) == _baseline(tasks, keyword), keyword
@@ -0,0 +1,50 @@
+"""
+jieba 延迟初始化：缓存目录不可用时回退，失败后可重试
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import jieba
+
+from utils.text import text_analysis
+
+
+@pytest.fixture
+def fresh_jieba(monkeypatch, tmp_path):
+    monkeypatch.setattr(text_analysis, "_jieba", None)
+    monkeypatch.setattr(text_analysis, "_jieba_thread", None)
+    monkeypatch.setattr(text_analysis, "_jieba_error", None)
+    monkeypatch.setattr(jieba.dt, "tmp_dir", jieba.dt.tmp_dir)
+    monkeypatch.setattr(jieba.dt, "cache_file", jieba.dt.cache_file)
+    return tmp_path
+
+
+def test_unwritable_cache_dir_falls_back_to_default(fresh_jieba, monkeypatch):
+    blocker = fresh_jieba / "blocker"
+    blocker.write_text("")
+    # 缓存目录的父路径是文件，无法创建目录
+    monkeypatch.setattr(text_analysis, "JIEBA_CACHE_FILE", str(blocker / "data" / "jieba.cache"))
+    assert text_analysis.get_jieba() is jieba
+
+
+def test_failed_initialization_is_retried(fresh_jieba, monkeypatch):
+    monkeypatch.setattr(text_analysis, "JIEBA_CACHE_FILE", str(fresh_jieba / "jieba.cache"))
+    calls = []
+    original = jieba.initialize
+
+    def flaky_initialize(*args, **kwargs):
+        calls.append(1)
+        if len(calls) == 1:
+            raise OSError("disk full")
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(jieba, "initialize", flaky_initialize)
+    with pytest.raises(RuntimeError):
+        text_analysis.get_jieba()
+    assert text_analysis.get_jieba() is jieba
+    assert len(calls) == 2
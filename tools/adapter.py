@@ -15,14 +15,20 @@ import pytz
 
 from .official_api import (
     DidaOfficialAPI,
-    init_api as init_official_api,
+    ensure_api,
     get_api_client,
     APIError,
 )
+from .request_context import cached_in_request, invalidate_request
+
+# 写操作需要清除的请求快照数据（'projects' 见 list_projects，'all_tasks' 见 task_tools，
+# 'goal_tasks' 见 goal_tools）；任务写入不影响项目列表
+TASK_SNAPSHOT_KINDS = ('all_tasks', 'goal_tasks')
+PROJECT_SNAPSHOT_KINDS = ('projects',) + TASK_SNAPSHOT_KINDS
 
 
 class DidaAdapter:
-    """官方 API 的轻量适配器（.env-only）。"""
+    """官方 API 的轻量适配器（.env-only）。写操作会清除当前请求快照中受影响的数据。"""
 
     def __init__(self):
         # 延迟初始化，首次使用时再创建
@@ -103,14 +109,15 @@ class DidaAdapter:
 
     # ---------- 初始化与客户端 ----------
     def _api(self) -> DidaOfficialAPI:
-        try:
-            return get_api_client()
-        except Exception:
-            # 若尚未初始化，则基于 .env 初始化
-            return init_official_api()
+        # 若尚未初始化，则基于 .env 初始化
+        return ensure_api()
 
     # ---------- Projects ----------
     def list_projects(self) -> List[Dict[str, Any]]:
+        # 同一次工具调用内复用已拉取的项目列表
+        return list(cached_in_request('projects', self._fetch_projects))
+
+    def _fetch_projects(self) -> List[Dict[str, Any]]:
         data = self._api().get("/project")
         # 保持上层期望字段：id, name, color, sortOrder, sortType, modifiedTime
         projects: List[Dict[str, Any]] = []
@@ -123,6 +130,7 @@ class DidaAdapter:
         payload = {"name": name}
         if color:
             payload["color"] = color
+        invalidate_request(*PROJECT_SNAPSHOT_KINDS)
         return self._api().post("/project", payload)
 
     def update_project(self, project_id: str, name: Optional[str] = None, color: Optional[str] = None) -> Dict[str, Any]:
@@ -132,9 +140,11 @@ class DidaAdapter:
             payload['name'] = name
         if color is not None:
             payload['color'] = color
+        invalidate_request(*PROJECT_SNAPSHOT_KINDS)
         return self._api().post(f"/project/{project_id}", payload)
 
     def delete_project(self, project_id: str) -> Any:
+        invalidate_request(*PROJECT_SNAPSHOT_KINDS)
         return self._api().delete(f"/project/{project_id}")
 
     # ---------- Tasks ----------
@@ -164,23 +174,74 @@ class DidaAdapter:
             pid = p.get('id')
             if not pid:
                 continue
-            data = self._api().get(f"/project/{pid}/data")
-            raw = []
-            if isinstance(data, dict):
-                raw = data.get('tasks', []) or []
-            for t in raw:
-                t = self.normalize_task_status(t)
-                t = self.normalize_task_datetimes(t)
-                # 补齐 projectId 与 projectName
-                if not t.get('projectId'):
-                    t['projectId'] = pid
-                if not t.get('projectName'):
-                    t['projectName'] = proj_name_map.get(pid)
-                tasks.append(t)
+            tasks.extend(self.list_project_tasks(pid, proj_name_map.get(pid)))
         if completed is not None:
             tasks = [t for t in tasks if bool(t.get('isCompleted', False)) == completed]
         return tasks
 
+    def list_project_tasks(self, project_id: str, project_name: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        单个项目的未完成任务：只请求 GET /project/{id}/data，不拉取项目列表。
+
+        Args:
+            project_id: 项目ID
+            project_name: 用于补齐任务 projectName 的项目名称（可选）
+        """
+        data = self._api().get(f"/project/{project_id}/data")
+        raw = []
+        if isinstance(data, dict):
+            raw = data.get('tasks', []) or []
+        tasks: List[Dict[str, Any]] = []
+        for t in raw:
+            t = self.normalize_task_status(t)
+            t = self.normalize_task_datetimes(t)
+            # 补齐 projectId 与 projectName
+            if not t.get('projectId'):
+                t['projectId'] = project_id
+            if not t.get('projectName'):
+                t['projectName'] = project_name
+            tasks.append(t)
+        return tasks
+
+    def list_completed_tasks(
+        self,
+        project_id: str,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        获取项目内已完成任务：GET /project/{id}/task/completed（文档未收录，线上可用）。
+        start/end 为本地时间字符串 YYYY-MM-DD HH:MM:SS，按 completedTime 取 [start, end) 区间；
+        服务端未必支持时间参数，返回后仍按 completedTime 本地过滤。
+        """
+        params: Dict[str, Any] = {}
+        if start:
+            params['from'] = self.to_api_datetime(start)
+        if end:
+            params['to'] = self.to_api_datetime(end)
+        data = self._api().get(f"/project/{project_id}/task/completed", params=params or None)
+        # 空响应体会被解析为 True；兼容数组与 {tasks: [...]} 两种包装
+        raw: List[Dict[str, Any]] = []
+        if isinstance(data, list):
+            raw = data
+        elif isinstance(data, dict):
+            raw = data.get('tasks', []) or []
+        tasks: List[Dict[str, Any]] = []
+        for t in raw:
+            t = self.normalize_task_datetimes(t)
+            # 该端点只返回已完成任务，个别返回缺少完成标记
+            t['isCompleted'] = True
+            t['status'] = 2
+            if not t.get('projectId'):
+                t['projectId'] = project_id
+            completed_time = t.get('completedTime') or ''
+            if start and completed_time < start:
+                continue
+            if end and completed_time and completed_time >= end:
+                continue
+            tasks.append(t)
+        return tasks
+
     def create_task(self, data: Dict[str, Any]) -> Dict[str, Any]:
         payload = dict(data)
         # 转换日期字段
@@ -209,6 +270,7 @@ class DidaAdapter:
         # 若传入了本地日期但未设置 timeZone，则默认 Asia/Shanghai
         if ('startDate' in payload or 'dueDate' in payload) and 'timeZone' not in payload:
             payload['timeZone'] = 'Asia/Shanghai'
+        invalidate_request(*TASK_SNAPSHOT_KINDS)
         task = self._api().post("/task", payload)
         task = self.normalize_task_status(task)
         task = self.normalize_task_datetimes(task)
@@ -240,6 +302,7 @@ class DidaAdapter:
         if ('startDate' in payload or 'dueDate' in payload) and 'timeZone' not in payload:
             payload['timeZone'] = 'Asia/Shanghai'
         # 文档：更新任务使用 POST /open/v1/task/{taskId}
+        invalidate_request(*TASK_SNAPSHOT_KINDS)
         task = self._api().post(f"/task/{task_id}", payload)
         # 有些接口返回布尔；若返回为空，补回请求值
         if isinstance(task, bool) and task is True:
@@ -251,10 +314,12 @@ class DidaAdapter:
 
     def delete_task(self, project_id: str, task_id: str) -> Any:
         # 文档：DELETE /open/v1/project/{projectId}/task/{taskId}
+        invalidate_request(*TASK_SNAPSHOT_KINDS)
         return self._api().delete(f"/project/{project_id}/task/{task_id}")
 
     def complete_task(self, project_id: str, task_id: str) -> Any:
         # 文档：POST /open/v1/project/{projectId}/task/{taskId}/complete
+        invalidate_request(*TASK_SNAPSHOT_KINDS)
         return self._api().post(f"/project/{project_id}/task/{task_id}/complete", {})
 
 
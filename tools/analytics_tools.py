@@ -4,18 +4,19 @@
 """
 
 import os
+import copy
 import json
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
+import time
+import functools
+import threading
 from typing import List, Dict, Any, Tuple, Optional, Union
 from datetime import datetime, timedelta, date
-from collections import Counter
+from collections import Counter, OrderedDict
 
 from fastmcp import FastMCP
-from utils.csv_handler import CSVHandler
+from utils.csv_handler import CSVHandler, goal_csv_handler
 from utils.date.date_utils import (
-    get_current_time, parse_date, format_date, 
+    get_current_time, format_datetime, parse_date, format_date, 
     get_date_range, date_diff_days
 )
 from utils.text.text_analysis import (
@@ -24,6 +25,14 @@ from utils.text.text_analysis import (
 
 # 导入task_tools中的方法，用于获取任务数据
 from tools.task_tools import get_tasks_logic as get_dida_tasks
+from tools.task_archive import task_archive
+from tools.task_store import task_store, project_store
+from tools.task_cube import DailyTaskCube, task_cube
+from tools.task_keywords import task_keywords
+from tools.goal_links import goal_links
+from tools.goal_forecast import forecast_goals
+from tools.goal_progress_log import goal_progress_log
+from tools.request_context import request_scoped
 # 导入project_tools中的方法，用于获取项目数据 (假设已重构)
 try:
     from tools.project_tools import get_projects_logic
@@ -31,6 +40,82 @@ except ImportError:
     print("警告：无法从 tools.project_tools 导入 get_projects_logic。目标分析将仅依赖CSV。")
     get_projects_logic = None
 
+_subscribe_lock = threading.Lock()
+_cube_subscribed = False
+_keywords_subscribed = False
+_goal_links_subscribed = False
+
+
+def _ensure_task_cube() -> None:
+    """
+    首次使用时再建立按天聚合（避免启动时导入 pandas/numpy）：
+    先计入本地归档的历史任务，再订阅任务快照（订阅时补齐快照中已有任务，同ID覆盖归档记录）
+    """
+    global _cube_subscribed
+    with _subscribe_lock:
+        if _cube_subscribed:
+            return
+        try:
+            task_cube.seed(task_archive.query())
+        except Exception as e:
+            print(f"读取本地任务归档失败: {str(e)}")
+        task_store.subscribe(task_cube.on_task_changes)
+        _cube_subscribed = True
+
+
+def _ensure_task_keywords() -> None:
+    """首次使用时再订阅全局词频（避免启动时加载 jieba）"""
+    global _keywords_subscribed
+    with _subscribe_lock:
+        if not _keywords_subscribed:
+            task_store.subscribe(task_keywords.on_task_changes)
+            _keywords_subscribed = True
+
+
+def _ensure_goal_links() -> None:
+    """首次使用时再订阅目标关联表"""
+    global _goal_links_subscribed
+    with _subscribe_lock:
+        if not _goal_links_subscribed:
+            task_store.subscribe(goal_links.on_task_changes)
+            _goal_links_subscribed = True
+
+
+# 任务/项目数据从上游重新拉取的间隔（秒）；派生结果按数据版本缓存，数据未变化时不重算
+ANALYTICS_REFRESH_TTL = int(os.environ.get("DIDA_ANALYTICS_TTL", "300"))
+# 同一数据版本下最多缓存的派生结果数（按最近使用淘汰）
+ANALYTICS_MEMO_SIZE = int(os.environ.get("DIDA_ANALYTICS_MEMO_SIZE", "128"))
+
+
+def _memoized(*sources: str):
+    """
+    按 (方法, 参数, 数据版本) 缓存派生结果
+
+    调用前按需刷新 sources（'tasks' / 'goals'）对应的数据源（force_refresh 或超过 TTL 时重新拉取），
+    数据版本未变化时直接返回上次结果。写入时丢弃旧版本的结果，缓存数量超过 ANALYTICS_MEMO_SIZE 时淘汰最久未用的结果。
+    返回的是缓存结果的深拷贝，调用方修改不会影响缓存；命中缓存时方法体不会执行，被装饰的方法不应有副作用。
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, force_refresh=False, **kwargs):
+            self._refresh_sources(sources, force_refresh)
+            key = (method.__name__, args, tuple(sorted(kwargs.items())))
+            version = self.data_version()
+            cached = self._memo.get(key)
+            if cached is not None and cached[0] == version:
+                self._memo.move_to_end(key)
+                return copy.deepcopy(cached[1])
+            result = method(self, *args, **kwargs)
+            # 旧版本的结果不会再命中
+            for stale in [k for k, (v, _) in self._memo.items() if v != version]:
+                del self._memo[stale]
+            self._memo[key] = (version, result)
+            while len(self._memo) > ANALYTICS_MEMO_SIZE:
+                self._memo.popitem(last=False)
+            return copy.deepcopy(result)
+        return wrapper
+    return decorator
+
 
 class AnalyticsManager:
     """
@@ -50,12 +135,12 @@ class AnalyticsManager:
         self.goals_csv_path = goals_csv_path
         self.tasks_csv_path = tasks_csv_path
         
-        # 创建CSV处理器
-        self.goals_handler = CSVHandler(goals_csv_path)
+        # 创建CSV处理器（日志模式：单行写入只追加日志，按 id 索引）
+        self.goals_handler = goal_csv_handler(goals_csv_path)
         
         # 检查任务CSV是否存在 (这部分可能不再需要，因为我们优先用API)
         if os.path.exists(tasks_csv_path):
-            self.tasks_handler = CSVHandler(tasks_csv_path) 
+            self.tasks_handler = CSVHandler(tasks_csv_path, journal=True, key_field='id', index_fields=['status'])
         else:
             self.tasks_handler = None
             
@@ -63,10 +148,36 @@ class AnalyticsManager:
         self.dida_tasks = None
         self.all_goals = None
         self.projects = None
+        # 上游拉取时间与目标缓存对应的数据版本
+        self.tasks_fetched_at = 0.0
+        self.projects_fetched_at = 0.0
+        self.goals_version = None
+        # 派生结果缓存：(方法, 参数) -> (数据版本, 结果)
+        self._memo: "OrderedDict[Tuple, Tuple[Tuple, Any]]" = OrderedDict()
+
+    def _goals_csv_version(self) -> Tuple:
+        """目标CSV及其行操作日志的 (mtime, size)"""
+        return self.goals_handler.stat_key()
+
+    def data_version(self) -> Tuple:
+        """
+        当前数据版本：任务快照版本、项目快照版本、目标CSV文件状态与当天日期
+        （按日期范围统计的结果跨天后需要重算）
+        """
+        return (task_store.version, project_store.version, self._goals_csv_version(), date.today())
+
+    def _refresh_sources(self, sources: Tuple[str, ...], force_refresh=False) -> None:
+        """按需刷新数据源"""
+        if 'tasks' in sources:
+            self._get_tasks_from_api(force_refresh=force_refresh)
+        if 'goals' in sources:
+            self._get_all_goals(force_refresh=force_refresh)
     
     def _get_tasks_from_api(self, force_refresh=False):
-        """从滴答清单API获取任务数据 (优先使用API)"""
-        if self.dida_tasks is None or force_refresh:
+        """从滴答清单API获取任务数据 (优先使用API)，超过 TTL 后重新拉取"""
+        expired = time.monotonic() - self.tasks_fetched_at > ANALYTICS_REFRESH_TTL
+        if self.dida_tasks is None or force_refresh or expired:
+            self.tasks_fetched_at = time.monotonic()
             try:
                 self.dida_tasks = get_dida_tasks(mode="all")
                 print(f"从滴答清单API获取到 {len(self.dida_tasks)} 个任务")
@@ -77,8 +188,10 @@ class AnalyticsManager:
         return self.dida_tasks
 
     def _get_projects_from_api(self, force_refresh=False):
-        """从滴答清单API获取项目数据"""
-        if self.projects is None or force_refresh:
+        """从滴答清单API获取项目数据，超过 TTL 后重新拉取"""
+        expired = time.monotonic() - self.projects_fetched_at > ANALYTICS_REFRESH_TTL
+        if self.projects is None or force_refresh or expired:
+            self.projects_fetched_at = time.monotonic()
             if get_projects_logic:
                 try:
                     self.projects = get_projects_logic()
@@ -119,11 +232,14 @@ class AnalyticsManager:
         """
         获取所有目标数据。
         优先从项目中查找带特定关键词的项目，如果找不到则从CSV读取。
+        项目列表或目标CSV未变化时复用上次结果。
         """
-        if self.all_goals is None or force_refresh:
+        projects = self._get_projects_from_api(force_refresh=force_refresh) if get_projects_logic else []
+        goals_version = (project_store.version, self._goals_csv_version())
+        if self.all_goals is None or force_refresh or goals_version != self.goals_version:
+            self.goals_version = goals_version
             goal_projects = []
             if get_projects_logic:
-                projects = self._get_projects_from_api(force_refresh=force_refresh)
                 goal_keywords = ["目标", "Goal", "[目标]", "[Goal]"]
                 for proj in projects:
                     name = proj.get('name', '')
@@ -136,17 +252,85 @@ class AnalyticsManager:
                 else:
                     print("未发现目标项目，将从 goals.csv 读取目标数据。")
                     self.all_goals = self.goals_handler.read_data()
+                    self._record_csv_goal_progress()
             else:
                  print("无法检查项目，将从 goals.csv 读取目标数据。")
                  self.all_goals = self.goals_handler.read_data()
+                 self._record_csv_goal_progress()
                  
         return self.all_goals
+
+    def _record_goal_progress(self, goals: List[Dict[str, Any]],
+                              rollups: Optional[Dict[str, Dict[str, Any]]] = None) -> None:
+        """
+        把目标当前进度写入进度日志（进度未变化的目标不会写入）
+
+        Args:
+            goals: 目标列表
+            rollups: 关联任务汇总；未提供时跳过项目型目标（其进度来自汇总）
+        """
+        now = format_datetime(get_current_time())
+        project_entries, csv_entries = [], []
+        for goal in goals:
+            is_project_based = goal.get('type') == 'project_based'
+            if is_project_based and (rollups is None or goal.get('id') not in rollups):
+                continue
+            try:
+                progress = self._goal_progress(goal, rollups or {})
+            except (TypeError, ValueError):
+                continue
+            if is_project_based:
+                project_entries.append((goal.get('id'), now, progress))
+            else:
+                # CSV目标以修改时间为记录日期，进度未变的修改也保留（与备份中的历史一致）
+                csv_entries.append((goal.get('id'), goal.get('modified_time') or now, progress))
+        goal_progress_log.record(project_entries)
+        goal_progress_log.record(csv_entries, keep_unchanged=True)
+
+    def _record_csv_goal_progress(self) -> None:
+        """
+        CSV目标重新读取后记录进度；进度日志尚不存在时先从 goals.csv 的历史备份导入一次
+        """
+        backup_dir = os.path.join(os.path.dirname(self.goals_csv_path), 'backups')
+        if not goal_progress_log.exists() and os.path.isdir(backup_dir):
+            backup_files = sorted(f for f in os.listdir(backup_dir) if f.startswith('goals_'))
+            for backup_file in backup_files:
+                timestamp = backup_file.split('_')[1].split('.')[0]
+                try:
+                    backup_goals = CSVHandler(os.path.join(backup_dir, backup_file)).read_data()
+                except Exception:
+                    continue
+                self._record_goal_progress([
+                    dict(goal, modified_time=goal.get('modified_time') or timestamp) for goal in backup_goals
+                ])
+        self._record_goal_progress(self.all_goals or [])
+
+    def _get_goal_links(self):
+        """目标关联表：与当前目标列表对齐（规则变化时才重建），任务变更经订阅增量维护"""
+        _ensure_goal_links()
+        goal_links.set_goals(self.all_goals or [], task_store.tasks())
+        return goal_links
+
+    @staticmethod
+    def _goal_progress(goal: Dict[str, Any], rollups: Dict[str, Dict[str, Any]]) -> float:
+        """目标当前进度（项目型目标没有进度字段，以关联任务完成率作为进度）"""
+        if goal.get('type') == 'project_based' and goal.get('id') in rollups:
+            return rollups[goal['id']]['completion_rate']
+        return int(goal.get('progress', 0))
     
     def get_goal_statistics(self, force_refresh=False) -> Dict[str, Any]:
         """
         获取目标统计信息
-        (优先使用项目作为目标源，否则使用CSV)
+        (优先使用项目作为目标源，否则使用CSV；每次调用都把当前进度写入进度日志，统计结果按数据版本缓存)
         """
+        statistics = self._goal_statistics(force_refresh=force_refresh)
+        if self.all_goals:
+            self._record_goal_progress(self.all_goals, self._get_goal_links().rollups())
+        return statistics
+
+    @_memoized('goals', 'tasks')
+    def _goal_statistics(self, force_refresh=False) -> Dict[str, Any]:
+        """目标统计（无副作用，按数据版本缓存）"""
         goals = self._get_all_goals(force_refresh=force_refresh)
         
         if not goals:
@@ -155,7 +339,8 @@ class AnalyticsManager:
                 "by_type": {},
                 "by_status": {},
                 "completion_rate": 0,
-                "avg_progress": 0
+                "avg_progress": 0,
+                "by_goal": {}
             }
         
         # 统计总数
@@ -177,8 +362,12 @@ class AnalyticsManager:
         completed = by_status.get('completed', by_status.get('archived', 0)) # 假设 archived 算完成
         completion_rate = (completed / total) * 100 if total > 0 else 0
         
+        # 关联任务汇总（项目型目标没有进度字段，以关联任务完成率作为进度）
+        rollups = self._get_goal_links().rollups()
+        titles = {goal.get('id'): goal.get('title', '') for goal in goals}
+        
         # 计算平均进度
-        progress_values = [int(goal.get('progress', 0)) for goal in goals]
+        progress_values = [self._goal_progress(goal, rollups) for goal in goals]
         avg_progress = sum(progress_values) / len(progress_values) if progress_values else 0
         
         return {
@@ -186,156 +375,64 @@ class AnalyticsManager:
             "by_type": by_type,
             "by_status": by_status,
             "completion_rate": round(completion_rate, 2),
-            "avg_progress": round(avg_progress, 2)
+            "avg_progress": round(avg_progress, 2),
+            "by_goal": {
+                goal_id: dict(rollup, title=titles.get(goal_id, ''))
+                for goal_id, rollup in rollups.items()
+            }
         }
     
     def get_goal_progress_over_time(self, goal_id: str) -> List[Dict[str, Any]]:
         """
         获取目标进度随时间的变化
-        (目前仅支持从CSV及其备份获取历史进度)
+        (读取按目标ID索引的进度日志；CSV目标在重新读取时记录，项目型目标记录关联任务完成率)
         """
-        # TODO: 未来可以考虑如何从项目历史记录中获取进度
-        print("警告：获取目标进度历史目前仅支持CSV源。")
-        
-        progress_data = []
-        
-        # 检查当前目标 (从缓存的 all_goals 或 CSV 读取)
         current_goals = self._get_all_goals() # 使用缓存或读取
         current_goal = next((g for g in current_goals if g.get('id') == goal_id), None)
+        if not current_goal:
+            return []
         
-        if current_goal:
-             # 如果目标源是CSV，尝试从CSV获取历史
-             if not get_projects_logic or not any(p['id'] == goal_id for p in self.projects if self.projects):
-                 # 添加最新的进度数据
-                 progress_data.append({
-                     "date": current_goal.get('modified_time', ''),
-                     "progress": int(current_goal.get('progress', 0))
-                 })
-                 
-                 # 从备份文件中提取历史数据 (仅对CSV源有效)
-                 backup_dir = os.path.join(os.path.dirname(self.goals_csv_path), 'backups')
-                 if os.path.exists(backup_dir):
-                     backup_files = sorted([f for f in os.listdir(backup_dir) if f.startswith('goals_')])
-                     for backup_file in backup_files:
-                         file_path = os.path.join(backup_dir, backup_file)
-                         timestamp = backup_file.split('_')[1].split('.')[0]
-                         try:
-                             backup_handler = CSVHandler(file_path)
-                             backup_goals = backup_handler.read_data()
-                             backup_goal = next((g for g in backup_goals if g.get('id') == goal_id), None)
-                             
-                             if backup_goal:
-                                 date_str = backup_goal.get('modified_time', timestamp)
-                                 progress = int(backup_goal.get('progress', 0))
-                                 if not any(d['date'] == date_str for d in progress_data):
-                                     progress_data.append({"date": date_str, "progress": progress})
-                         except Exception:
-                             continue
-             else:
-                 print(f"目标 {goal_id} 是项目源，暂不支持历史进度查询。")
-        
-        # 按日期排序
-        progress_data.sort(key=lambda x: x['date'])
-        return progress_data
+        if current_goal.get('type') == 'project_based':
+            # 项目型目标的进度来自关联任务汇总，查询时记录当前值
+            self._record_goal_progress([current_goal], {goal_id: self._get_goal_links().rollup(goal_id)})
+        
+        return goal_progress_log.history(goal_id)
     
+    def _get_task_cube(self, force_refresh=False) -> DailyTaskCube:
+        """按天聚合（拉取任务会经 task_store 增量更新聚合）"""
+        _ensure_task_cube()
+        self._get_tasks_from_api(force_refresh=force_refresh)
+        return task_cube
+
+    @_memoized('tasks')
     def get_task_statistics(self, days: int = 30, force_refresh=False) -> Dict[str, Any]:
         """
         获取任务统计信息
-        (使用API获取任务数据)
+        (任务经 task_store 增量汇入按天聚合，已完成的历史任务补充自本地归档；按天读取聚合单元)
         """
-        tasks = self._get_tasks_from_api(force_refresh=force_refresh)
+        cube = self._get_task_cube(force_refresh=force_refresh)
         
-        if not tasks:
-            # ... [返回空统计数据，代码不变] ...
-            return {
-                "total": 0,
-                "completed": 0,
-                "completion_rate": 0,
-                "avg_completion_time": 0,
-                "by_day": {}
-            }
-
-        # ... [统计计算逻辑不变] ...
         # 计算日期范围
         today = date.today()
         start_date = today - timedelta(days=days-1)
         
-        # 筛选日期范围内的任务
-        filtered_tasks = []
-        for task in tasks:
-            task_date_str = task.get('createdTime', task.get('created', task.get('createTime', '')))
-            if not task_date_str:
-                continue
-                
-            try:
-                task_date = parse_date(task_date_str.split(' ')[0])
-                if task_date and task_date >= start_date:
-                    filtered_tasks.append(task)
-            except:
-                continue
-        
-        # 统计总数
-        total = len(filtered_tasks)
-        
-        # 统计完成任务
-        completed = sum(1 for task in filtered_tasks if task.get('status') == 2 or 
-                        task.get('isCompleted') == True or 
-                        str(task.get('completed')).lower() == 'true')
+        # 日期范围内的合计
+        totals = cube.totals(start=format_date(start_date))
+        total = totals["created"]
+        completed = totals["completed"]
         
         # 计算完成率
         completion_rate = (completed / total) * 100 if total > 0 else 0
         
-        # 计算平均完成时间
-        completion_times = []
-        for task in filtered_tasks:
-            created_str = task.get('createdTime', task.get('created', task.get('createTime', '')))
-            completed_str = task.get('completedTime', '')
-            
-            is_completed = (task.get('status') == 2 or 
-                           task.get('isCompleted') == True or 
-                           str(task.get('completed')).lower() == 'true')
-            
-            if created_str and completed_str and is_completed:
-                try:
-                    created_date = datetime.strptime(created_str, "%Y-%m-%d %H:%M:%S")
-                    completed_date = datetime.strptime(completed_str, "%Y-%m-%d %H:%M:%S")
-                    diff = (completed_date - created_date).total_seconds() / 3600  # 小时
-                    completion_times.append(diff)
-                except:
-                    continue
-        
-        avg_completion_time = sum(completion_times) / len(completion_times) if completion_times else 0
+        # 计算平均完成时间（小时）
+        avg_completion_time = totals["hours_sum"] / totals["hours_count"] if totals["hours_count"] else 0
         
         # 按天统计
-        by_day = {}
-        for i in range(days):
-            curr_date = start_date + timedelta(days=i)
-            date_str = format_date(curr_date)
-            by_day[date_str] = {
-                "total": 0,
-                "completed": 0
-            }
-        
-        for task in filtered_tasks:
-            task_date_str = task.get('createdTime', task.get('created', task.get('createTime', '')))
-            if not task_date_str:
-                continue
-                
-            try:
-                task_date = parse_date(task_date_str.split(' ')[0])
-                date_str = format_date(task_date)
-                
-                if date_str in by_day:
-                    by_day[date_str]["total"] += 1
-                    
-                    is_completed = (task.get('status') == 2 or 
-                                  task.get('isCompleted') == True or 
-                                  str(task.get('completed')).lower() == 'true')
-                    
-                    if is_completed:
-                        by_day[date_str]["completed"] += 1
-            except:
-                continue
+        day_keys = [format_date(start_date + timedelta(days=i)) for i in range(days)]
+        by_day = {
+            day_key: {"total": cell["created"], "completed": cell["completed"]}
+            for day_key, cell in cube.daily(day_keys).items()
+        } if len(cube) else {}
                 
         return {
             "total": total,
@@ -345,34 +442,20 @@ class AnalyticsManager:
             "by_day": by_day
         }
     
+    @_memoized('tasks')
     def extract_task_keywords(self, limit: int = 20, force_refresh=False) -> Dict[str, int]:
         """
         从任务中提取关键词
-        (使用API获取任务数据)
+        (使用API获取任务数据，读取增量维护的全局词频)
         """
-        tasks = self._get_tasks_from_api(force_refresh=force_refresh)
-        
-        if not tasks:
-             # ... [返回空字典，代码不变] ...
-            return {}
-
-        # ... [关键词提取逻辑不变] ...
-        # 合并所有任务文本
-        all_text = ""
-        for task in tasks:
-            title = task.get('title', task.get('content', ''))
-            content = task.get('content', task.get('note', ''))
-            all_text += f"{title} {content} "
-        
-        # 分词
-        words = segment_text(all_text)
-        
-        # 计算词频
-        word_counts = Counter(words)
+        # 拉取任务会经 task_store 增量更新词频（分词结果按任务ID + 修改时间缓存）
+        _ensure_task_keywords()
+        self._get_tasks_from_api(force_refresh=force_refresh)
         
         # 返回前N个高频词
-        return dict(word_counts.most_common(limit))
+        return dict(task_keywords.top(limit))
     
+    @_memoized('goals', 'tasks')
     def get_goal_completion_prediction(self, goal_id: str, force_refresh=False) -> Dict[str, Any]:
         """
         预测目标完成情况
@@ -496,6 +579,47 @@ class AnalyticsManager:
             "completion_date": format_date(completion_date) if completion_date else None
         }
     
+    @_memoized('goals', 'tasks')
+    def get_goals_completion_forecast(self, force_refresh=False) -> Dict[str, Any]:
+        """
+        批量预测全部进行中目标的完成情况
+        (进度序列 = 开始日期的 0 进度 + 进度历史 + 今天的当前进度，全部目标一次最小二乘拟合)
+        """
+        goals = self._get_all_goals(force_refresh=force_refresh)
+        active = [g for g in goals if g.get('id') and g.get('status', 'active') == 'active']
+        rollups = self._get_goal_links().rollups()
+        today = date.today()
+
+        forecast_input, series = [], []
+        for goal in active:
+            current = self._goal_progress(goal, rollups)
+            points: Dict[date, float] = {}
+            start = parse_date(str(goal.get('start_date') or '')[:10])
+            if start and start < today:
+                points[start] = 0
+            for record in self.get_goal_progress_over_time(goal['id']):
+                day = parse_date(str(record.get('date') or '')[:10])
+                if day:
+                    points[day] = record.get('progress', 0)
+            points[today] = current
+            series.append([((day - today).days, value) for day, value in sorted(points.items())])
+            forecast_input.append({
+                "id": goal['id'],
+                "title": goal.get('title', ''),
+                "type": goal.get('type', ''),
+                "current_progress": current,
+                "due_date": parse_date(str(goal.get('due_date') or '')[:10]),
+            })
+
+        forecasts = forecast_goals(forecast_input, series, today)
+        return {
+            "date": format_date(today),
+            "total": len(forecasts),
+            "by_status": dict(Counter(f["status"] for f in forecasts)),
+            "goals": forecasts
+        }
+
+    @_memoized('goals', 'tasks')
     def generate_goal_report(self, goal_id: str, force_refresh=False) -> Dict[str, Any]:
         """
         生成目标报告
@@ -520,57 +644,20 @@ class AnalyticsManager:
         # 获取目标完成预测
         completion_prediction = self.get_goal_completion_prediction(goal_id, force_refresh=False) # 使用缓存数据
         
-        # --- 收集相关任务信息 ---
-        related_tasks = []
-        tasks = self._get_tasks_from_api(force_refresh=force_refresh) # 获取最新任务
-        
-        # 确定关联逻辑：
-        # 1. 如果目标是项目，则关联该项目下的所有任务
-        # 2. 如果目标是CSV，则关联标题/内容中包含目标关键词的任务
-        
-        is_project_based = goal.get('type') == 'project_based'
-        
-        if is_project_based:
-             # 关联项目下的任务
-             project_id = goal.get('id')
-             for task in tasks:
-                 if task.get('projectId') == project_id:
-                     related_tasks.append({
-                         "id": task.get('id', ''),
-                         "title": task.get('title', ''),
-                         "status": task.get('status'),
-                         "isCompleted": task.get('isCompleted'),
-                         "createdTime": task.get('createdTime', '')
-                     })
-        else:
-             # 关联包含关键词的任务 (来自CSV的目标)
-             goal_keywords = normalize_keywords(goal.get('keywords', goal.get('title',''))) # 使用目标标题作为关键词
-             goal_keywords_set = set(k for k in goal_keywords.split() if len(k) > 1) # 简单过滤
-
-             if goal_keywords_set:
-                 for task in tasks:
-                     title = task.get('title', '')
-                     content = task.get('content', '')
-                     task_text = f"{title} {content}".lower()
-                     
-                     # 检查任务文本是否包含任何目标关键词
-                     if any(keyword.lower() in task_text for keyword in goal_keywords_set):
-                         related_tasks.append({
-                             "id": task.get('id', ''),
-                             "title": title,
-                             "status": task.get('status'),
-                             "isCompleted": task.get('isCompleted'),
-                             "createdTime": task.get('createdTime', '')
-                         })
+        # --- 相关任务：读取物化的目标关联表 ---
+        # 项目型目标关联该项目下的所有任务，CSV目标关联标题/内容中包含目标关键词的任务
+        links = self._get_goal_links()
         
         return {
             "status": "success",
             "goal": goal_info,
             "progress_history": progress_history,
             "prediction": completion_prediction,
-            "related_tasks": related_tasks[:50] # 限制返回的任务数量
+            "task_rollup": links.rollup(goal_id),
+            "related_tasks": links.linked_tasks(goal_id, limit=50) # 限制返回的任务数量
         }
     
+    @_memoized('goals', 'tasks')
     def generate_weekly_summary(self, force_refresh=False) -> Dict[str, Any]:
         """
         生成每周总结
@@ -603,24 +690,12 @@ class AnalyticsManager:
         avg_progress = sum(progress_values) / len(weekly_goals_updated) if weekly_goals_updated else 0
         
         # --- 任务完成情况 ---
-        tasks = self._get_tasks_from_api(force_refresh=force_refresh)
-        tasks_stats = {}
-        
-        # 筛选本周创建的任务
-        weekly_tasks_created = []
-        for task in tasks:
-            created_str = task.get('createdTime', task.get('created', task.get('createTime', '')))
-            if created_str:
-                try:
-                    created_date = parse_date(created_str.split(' ')[0])
-                    if created_date and start_date <= created_date <= end_date:
-                        weekly_tasks_created.append(task)
-                except:
-                    continue
+        cube = self._get_task_cube(force_refresh=force_refresh)
         
-        # 统计任务完成情况
-        completed_tasks = sum(1 for t in weekly_tasks_created if t.get('status') == 2 or t.get('isCompleted') == True)
-        total_tasks = len(weekly_tasks_created)
+        # 本周创建的任务及完成情况
+        weekly_totals = cube.totals(start=format_date(start_date), end=format_date(end_date))
+        completed_tasks = weekly_totals["completed"]
+        total_tasks = weekly_totals["created"]
         
         tasks_stats = {
             "total": total_tasks,
@@ -642,6 +717,76 @@ class AnalyticsManager:
             "tasks": tasks_stats # 显示本周创建的任务统计
         }
 
+    def _summarize_cube_range(self, cube: DailyTaskCube, start: str, end: str) -> Dict[str, Any]:
+        """按天聚合在 [start, end] 内的合计与项目/优先级分布"""
+        totals = cube.totals(start=start, end=end)
+        created = totals["created"]
+        completed = totals["completed"]
+        return {
+            "total": created,
+            "completed": completed,
+            "completion_rate": round((completed / created) * 100, 2) if created else 0,
+            "avg_completion_time": round(totals["hours_sum"] / totals["hours_count"], 2) if totals["hours_count"] else 0,
+            "by_project": {
+                name: {"total": cell["created"], "completed": cell["completed"]}
+                for name, cell in cube.breakdown('project', start, end).items()
+            },
+            "by_priority": {
+                name: {"total": cell["created"], "completed": cell["completed"]}
+                for name, cell in cube.breakdown('priority', start, end).items()
+            }
+        }
+
+    @_memoized('tasks')
+    def generate_monthly_summary(self, year: Optional[int] = None, month: Optional[int] = None,
+                                 force_refresh=False) -> Dict[str, Any]:
+        """
+        生成月度任务总结（按创建日期统计，读取按天聚合）
+
+        Args:
+            year: 年份，默认今年
+            month: 月份，默认本月
+        """
+        today = date.today()
+        year = year or today.year
+        month = month or today.month
+        start_date = date(year, month, 1)
+        end_date = (date(year + (month == 12), month % 12 + 1, 1) - timedelta(days=1))
+        cube = self._get_task_cube(force_refresh=force_refresh)
+
+        day_keys = [format_date(start_date + timedelta(days=i)) for i in range((end_date - start_date).days + 1)]
+        summary = self._summarize_cube_range(cube, day_keys[0], day_keys[-1])
+        summary["by_day"] = {
+            day_key: {"total": cell["created"], "completed": cell["completed"]}
+            for day_key, cell in cube.daily(day_keys).items()
+        }
+        return {
+            "period": {"start_date": day_keys[0], "end_date": day_keys[-1]},
+            "tasks": summary
+        }
+
+    @_memoized('tasks')
+    def generate_yearly_summary(self, year: Optional[int] = None, force_refresh=False) -> Dict[str, Any]:
+        """
+        生成年度任务总结（按创建日期统计，读取按月聚合）
+
+        Args:
+            year: 年份，默认今年
+        """
+        year = year or date.today().year
+        start, end = f"{year}-01-01", f"{year}-12-31"
+        cube = self._get_task_cube(force_refresh=force_refresh)
+
+        summary = self._summarize_cube_range(cube, start, end)
+        summary["by_month"] = {
+            month_key: {"total": cell["created"], "completed": cell["completed"]}
+            for month_key, cell in cube.monthly([f"{year}-{m:02d}" for m in range(1, 13)]).items()
+        }
+        return {
+            "period": {"start_date": start, "end_date": end},
+            "tasks": summary
+        }
+
 
 # --- MCP 工具注册 ---
 # (注册函数保持不变，它们调用的是AnalyticsManager的方法)
@@ -662,6 +807,7 @@ def register_analytics_tools(server: FastMCP, auth_info: Dict[str, Any]):
     analytics_manager = AnalyticsManager() 
     
     @server.tool()
+    @request_scoped
     def get_goal_statistics(force_refresh: bool = False) -> Dict[str, Any]:
         """
         获取目标统计信息 (优先项目，后CSV)
@@ -676,9 +822,10 @@ def register_analytics_tools(server: FastMCP, auth_info: Dict[str, Any]):
             raise ValueError(f"获取目标统计信息失败: {str(e)}")
     
     @server.tool()
+    @request_scoped
     def get_goal_progress(goal_id: str) -> List[Dict[str, Any]]:
         """
-        获取目标进度历史 (目前仅支持CSV源)
+        获取目标进度历史 (读取进度日志)
         Args: goal_id: 目标ID
         Returns: 目标进度历史数据
         """
@@ -689,6 +836,7 @@ def register_analytics_tools(server: FastMCP, auth_info: Dict[str, Any]):
             raise ValueError(f"获取目标进度历史失败: {str(e)}")
     
     @server.tool()
+    @request_scoped
     def get_task_statistics(days: int = 30, force_refresh: bool = False) -> Dict[str, Any]:
         """
         获取任务统计信息 (来自API)
@@ -704,6 +852,7 @@ def register_analytics_tools(server: FastMCP, auth_info: Dict[str, Any]):
             raise ValueError(f"获取任务统计信息失败: {str(e)}")
     
     @server.tool()
+    @request_scoped
     def extract_task_keywords(limit: int = 20, force_refresh: bool = False) -> Dict[str, int]:
         """
         从任务中提取关键词 (来自API)
@@ -719,6 +868,7 @@ def register_analytics_tools(server: FastMCP, auth_info: Dict[str, Any]):
             raise ValueError(f"提取任务关键词失败: {str(e)}")
     
     @server.tool()
+    @request_scoped
     def predict_goal_completion(goal_id: str, force_refresh: bool = False) -> Dict[str, Any]:
         """
         预测目标完成情况 (优先项目，后CSV；目前仅支持带日期的目标)
@@ -734,6 +884,21 @@ def register_analytics_tools(server: FastMCP, auth_info: Dict[str, Any]):
             raise ValueError(f"预测目标完成情况失败: {str(e)}")
     
     @server.tool()
+    @request_scoped
+    def predict_goals_completion(force_refresh: bool = False) -> Dict[str, Any]:
+        """
+        批量预测全部进行中目标的完成情况 (按进度历史拟合趋势，一次返回全部目标)
+        Args: 
+            force_refresh: 是否强制刷新缓存数据 (默认为 False)
+        Returns: 每个目标的预计完成日期(eta)、可信度(confidence)与状态(status)，以及按状态计数
+        """
+        try:
+            return analytics_manager.get_goals_completion_forecast(force_refresh=force_refresh)
+        except Exception as e:
+            raise ValueError(f"批量预测目标完成情况失败: {str(e)}")
+    
+    @server.tool()
+    @request_scoped
     def generate_goal_report(goal_id: str, force_refresh: bool = False) -> Dict[str, Any]:
         """
         生成目标报告 (优先项目，后CSV)
@@ -749,6 +914,7 @@ def register_analytics_tools(server: FastMCP, auth_info: Dict[str, Any]):
             raise ValueError(f"生成目标报告失败: {str(e)}")
     
     @server.tool()
+    @request_scoped
     def generate_weekly_summary(force_refresh: bool = False) -> Dict[str, Any]:
         """
         生成每周总结 (合并项目目标和CSV目标)
@@ -761,3 +927,35 @@ def register_analytics_tools(server: FastMCP, auth_info: Dict[str, Any]):
             return analytics_manager.generate_weekly_summary(force_refresh=force_refresh)
         except Exception as e:
             raise ValueError(f"生成每周总结失败: {str(e)}")
+
+    @server.tool()
+    @request_scoped
+    def generate_monthly_summary(year: Optional[int] = None, month: Optional[int] = None,
+                                 force_refresh: bool = False) -> Dict[str, Any]:
+        """
+        生成月度任务总结 (按天聚合读取，含每日、项目与优先级分布)
+        Args: 
+            year: 年份 (默认今年)
+            month: 月份 (默认本月)
+            force_refresh: 是否强制刷新缓存数据 (默认为 False)
+        Returns: 月度总结数据
+        """
+        try:
+            return analytics_manager.generate_monthly_summary(year=year, month=month, force_refresh=force_refresh)
+        except Exception as e:
+            raise ValueError(f"生成月度总结失败: {str(e)}")
+
+    @server.tool()
+    @request_scoped
+    def generate_yearly_summary(year: Optional[int] = None, force_refresh: bool = False) -> Dict[str, Any]:
+        """
+        生成年度任务总结 (按月聚合读取，含每月、项目与优先级分布)
+        Args: 
+            year: 年份 (默认今年)
+            force_refresh: 是否强制刷新缓存数据 (默认为 False)
+        Returns: 年度总结数据
+        """
+        try:
+            return analytics_manager.generate_yearly_summary(year=year, force_refresh=force_refresh)
+        except Exception as e:
+            raise ValueError(f"生成年度总结失败: {str(e)}")
@@ -0,0 +1,193 @@
+"""
+已完成任务历史同步
+
+/project/{id}/data 只返回未完成任务，已完成任务需从 /project/{id}/task/completed 获取。
+本模块按 completedTime 分时间窗口拉取，并为每个项目记录已同步到的时间点（高水位：
+成功拉取后为同步时间减去少量重叠），之后的同步只拉取高水位之后新完成的任务。
+拉取结果写入任务快照（task_store）。
+"""
+
+import os
+import json
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional
+
+import pytz
+
+from .adapter import adapter
+from .task_store import task_store
+
+# 高水位状态文件
+DEFAULT_STATE_PATH = 'data/completed_sync_state.json'
+# 单个时间窗口的天数
+DEFAULT_WINDOW_DAYS = 30
+# 首次同步向前回溯的最大窗口数
+DEFAULT_MAX_WINDOWS = 24
+# 高水位相对同步时间的回退分钟数（覆盖上游完成时间写入延迟）
+DEFAULT_OVERLAP_MINUTES = 10
+
+_TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def _local_now() -> datetime:
+    """当前本地时间（Asia/Shanghai，去掉时区信息，与任务中的本地时间字符串可直接比较）"""
+    return datetime.now(pytz.timezone('Asia/Shanghai')).replace(tzinfo=None)
+
+
+class CompletedTaskSyncer:
+    """已完成任务的分窗口增量同步"""
+
+    def __init__(
+        self,
+        state_path: str = DEFAULT_STATE_PATH,
+        window_days: int = DEFAULT_WINDOW_DAYS,
+        max_windows: int = DEFAULT_MAX_WINDOWS,
+        overlap_minutes: int = DEFAULT_OVERLAP_MINUTES,
+    ):
+        """
+        初始化同步器
+
+        Args:
+            state_path: 高水位状态文件路径
+            window_days: 单个时间窗口的天数
+            max_windows: 首次同步向前回溯的最大窗口数
+            overlap_minutes: 高水位相对同步时间的回退分钟数
+        """
+        self.state_path = state_path
+        self.window = timedelta(days=window_days)
+        self.max_windows = max_windows
+        self.overlap = timedelta(minutes=overlap_minutes)
+        self._lock = threading.Lock()
+        self._marks: Optional[Dict[str, str]] = None
+
+    # ---------- 高水位 ----------
+    def _load_marks(self) -> Dict[str, str]:
+        if self._marks is None:
+            try:
+                with open(self.state_path, 'r', encoding='utf-8') as f:
+                    self._marks = json.load(f).get('projects', {})
+            except FileNotFoundError:
+                self._marks = {}
+            except Exception as e:
+                print(f"读取已完成任务同步状态失败，将重新全量回溯: {e}")
+                self._marks = {}
+        return self._marks
+
+    def _save_marks(self) -> None:
+        directory = os.path.dirname(self.state_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = self.state_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'projects': self._marks}, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.state_path)
+
+    def high_water_mark(self, project_id: str) -> Optional[str]:
+        """项目已同步到的时间点（本地时间字符串），未同步过返回 None"""
+        with self._lock:
+            return self._load_marks().get(project_id)
+
+    def reset(self, project_ids: Optional[Iterable[str]] = None) -> None:
+        """清除高水位（None 表示全部项目），下次同步重新回溯"""
+        with self._lock:
+            marks = self._load_marks()
+            if project_ids is None:
+                marks.clear()
+            else:
+                for pid in project_ids:
+                    marks.pop(pid, None)
+            self._save_marks()
+
+    # ---------- 拉取 ----------
+    def _fetch_window(self, project_id: str, start: datetime, end: datetime) -> List[Dict[str, Any]]:
+        return adapter.list_completed_tasks(
+            project_id,
+            start=start.strftime(_TIME_FORMAT),
+            end=end.strftime(_TIME_FORMAT),
+        )
+
+    def _fetch_project(
+        self,
+        project_id: str,
+        since: Optional[str],
+        now: datetime,
+        max_windows: Optional[int] = None,
+        stop_on_empty: bool = True,
+    ) -> List[Dict[str, Any]]:
+        """
+        拉取单个项目的已完成任务
+
+        有高水位时从高水位向后逐窗口拉取到当前时间；
+        无高水位时从当前时间向前逐窗口回溯，遇到空窗口（stop_on_empty）或达到窗口上限即停止。
+        """
+        tasks: List[Dict[str, Any]] = []
+        if since:
+            start = datetime.strptime(since, _TIME_FORMAT)
+            while start < now:
+                end = min(start + self.window, now + timedelta(seconds=1))
+                tasks.extend(self._fetch_window(project_id, start, end))
+                start = end
+        else:
+            end = now + timedelta(seconds=1)
+            for _ in range(max_windows or self.max_windows):
+                start = end - self.window
+                window_tasks = self._fetch_window(project_id, start, end)
+                if not window_tasks and stop_on_empty:
+                    break
+                tasks.extend(window_tasks)
+                end = start
+        return tasks
+
+    def sync(
+        self,
+        project_ids: Optional[Iterable[str]] = None,
+        backfill_windows: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        同步已完成任务
+
+        Args:
+            project_ids: 需要同步的项目ID，None 表示全部项目
+            backfill_windows: 回溯导入模式：忽略高水位，从当前时间向前完整回溯指定数量的窗口
+                              （不因空窗口提前停止），用于首次导入历史
+
+        Returns:
+            {"fetched": 本次拉取数量, "projects": {项目ID: 数量}, "tasks": 本次拉取的任务}
+        """
+        if project_ids is None:
+            project_ids = [p.get('id') for p in adapter.list_projects() if p.get('id')]
+        now = _local_now()
+        # 拉取成功后高水位推进到同步时间（留出重叠），没有新完成任务的项目下次也只拉一个窗口
+        synced_mark = (now - self.overlap).strftime(_TIME_FORMAT)
+        fetched: Dict[str, Dict[str, Any]] = {}
+        per_project: Dict[str, int] = {}
+        with self._lock:
+            marks = self._load_marks()
+            for pid in project_ids:
+                if backfill_windows:
+                    tasks = self._fetch_project(pid, None, now, backfill_windows, stop_on_empty=False)
+                else:
+                    tasks = self._fetch_project(pid, marks.get(pid), now)
+                # 与未完成任务一致只保留文本任务，笔记/清单不进入快照及其订阅方（归档、统计、关键词）
+                tasks = [t for t in tasks if t.get('kind') == 'TEXT']
+                per_project[pid] = len(tasks)
+                for task in tasks:
+                    if task.get('id'):
+                        fetched[task['id']] = task
+                if synced_mark > marks.get(pid, ''):
+                    marks[pid] = synced_mark
+            self._save_marks()
+
+        tasks = list(fetched.values())
+        task_store.upsert_tasks(tasks)
+        return {"fetched": len(tasks), "projects": per_project, "tasks": tasks}
+
+
+# 单例同步器供工具层复用
+completed_syncer = CompletedTaskSyncer()
+
+__all__ = [
+    "CompletedTaskSyncer",
+    "completed_syncer",
+]
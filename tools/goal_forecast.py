@@ -0,0 +1,128 @@
+"""
+目标完成预测（批量）
+
+把每个目标记录到的进度序列（日期 -> 进度）对齐为 目标数 × 采样点数 的矩阵，
+用带掩码的最小二乘一次拟合全部目标的线性趋势（斜率 = 每日进度），
+据此推算进度达到 100 的日期、拟合可信度，并结合截止日期给出状态。
+"""
+
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from utils.date.date_utils import format_date
+
+# 进度序列中的一个采样点：(相对今天的天数，今天为 0、过去为负, 进度 0-100)
+ProgressPoint = Tuple[float, float]
+
+
+def fit_progress_trends(series: Sequence[Sequence[ProgressPoint]]):
+    """
+    对多条进度序列同时做一元线性最小二乘
+
+    Args:
+        series: 每个目标的采样点列表
+
+    Returns:
+        (斜率, 截距, 拟合优度 R², 采样点数) 四个与 series 对齐的 numpy 数组；
+        采样点不足 2 个或日期全部相同的序列斜率为 0
+    """
+    import numpy as np
+
+    rows = len(series)
+    width = max((len(s) for s in series), default=0)
+    x = np.zeros((rows, width))
+    y = np.zeros((rows, width))
+    mask = np.zeros((rows, width))
+    for i, points in enumerate(series):
+        if points:
+            x[i, :len(points)], y[i, :len(points)] = zip(*points)
+            mask[i, :len(points)] = 1.0
+
+    n = mask.sum(axis=1)
+    sx = (mask * x).sum(axis=1)
+    sy = (mask * y).sum(axis=1)
+    sxx = (mask * x * x).sum(axis=1)
+    sxy = (mask * x * y).sum(axis=1)
+    denom = n * sxx - sx * sx
+    fitted = (n >= 2) & (denom > 1e-9)
+    safe_denom = np.where(fitted, denom, 1.0)
+    safe_n = np.maximum(n, 1.0)
+
+    slope = np.where(fitted, (n * sxy - sx * sy) / safe_denom, 0.0)
+    intercept = (sy - slope * sx) / safe_n
+    residual = mask * (y - (slope[:, None] * x + intercept[:, None]))
+    ss_res = (residual ** 2).sum(axis=1)
+    ss_tot = (mask * (y - (sy / safe_n)[:, None]) ** 2).sum(axis=1)
+    # 进度没有变化时，完全水平的拟合也视为完全吻合
+    r2 = np.where(ss_tot > 1e-9, 1.0 - ss_res / np.where(ss_tot > 1e-9, ss_tot, 1.0), 1.0)
+    return slope, intercept, np.clip(r2, 0.0, 1.0), n
+
+
+def forecast_goals(
+    goals: List[Dict[str, Any]],
+    series: List[List[ProgressPoint]],
+    today: Optional[date] = None
+) -> List[Dict[str, Any]]:
+    """
+    批量预测目标完成情况
+
+    Args:
+        goals: 目标列表（需包含 id、title、current_progress，可选 type、due_date）
+        series: 与 goals 对齐的进度序列
+        today: 基准日期，默认今天
+
+    Returns:
+        每个目标的预测：{"goal_id", "title", "type", "current_progress", "data_points",
+        "daily_rate", "eta", "due_date", "confidence", "status"}，
+        status 为 completed / on_track / behind / overdue / stalled / insufficient_data
+    """
+    today = today or date.today()
+    if not goals:
+        return []
+    slope, intercept, r2, n = fit_progress_trends(series)
+
+    results = []
+    for i, goal in enumerate(goals):
+        progress = goal.get('current_progress', 0)
+        due = goal.get('due_date')
+        points = int(n[i])
+        rate = float(slope[i])
+        eta = None
+        if points >= 2 and rate > 0:
+            # 趋势线达到 100 的日期（不早于今天）
+            days = max((100.0 - float(intercept[i])) / rate, 0.0)
+            eta = today + timedelta(days=round(days))
+
+        if progress >= 100:
+            status, eta = "completed", today
+        elif points < 2:
+            status = "insufficient_data"
+        elif rate <= 0:
+            status = "stalled"
+        elif due and today > due:
+            status = "overdue"
+        elif due and eta > due:
+            status = "behind"
+        else:
+            status = "on_track"
+
+        results.append({
+            "goal_id": goal.get('id'),
+            "title": goal.get('title', ''),
+            "type": goal.get('type', ''),
+            "current_progress": progress,
+            "data_points": points,
+            "daily_rate": round(rate, 2),
+            "eta": format_date(eta) if eta else None,
+            "due_date": format_date(due) if due else None,
+            # 拟合优度按采样点数折减：两个点总能完全拟合，可信度只算一半
+            "confidence": round(float(r2[i]) * (1 - 1 / points), 2) if points >= 2 else 0.0,
+            "status": status,
+        })
+    return results
+
+
+__all__ = [
+    "fit_progress_trends",
+    "forecast_goals",
+]
@@ -0,0 +1,203 @@
+"""
+目标 -> 任务 关联表
+
+按目标规则（项目型目标关联项目下的任务，其余目标按关键词匹配任务标题/内容）物化关联关系，
+随任务快照（task_store）的变更增量维护；目标规则变化时才整体重建。
+每个目标同时维护汇总值（关联任务数、已完成数、最近活动时间），报告与统计按关联数读取。
+"""
+
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from utils.text.text_analysis import normalize_keywords
+from utils.text.keyword_automaton import KeywordAutomaton
+from .task_tools import _format_task_date
+
+
+def goal_rule(goal: Dict[str, Any]) -> Tuple:
+    """
+    目标的关联规则
+
+    Returns:
+        ('project', 项目ID) 或 ('keywords', 小写关键词元组)
+    """
+    if goal.get('type') == 'project_based':
+        return ('project', goal.get('id'))
+    keywords = normalize_keywords(goal.get('keywords') or goal.get('title', ''))
+    return ('keywords', tuple(sorted(set(k.lower() for k in keywords if len(k) > 1))))
+
+
+def _task_activity(task: Dict[str, Any]) -> Optional[str]:
+    """任务最近一次活动时间（修改/完成/创建时间中最晚者，API 时间格式可直接按字符串比较）"""
+    times = [t for t in (task.get('modifiedTime'), task.get('completedTime'), task.get('createdTime')) if t]
+    return max(times) if times else None
+
+
+def _link_record(task: Dict[str, Any]) -> Dict[str, Any]:
+    """关联表中保存的任务摘要"""
+    return {
+        "id": task.get('id', ''),
+        "title": task.get('title', ''),
+        "status": task.get('status'),
+        "isCompleted": task.get('isCompleted', False),
+        "createdTime": _format_task_date(task.get('createdTime')) or '',
+        "_activity": _task_activity(task),
+    }
+
+
+class GoalLinkTable:
+    """目标 -> 任务 关联表与按目标汇总"""
+
+    def __init__(self):
+        # 目标ID -> 关联规则
+        self._rules: Dict[str, Tuple] = {}
+        # 项目ID -> 项目型目标ID列表
+        self._project_goals: Dict[str, List[str]] = {}
+        # 全部关键词型目标的关键词自动机：关键词 -> 目标ID
+        self._keywords = KeywordAutomaton()
+        # 目标ID -> {任务ID: 任务摘要}
+        self._links: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        # 任务ID -> 关联的目标ID集合
+        self._task_goals: Dict[str, set] = {}
+        # 目标ID -> {"total", "completed", "last_activity", "stale"}
+        self._rollups: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.RLock()
+
+    # ---------- 目标 ----------
+    def set_goals(self, goals: List[Dict[str, Any]], tasks: List[Dict[str, Any]]) -> None:
+        """
+        设置目标列表，规则有变化时按 tasks 重建关联
+
+        Args:
+            goals: 目标列表（项目型或CSV目标）
+            tasks: 当前全部任务（通常为 task_store.tasks()）
+        """
+        rules = {g['id']: goal_rule(g) for g in goals if g.get('id')}
+        with self._lock:
+            if rules == self._rules:
+                return
+            self._rules = rules
+            self._project_goals = {}
+            self._keywords = KeywordAutomaton()
+            for goal_id, (kind, value) in rules.items():
+                if kind == 'project':
+                    self._project_goals.setdefault(value, []).append(goal_id)
+                else:
+                    for keyword in value:
+                        self._keywords.add(keyword, goal_id)
+            self._keywords.build()
+            self._links = {goal_id: {} for goal_id in rules}
+            self._task_goals = {}
+            self._rollups = {goal_id: self._empty_rollup() for goal_id in rules}
+            for task in tasks:
+                self._link_locked(task)
+
+    @staticmethod
+    def _empty_rollup() -> Dict[str, Any]:
+        return {"total": 0, "completed": 0, "last_activity": None, "stale": False}
+
+    def _goals_for(self, task: Dict[str, Any]) -> List[str]:
+        """任务命中的目标"""
+        goal_ids = list(self._project_goals.get(task.get('projectId'), ()))
+        if len(self._keywords):
+            # 一次扫描得到全部命中的关键词型目标
+            text = f"{task.get('title', '')} {task.get('content', '')}".lower()
+            goal_ids.extend(self._keywords.find(text))
+        return goal_ids
+
+    # ---------- 增量维护 ----------
+    def _unlink_locked(self, task_id: str) -> None:
+        for goal_id in self._task_goals.pop(task_id, ()):
+            record = self._links[goal_id].pop(task_id)
+            rollup = self._rollups[goal_id]
+            rollup["total"] -= 1
+            if record["isCompleted"]:
+                rollup["completed"] -= 1
+            if record["_activity"] and record["_activity"] == rollup["last_activity"]:
+                # 最大值无法直接扣减，读取时再按关联重算
+                rollup["stale"] = True
+
+    def _link_locked(self, task: Dict[str, Any]) -> None:
+        task_id = task.get('id')
+        if not task_id:
+            return
+        self._unlink_locked(task_id)
+        goal_ids = self._goals_for(task)
+        if not goal_ids:
+            return
+        record = _link_record(task)
+        self._task_goals[task_id] = set(goal_ids)
+        for goal_id in goal_ids:
+            self._links[goal_id][task_id] = record
+            rollup = self._rollups[goal_id]
+            rollup["total"] += 1
+            if record["isCompleted"]:
+                rollup["completed"] += 1
+            if record["_activity"] and not rollup["stale"] and (
+                rollup["last_activity"] is None or record["_activity"] > rollup["last_activity"]
+            ):
+                rollup["last_activity"] = record["_activity"]
+
+    def on_task_changes(self, upserted: List[Dict[str, Any]], removed: List[Dict[str, Any]]) -> None:
+        """task_store 订阅回调"""
+        with self._lock:
+            for task in removed:
+                if task.get('id'):
+                    self._unlink_locked(task['id'])
+            for task in upserted:
+                self._link_locked(task)
+
+    # ---------- 查询 ----------
+    def linked_tasks(self, goal_id: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        目标关联的任务摘要（按创建时间先后）
+
+        Args:
+            goal_id: 目标ID
+            limit: 返回数量上限
+        """
+        with self._lock:
+            records = list(self._links.get(goal_id, {}).values())
+        records.sort(key=lambda r: r["createdTime"])
+        if limit is not None:
+            records = records[:limit]
+        return [{k: v for k, v in r.items() if not k.startswith('_')} for r in records]
+
+    def rollup(self, goal_id: str) -> Dict[str, Any]:
+        """
+        目标的汇总值
+
+        Returns:
+            {"total", "completed", "completion_rate"(0-100), "last_activity"}
+        """
+        with self._lock:
+            rollup = self._rollups.get(goal_id)
+            if rollup is None:
+                rollup = self._empty_rollup()
+            elif rollup["stale"]:
+                activities = [r["_activity"] for r in self._links[goal_id].values() if r["_activity"]]
+                rollup["last_activity"] = max(activities) if activities else None
+                rollup["stale"] = False
+            total, completed, last = rollup["total"], rollup["completed"], rollup["last_activity"]
+        return {
+            "total": total,
+            "completed": completed,
+            "completion_rate": round(completed / total * 100, 2) if total else 0,
+            "last_activity": _format_task_date(last) if last else None,
+        }
+
+    def rollups(self) -> Dict[str, Dict[str, Any]]:
+        """全部目标的汇总值"""
+        with self._lock:
+            goal_ids = list(self._rules)
+        return {goal_id: self.rollup(goal_id) for goal_id in goal_ids}
+
+
+# 单例关联表供分析工具复用
+goal_links = GoalLinkTable()
+
+__all__ = [
+    "GoalLinkTable",
+    "goal_links",
+    "goal_rule",
+]
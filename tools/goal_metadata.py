@@ -0,0 +1,212 @@
+"""
+目标元数据缓存与索引
+
+目标的类型、关键词、开始日期、频率以 `[Key: value]` 文本保存在任务 content 的元数据段中。
+解析结果按任务ID缓存，任务内容未修改时不再做正则解析；
+目标管理项目下的任务随任务快照（task_store）的变更增量维护按类型、状态、关键词的索引，
+目标列表的筛选直接按索引取交集。
+"""
+
+import re
+import threading
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+METADATA_PATTERN = re.compile(r"\[(.*?): (.*?)\]")
+# 描述中元数据段的分隔符
+METADATA_SEPARATOR = "\n\n--- Metadata ---\n"
+DEFAULT_GOAL_TYPE = 'permanent'
+
+
+class GoalMetadata(NamedTuple):
+    """解析后的目标元数据"""
+    type: str
+    keywords: Tuple[str, ...]      # 小写、去重后的关键词
+    keywords_text: str             # 元数据中关键词的原始文本
+    start_date: Optional[str]
+    frequency: Optional[str]
+    description: str               # 基础描述（不含元数据段）
+    fields: Dict[str, str]         # 全部元数据键值（键为小写）
+
+
+def split_keywords(text: str) -> Tuple[str, ...]:
+    """
+    把元数据中的关键词文本拆为小写关键词元组
+    兼容旧版本以列表形式写入的 "['a', 'b']"
+    """
+    seen = []
+    for part in text.split(','):
+        keyword = part.strip().strip("[]'\" ").lower()
+        if keyword and keyword not in seen:
+            seen.append(keyword)
+    return tuple(seen)
+
+
+def parse_goal_metadata(content: Optional[str]) -> GoalMetadata:
+    """
+    解析任务 content 中的目标元数据
+
+    Args:
+        content: 任务内容
+
+    Returns:
+        GoalMetadata
+    """
+    content = content or ''
+    fields = {key.lower(): value.strip() for key, value in METADATA_PATTERN.findall(content)}
+    parts = content.split(METADATA_SEPARATOR)
+    keywords_text = fields.get('keywords', '')
+    return GoalMetadata(
+        type=fields.get('type', DEFAULT_GOAL_TYPE),
+        keywords=split_keywords(keywords_text),
+        keywords_text=keywords_text,
+        start_date=fields.get('start_date'),
+        frequency=fields.get('frequency'),
+        description=parts[0] if len(parts) > 1 else '',
+        fields=fields,
+    )
+
+
+def goal_status(task: Dict[str, Any]) -> str:
+    """目标状态：任务已完成为 completed，否则 active"""
+    return 'completed' if task.get('status') == 2 or task.get('isCompleted') else 'active'
+
+
+class GoalMetadataIndex:
+    """目标元数据缓存，以及目标管理项目下目标的类型/状态/关键词索引"""
+
+    def __init__(self):
+        # 任务ID -> (content, 元数据)
+        self._cache: Dict[str, Tuple[str, GoalMetadata]] = {}
+        # 已索引目标：任务ID -> (类型, 状态, 关键词, 小写标题)
+        self._indexed: Dict[str, Tuple[str, str, Tuple[str, ...], str]] = {}
+        self._by_type: Dict[str, Set[str]] = {}
+        self._by_status: Dict[str, Set[str]] = {}
+        self._by_keyword: Dict[str, Set[str]] = {}
+        self._project_id: Optional[str] = None
+        self._lock = threading.RLock()
+
+    # ---------- 元数据缓存 ----------
+    def metadata(self, task: Dict[str, Any]) -> GoalMetadata:
+        """
+        任务的目标元数据（按任务ID缓存，content 未变时直接复用解析结果；
+        原始与简化格式的 modifiedTime 写法不同，不能单凭时间判断，且修改时间未必随本地写入更新）
+
+        Args:
+            task: 任务（原始或简化格式均可）
+        """
+        task_id = task.get('id')
+        content = task.get('content') or ''
+        with self._lock:
+            cached = self._cache.get(task_id)
+        if cached is not None and cached[0] == content:
+            return cached[1]
+        meta = parse_goal_metadata(content)
+        if task_id:
+            with self._lock:
+                self._cache[task_id] = (content, meta)
+        return meta
+
+    # ---------- 索引维护 ----------
+    def _unindex_locked(self, task_id: str) -> None:
+        entry = self._indexed.pop(task_id, None)
+        if entry is None:
+            return
+        goal_type, status, keywords, _ = entry
+        self._by_type.get(goal_type, set()).discard(task_id)
+        self._by_status.get(status, set()).discard(task_id)
+        for keyword in keywords:
+            self._by_keyword.get(keyword, set()).discard(task_id)
+
+    def _index_locked(self, task: Dict[str, Any]) -> None:
+        task_id = task.get('id')
+        if not task_id:
+            return
+        self._unindex_locked(task_id)
+        if not self._project_id or task.get('projectId') != self._project_id:
+            return
+        meta = self.metadata(task)
+        status = goal_status(task)
+        self._indexed[task_id] = (meta.type, status, meta.keywords, (task.get('title') or '').lower())
+        self._by_type.setdefault(meta.type, set()).add(task_id)
+        self._by_status.setdefault(status, set()).add(task_id)
+        for keyword in meta.keywords:
+            self._by_keyword.setdefault(keyword, set()).add(task_id)
+
+    def set_project(self, project_id: Optional[str], tasks: Iterable[Dict[str, Any]] = ()) -> None:
+        """
+        设置目标管理项目，项目变化时按 tasks 重建索引
+
+        Args:
+            project_id: 目标管理项目ID
+            tasks: 当前全部任务（通常为 task_store.tasks()）
+        """
+        with self._lock:
+            if project_id == self._project_id:
+                return
+            self._project_id = project_id
+            self._indexed, self._by_type, self._by_status, self._by_keyword = {}, {}, {}, {}
+            for task in tasks:
+                self._index_locked(task)
+
+    def on_task_changes(self, upserted: List[Dict[str, Any]], removed: List[Dict[str, Any]]) -> None:
+        """task_store 订阅回调"""
+        with self._lock:
+            for task in removed:
+                task_id = task.get('id')
+                if task_id:
+                    self._unindex_locked(task_id)
+                    self._cache.pop(task_id, None)
+            for task in upserted:
+                self._index_locked(task)
+
+    # ---------- 查询 ----------
+    def query(
+        self,
+        type: Optional[str] = None,
+        status: Optional[str] = None,
+        keywords: Iterable[str] = ()
+    ) -> Set[str]:
+        """
+        按条件筛选已索引的目标
+
+        Args:
+            type: 目标类型
+            status: 目标状态 (active/completed)
+            keywords: 小写搜索关键词，命中元数据关键词或为标题子串即算匹配（任一关键词）
+
+        Returns:
+            满足全部条件的目标ID集合
+        """
+        keywords = [k for k in keywords if k]
+        with self._lock:
+            result = set(self._indexed)
+            if type:
+                result &= self._by_type.get(type, set())
+            if status:
+                result &= self._by_status.get(status, set())
+            if keywords:
+                matched = set()
+                for keyword in keywords:
+                    matched |= self._by_keyword.get(keyword, set())
+                # 标题为子串匹配，只需检查尚未命中的候选
+                matched |= {
+                    task_id for task_id in result - matched
+                    if any(k in self._indexed[task_id][3] for k in keywords)
+                }
+                result &= matched
+        return result
+
+
+# 单例供目标工具复用
+goal_metadata = GoalMetadataIndex()
+
+__all__ = [
+    "GoalMetadata",
+    "GoalMetadataIndex",
+    "goal_metadata",
+    "goal_status",
+    "parse_goal_metadata",
+    "split_keywords",
+    "METADATA_PATTERN",
+    "METADATA_SEPARATOR",
+]
@@ -0,0 +1,128 @@
+"""
+目标进度时间序列
+
+目标进度每次变化时追加一条记录到 JSONL（data/goal_progress.jsonl）：
+{"goal_id": ..., "date": ..., "progress": ...}。文件在内存中按目标ID建立索引，
+按 (mtime, size) 判断是否需要重新读取；进度历史查询直接读取索引，无需扫描备份文件。
+"""
+
+import os
+import json
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# 进度日志文件
+DEFAULT_LOG_PATH = os.environ.get("DIDA_GOAL_PROGRESS_LOG", "data/goal_progress.jsonl")
+
+# 一条待记录的进度：(目标ID, 日期时间字符串, 进度)
+ProgressEntry = Tuple[str, str, float]
+
+
+class GoalProgressLog:
+    """按目标ID索引的进度变化日志（仅追加）"""
+
+    def __init__(self, path: str = DEFAULT_LOG_PATH):
+        """
+        初始化
+
+        Args:
+            path: 日志文件路径
+        """
+        self.path = path
+        self._lock = threading.RLock()
+        # 已读取文件的 (mtime, size)
+        self._file_key: Optional[Tuple[float, int]] = None
+        # 目标ID -> [(日期, 进度), ...]（按写入顺序）
+        self._series: Dict[str, List[Tuple[str, float]]] = {}
+
+    def exists(self) -> bool:
+        """日志文件是否已存在"""
+        return os.path.exists(self.path)
+
+    def _stat_key(self) -> Optional[Tuple[float, int]]:
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime, stat.st_size)
+
+    def _load_locked(self) -> None:
+        """读取日志（文件未变化时直接使用索引）"""
+        key = self._stat_key()
+        if key == self._file_key:
+            return
+        series: Dict[str, List[Tuple[str, float]]] = {}
+        if key is not None:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # 跳过写入中断产生的残缺行
+                        continue
+                    if record.get('goal_id'):
+                        series.setdefault(record['goal_id'], []).append((record.get('date', ''), record.get('progress', 0)))
+        self._series = series
+        self._file_key = key
+
+    def record(self, entries: Iterable[ProgressEntry], keep_unchanged: bool = False) -> int:
+        """
+        记录进度
+
+        Args:
+            entries: (目标ID, 日期, 进度) 序列，同一目标按时间先后排列
+            keep_unchanged: False 时跳过进度与该目标最近一次记录相同的条目；
+                            True 时只跳过日期与进度都相同的条目（日期来自目标修改时间，进度未变的修改也保留）
+
+        Returns:
+            实际写入的记录数
+        """
+        with self._lock:
+            self._load_locked()
+            lines = []
+            for goal_id, stamp, progress in entries:
+                if not goal_id:
+                    continue
+                points = self._series.setdefault(goal_id, [])
+                if points and points[-1][1] == progress and (not keep_unchanged or points[-1][0] == stamp):
+                    continue
+                points.append((stamp, progress))
+                lines.append(json.dumps({"goal_id": goal_id, "date": stamp, "progress": progress}, ensure_ascii=False))
+            if not lines:
+                return 0
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write('\n'.join(lines) + '\n')
+            # 索引已包含本次写入，无需重新读取
+            self._file_key = self._stat_key()
+            return len(lines)
+
+    def history(self, goal_id: str) -> List[Dict[str, Any]]:
+        """
+        目标的进度历史
+
+        Args:
+            goal_id: 目标ID
+
+        Returns:
+            [{"date", "progress"}, ...]，按日期升序，同一日期保留最后一次记录
+        """
+        with self._lock:
+            self._load_locked()
+            points = list(self._series.get(goal_id, ()))
+        by_date = {stamp: progress for stamp, progress in points}
+        return [{"date": stamp, "progress": by_date[stamp]} for stamp in sorted(by_date)]
+
+
+# 单例日志供分析工具复用
+goal_progress_log = GoalProgressLog()
+
+__all__ = [
+    "GoalProgressLog",
+    "goal_progress_log",
+]
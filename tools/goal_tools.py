@@ -2,7 +2,7 @@
 目标管理工具 (基于滴答清单项目和任务)
 """
 
-import re
+import os
 import json
 from typing import List, Dict, Optional, Any, Union, Tuple
 from fastmcp import FastMCP
@@ -15,23 +15,33 @@ from .project_tools import (
     delete_project_logic
 )
 from .task_tools import (
-    get_tasks_logic, 
     create_task_logic,
     update_task_logic,
-    delete_task_logic
+    delete_task_logic,
+    _get_all_tasks_logic,
+    _merge_project_info_logic,
+    _simplify_task_data
 )
+from .adapter import adapter, APIError
+from .task_store import task_store
+from .completed_sync import completed_syncer
+from .request_context import cached_in_request, request_scoped
+from .task_keywords import task_keywords
 # 目标更新走 update_task_logic，无需直接HTTP调用
 
 # 导入辅助函数
 from utils.date.date_utils import is_valid_date, format_datetime, get_current_time
-from utils.text.text_analysis import normalize_keywords, match_keywords, calculate_similarity
+from utils.text.text_analysis import normalize_keywords, match_keywords
+from .goal_vectors import goal_vectors
+from .goal_metadata import goal_metadata, goal_status, METADATA_PATTERN
 
 # --- 常量 --- 
 GOAL_PROJECT_NAME = "🎯 目标管理"  # 存放所有目标的项目名称
 GOAL_TASK_PREFIX = ""  # 目标任务的前缀
-METADATA_PATTERN = re.compile(r"\[(.*?): (.*?)\]")
 GOAL_TYPES = ['phase', 'permanent', 'habit'] # 目标类型保持，用于描述元数据
 GOAL_STATUSES = ['active', 'completed', 'abandoned'] # 目标状态
+# 批量关联结果的持久化文件（供按目标统计进度等报告直接读取）
+GOAL_LINKS_PATH = os.environ.get("DIDA_GOAL_LINKS", "data/goal_links.json")
 
 # --- 辅助函数 ---
 
@@ -43,23 +53,17 @@ def _format_metadata(data: Dict[str, Any]) -> str:
             parts.append(f"[{key.capitalize()}: {value}]")
     return " ".join(parts)
 
-def _parse_metadata(description: Optional[str]) -> Dict[str, Any]:
-    """从任务描述字符串中解析元数据"""
-    metadata = {}
-    if description:
-        matches = METADATA_PATTERN.findall(description)
-        for key, value in matches:
-            metadata[key.lower()] = value.strip()
-    return metadata
+# 目标元数据索引随任务快照增量维护
+task_store.subscribe(goal_metadata.on_task_changes)
 
-def _get_goal_project() -> Optional[str]:
+# 已解析的目标管理项目，避免每次列出全部项目
+_goal_project_cache: Optional[Dict[str, Any]] = None
+
+def _find_goal_project(projects: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
     """
-    获取目标管理项目的ID
+    在项目列表中查找目标管理项目
     先精确匹配项目名称，如果找不到，再尝试模糊匹配
-    如果不存在则返回 None
     """
-    projects = get_projects_logic()
-    
     # 1. 精确匹配项目名称
     for project in projects:
         if project.get('name') == GOAL_PROJECT_NAME:
@@ -81,11 +85,101 @@ def _get_goal_project() -> Optional[str]:
     
     return None 
 
+def _get_goal_project(projects: Optional[List[Dict[str, Any]]] = None) -> Optional[Dict[str, Any]]:
+    """
+    获取目标管理项目
+    已解析过时直接返回缓存；如果不存在则返回 None
+
+    Args:
+        projects: 已获取的项目列表，提供时据此重新解析并更新缓存
+    """
+    global _goal_project_cache
+    if projects is None:
+        if _goal_project_cache is not None:
+            return _goal_project_cache
+        projects = get_projects_logic()
+    _goal_project_cache = _find_goal_project(projects)
+    return _goal_project_cache
+
+def _fetch_goal_project_tasks(project: Dict[str, Any], completed: Optional[bool]) -> List[Dict[str, Any]]:
+    """
+    只拉取目标管理项目的任务：未完成任务取自该项目的 /data，
+    需要已完成任务时增量同步该项目的已完成任务后从快照读取
+
+    Returns:
+        原始任务列表
+    """
+    project_id = project.get('id')
+    tasks: List[Dict[str, Any]] = []
+    if completed is not True:
+        tasks = [
+            _merge_project_info_logic(t, [project])
+            for t in adapter.list_project_tasks(project_id, project.get('name'))
+            if t.get('kind') == 'TEXT'
+        ]
+        task_store.sync_tasks(tasks, project_ids=[project_id], keep_completed=True)
+    if completed is not False:
+        try:
+            completed_syncer.sync([project_id])
+        except Exception as e:
+            print(f"同步已完成目标失败: {e}")
+        active_ids = {t.get('id') for t in tasks}
+        tasks = tasks + [
+            t for t in task_store.tasks()
+            if t.get('projectId') == project_id and t.get('isCompleted') and t.get('id') not in active_ids
+        ]
+    return tasks
+
+def _get_goal_raw_tasks(completed: Optional[bool] = None) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    获取目标管理项目及其原始任务（只请求目标项目，不做全账户拉取；同一次工具调用内只拉取一次）
+
+    Args:
+        completed: True 只要已完成，False 只要未完成，None 全部
+
+    Returns:
+        (目标管理项目, 原始任务列表)，项目不存在时为 (None, [])
+    """
+    return cached_in_request(('goal_tasks', completed), lambda: _load_goal_raw_tasks(completed))
+
+def _load_goal_raw_tasks(completed: Optional[bool]) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]:
+    project = _get_goal_project()
+    if not project:
+        return None, []
+    goal_metadata.set_project(project.get('id'), task_store.tasks())
+    try:
+        return project, _fetch_goal_project_tasks(project, completed)
+    except APIError as e:
+        if e.status_code != 404:
+            raise
+        # 缓存的目标项目已被删除，重新解析一次
+        project = _get_goal_project(get_projects_logic())
+        if not project:
+            return None, []
+        goal_metadata.set_project(project.get('id'), task_store.tasks())
+        return project, _fetch_goal_project_tasks(project, completed)
+
+def _get_goal_tasks(completed: Optional[bool] = None) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    获取目标管理项目及其任务
+
+    Returns:
+        (目标管理项目, 简化后的任务列表（与 get_tasks_logic 返回格式一致）)
+    """
+    project, tasks = _get_goal_raw_tasks(completed)
+    return project, [_simplify_task_data(t, [project]) for t in tasks]
+
+def _goal_prefetched() -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """目标项目的 (原始任务, 项目列表)，供 update/delete_task_logic 复用而不再全量拉取"""
+    project, tasks = _get_goal_raw_tasks()
+    return tasks, [project] if project else []
+
 def _ensure_goal_project_exists() -> str:
     """
     确保存在目标管理项目
     如果不存在则创建，返回项目ID
     """
+    global _goal_project_cache
     project = _get_goal_project()
     if project:
         return project
@@ -96,24 +190,25 @@ def _ensure_goal_project_exists() -> str:
     project = project_data.get('id')
     if not project:
         raise ValueError(f"创建目标管理项目失败，未返回项目ID。API响应: {project_data}")
+    _goal_project_cache = project_data
     
     return project
 
 def _enrich_goal_data(task: Dict[str, Any]) -> Dict[str, Any]:
     """将任务数据丰富为目标数据"""
     task_id = task.get('id')
-    metadata = _parse_metadata(task.get('content'))
+    metadata = goal_metadata.metadata(task)  # 按 (ID, modifiedTime) 缓存的解析结果
     
     goal_data = {
         "id": task_id,
         "title": task.get('title', ''),  # 直接使用任务标题，不需要移除前缀
         "description": task.get('content', ''), # 保留原始描述
-        "type": metadata.get('type', 'permanent'), # 默认类型
-        "status": 'completed' if task.get('status') == 2 or task.get('isCompleted') else 'active',
-        "keywords": metadata.get('keywords', ''),
-        "start_date": metadata.get('start_date'),
+        "type": metadata.type,
+        "status": goal_status(task),
+        "keywords": metadata.keywords_text,
+        "start_date": metadata.start_date,
         "due_date": task.get('dueDate'),  # 使用任务本身的截止日期
-        "frequency": metadata.get('frequency'),
+        "frequency": metadata.frequency,
         "created_time": task.get('createdTime'), # 使用任务创建时间
         "modified_time": task.get('modifiedTime'),
         "priority": task.get('priority', 0),  # 任务优先级
@@ -122,6 +217,32 @@ def _enrich_goal_data(task: Dict[str, Any]) -> Dict[str, Any]:
     }
     return {k: v for k, v in goal_data.items() if v is not None}
 
+def _shape_goal_data(
+    goal: Dict[str, Any],
+    fields: Optional[List[str]] = None,
+    compact: bool = False
+) -> Dict[str, Any]:
+    """
+    按需裁剪目标数据
+
+    Args:
+        goal: 丰富后的目标数据
+        fields: 只返回这些字段（始终包含 id）
+        compact: 紧凑模式，去掉 raw_task_data、描述中的元数据段（已拆为独立字段）以及空值
+    """
+    if compact:
+        goal = {k: v for k, v in goal.items() if k != 'raw_task_data' and v not in ('', [], {})}
+        if goal.get('description'):
+            desc = goal['description'].split("--- Metadata ---")[0].strip()
+            if desc:
+                goal['description'] = desc
+            else:
+                goal.pop('description')
+    if fields:
+        wanted = set(fields) | {'id'}
+        goal = {k: v for k, v in goal.items() if k in wanted}
+    return goal
+
 # --- 模块级核心逻辑函数 ---
 
 def create_goal_logic(
@@ -176,7 +297,7 @@ def create_goal_logic(
         # 3. 准备元数据
         metadata = {
             'type': type,
-            'keywords': normalize_keywords(keywords),
+            'keywords': ",".join(normalize_keywords(keywords)),
             'start_date': start_date,
             'frequency': frequency
             # due_date 将直接用于任务的dueDate字段
@@ -206,24 +327,24 @@ def create_goal_logic(
 def get_goals_logic(
     type: Optional[str] = None,
     status: Optional[str] = None,
-    keywords: Optional[str] = None
+    keywords: Optional[str] = None,
+    fields: Optional[List[str]] = None,
+    compact: bool = False
 ) -> List[Dict[str, Any]]:
     """
     获取目标列表 (基于任务)
-    
+
     Args:
         type: 目标类型筛选
         status: 目标状态筛选 (active/completed)
         keywords: 关键词筛选 (匹配目标标题或元数据中的关键词)
-        
+        fields: 只返回这些字段（始终包含 id）
+        compact: 紧凑模式，去掉 raw_task_data 等冗余内容
+
     Returns:
         目标列表
     """
-    project = _get_goal_project()
-    if not project:
-        print("未找到目标管理项目，返回空列表")
-        return []  # 如果目标管理项目不存在，直接返回空列表
-    # 2. 确定完成状态参数
+    # 1. 确定完成状态参数
     completed = None
     if status == 'completed':
         completed = True
@@ -231,49 +352,36 @@ def get_goals_logic(
         completed = False
     
     try:
-        # 3. 获取项目下的所有任务 
-        # 使用项目名称，而不是ID，以匹配task_tools的API设计
-        all_tasks = get_tasks_logic(
-            mode='all', 
-            completed=completed,
-            project_name=project.get('name')
-        )
+        # 2. 只获取目标管理项目下的任务（项目ID已缓存）
+        project, all_tasks = _get_goal_raw_tasks(completed)
+        if not project:
+            print("未找到目标管理项目，返回空列表")
+            return []  # 如果目标管理项目不存在，直接返回空列表
 
         # 如果返回的是None或空值，返回空列表
         if not all_tasks:
             print("项目下未找到任务，返回空列表")
             return []
             
-        # 4. 过滤得到目标任务
-        goal_list = []
-        
-        # 处理关键词
+        # 3. 处理关键词
         search_keywords = keywords or ""
         if not isinstance(search_keywords, str):
             search_keywords = ""
-            
-        search_keywords_set = set(normalize_keywords(search_keywords).split(',')) if search_keywords else set()
-        
+        search_keywords_set = set(k.lower() for k in normalize_keywords(search_keywords)) if search_keywords else set()
+
+        # 4. 按类型/状态/关键词索引筛选，只丰富命中的目标
+        matched_ids = goal_metadata.query(
+            type=type,
+            status=status if completed is not None else None,
+            keywords=search_keywords_set
+        )
+        goal_list = []
         for task in all_tasks:
             # 由于GOAL_TASK_PREFIX为空，不用startswith判断，而是看任务是否属于目标项目
-            if task and isinstance(task, dict):
+            if task and isinstance(task, dict) and task.get('id') in matched_ids:
                 try:
-                    goal_data = _enrich_goal_data(task)
-                    
-                    # 类型筛选
-                    if type and goal_data.get('type') != type:
-                        continue
-                    
-                    # 关键词筛选
-                    if search_keywords_set:
-                        goal_title_lower = goal_data.get('title', '').lower()
-                        goal_meta_keywords = set(k for k in goal_data.get('keywords', '').split(',') if k)
-                        # 检查标题或元数据关键词是否包含任何搜索关键词
-                        if not any(sk in goal_title_lower for sk in search_keywords_set) and \
-                           not search_keywords_set.intersection(goal_meta_keywords):
-                            continue
-                    
-                    goal_list.append(goal_data)
+                    goal_data = _enrich_goal_data(_simplify_task_data(task, [project]))
+                    goal_list.append(_shape_goal_data(goal_data, fields, compact))
                 except Exception as e:
                     print(f"处理任务时出错，跳过: {e}")
                     continue
@@ -294,30 +402,16 @@ def get_goal_logic(goal_id: str) -> Optional[Dict[str, Any]]:
     Returns:
         目标详情，如果不是目标任务或未找到则返回None
     """
-    # 尝试直接获取任务详情
     try:
-        # 获取目标项目
-        goal_project = _get_goal_project()
+        # 只获取目标管理项目下的任务，不属于目标项目的任务自然不会命中
+        goal_project, tasks = _get_goal_tasks()
         if not goal_project:
             return None
-            
-        project_id = goal_project.get('id')
         
-        # 获取所有任务
-        tasks = get_tasks_logic(mode="all")
-        task = None
-        for t in tasks:
-            if t.get('id') == goal_id:
-                task = t
-                break
-                
+        task = next((t for t in tasks if t.get('id') == goal_id), None)
         if not task:
             return None
         
-        # 验证是否属于目标项目
-        if task.get('projectId') != project_id:
-            return None
-        
         return _enrich_goal_data(task)
     except Exception as e:
         print(f"获取目标详情时出错: {e}")
@@ -373,13 +467,9 @@ def update_goal_logic(
         new_content = None
         if any(param is not None for param in [type, keywords, frequency, description]):
             # 获取当前任务数据和元数据
-            raw_task_data = current_goal.get("raw_task_data", {})
-            current_content = raw_task_data.get('content', '')
-            current_metadata = _parse_metadata(current_content)
-            
-            # 分割描述和元数据部分
-            content_parts = current_content.split("\n\n--- Metadata ---\n")
-            current_desc = content_parts[0] if len(content_parts) > 1 else ""
+            parsed = goal_metadata.metadata(current_goal.get("raw_task_data", {}))
+            current_metadata = dict(parsed.fields)
+            current_desc = parsed.description
             
             # 更新元数据
             if type is not None:
@@ -388,7 +478,7 @@ def update_goal_logic(
                 current_metadata['type'] = type
                 
             if keywords is not None:
-                current_metadata['keywords'] = normalize_keywords(keywords)
+                current_metadata['keywords'] = ",".join(normalize_keywords(keywords))
                 
             if start_date is not None and is_valid_date(start_date):
                 current_metadata['start_date'] = start_date
@@ -410,7 +500,8 @@ def update_goal_logic(
             content=new_content,
             status=task_status,
             due_date=due_date,
-            start_date=start_date
+            start_date=start_date,
+            prefetched=_goal_prefetched()
         )
         
         # 5. 检查结果并返回
@@ -439,63 +530,140 @@ def delete_goal_logic(goal_id: str) -> Dict[str, Any]:
         raise ValueError(f"未找到目标任务: {goal_id}，无法删除")
     
     # 调用任务删除逻辑 - task_id_or_title而不是task_id
-    return delete_task_logic(task_id_or_title=goal_id)
+    return delete_task_logic(task_id_or_title=goal_id, prefetched=_goal_prefetched())
 
 def match_task_with_goals_logic(
     task_title: str,
     task_content: Optional[str] = None,
     project_id: Optional[str] = None,
-    min_score: float = 0.3
+    min_score: float = 0.3,
+    fields: Optional[List[str]] = None,
+    compact: bool = False
 ) -> List[Dict[str, Any]]:
     """
     匹配任务与目标 (基于内容相似度和关键词)
-    
+
     Args:
         task_title: 任务标题
         task_content: 任务内容
         project_id: 任务所属项目ID (不再用于直接匹配，因为所有目标都在目标管理项目下)
         min_score: 最小匹配分数
-        
+        fields: 只返回目标的这些字段（始终包含 id）
+        compact: 紧凑模式，去掉 raw_task_data 等冗余内容
+
     Returns:
         匹配的目标列表，按匹配度降序排序
     """
     active_goals = get_goals_logic(status='active')
     task_text = f"{task_title} {task_content or ''}".lower()
-    
-    matches = []
-    for goal in active_goals:
-        match_score = 0.0
-        
-        # 1. 关键词和文本相似度匹配
-        goal_keywords_str = goal.get('keywords', '')
-        goal_keywords_set = set(k for k in goal_keywords_str.split(',') if k)
-        goal_title = goal.get('title', '')
-        goal_desc = goal.get('description', '').split("\n\n--- Metadata ---\n")[0] # 只用基础描述
-        goal_text_match = f"{goal_title} {goal_desc}".lower()
-        
-        keyword_score = 0.0
-        similarity_score = 0.0
-        
-        if goal_keywords_set:
-            # 简单的关键词包含匹配
-            if any(kw.lower() in task_text for kw in goal_keywords_set):
-                keyword_score = 0.7 # 基础分
-        
-        if goal_text_match:
-            similarity_score = calculate_similarity(task_text, goal_text_match) * 0.3 # 相似度占比较低
-        
-        match_score = keyword_score + similarity_score
-   
-        # 添加到结果如果分数达标
-        if match_score >= min_score:
-            matches.append({
-                'goal': goal,
-                'score': round(match_score, 3)
-            })
-       
+
+    # 目标向量按版本缓存，全部目标的关键词命中与相似度一次算出
+    goal_vectors.refresh(active_goals)
+    goal_ids, keyword_hit, similarity = goal_vectors.score(task_text)
+    match_scores = keyword_hit * 0.7 + similarity * 0.3  # 关键词包含为基础分，相似度占比较低
+    goals_by_id = {goal['id']: goal for goal in active_goals if goal.get('id')}
+
+    matches = [
+        {'goal': goals_by_id[goal_ids[i]], 'score': round(float(match_scores[i]), 3)}
+        for i in range(len(goal_ids))
+        if match_scores[i] >= min_score
+    ]
+
     # 按分数排序
     matches.sort(key=lambda x: x['score'], reverse=True)
-    return [match['goal'] for match in matches]
+    return [_shape_goal_data(match['goal'], fields, compact) for match in matches]
+
+def link_tasks_with_goals_logic(
+    min_score: float = 0.3,
+    top_k: int = 3,
+    persist: bool = False
+) -> Dict[str, Any]:
+    """
+    批量关联全部未完成任务与进行中的目标
+
+    一次拉取全部任务，以 任务 × 目标 稀疏矩阵一次算出关键词命中与相似度，
+    打分规则与 match_task_with_goals 相同，每个任务保留得分达标的前 top_k 个目标。
+
+    Args:
+        min_score: 最小匹配分数（得分为 0 的组合不会关联）
+        top_k: 每个任务最多关联的目标数
+        persist: 是否把关联表写入 GOAL_LINKS_PATH
+
+    Returns:
+        {"columns": ["task_id", "goal_id", "score"], "links": [[...], ...],
+         "goals": {目标ID: 标题}, "tasks": {已关联任务ID: 标题},
+         "by_goal": {目标ID: 关联任务数}, "tasks_scored": 参与打分的任务数, "generated_at": 生成时间}
+    """
+    if top_k < 1:
+        raise ValueError("top_k 必须大于等于 1")
+
+    all_tasks, projects_data, _ = _get_all_tasks_logic()
+    goal_project = _get_goal_project(projects_data)
+    goal_project_id = goal_project.get('id') if goal_project else None
+
+    active = [t for t in all_tasks if t.get('id') and not t.get('isCompleted')]
+    goals = [_enrich_goal_data(t) for t in active if goal_project_id and t.get('projectId') == goal_project_id]
+    tasks = [t for t in active if not goal_project_id or t.get('projectId') != goal_project_id]
+
+    goal_vectors.refresh(goals)
+    task_keywords.prime(tasks)
+    texts = [f"{t.get('title', '')} {t.get('content') or ''}".lower() for t in tasks]
+    token_lists = [[w.lower() for w in task_keywords.tokens_for(t)] for t in tasks]
+    goal_ids, keyword_hit, similarity = goal_vectors.score_many(texts, token_lists)
+    scores = (keyword_hit * 0.7 + similarity * 0.3).tocsr()
+
+    links = []
+    for row, task in enumerate(tasks):
+        start, end = scores.indptr[row], scores.indptr[row + 1]
+        row_scores = scores.data[start:end]
+        row_goals = scores.indices[start:end]
+        ranked = sorted(
+            ((round(float(score), 3), goal_ids[col]) for score, col in zip(row_scores, row_goals) if score >= min_score and score > 0),
+            key=lambda x: x[0], reverse=True
+        )
+        for score, goal_id in ranked[:top_k]:
+            links.append([task['id'], goal_id, score])
+
+    titles = {t['id']: t.get('title', '') for t in tasks}
+    by_goal: Dict[str, int] = {}
+    for _, goal_id, _ in links:
+        by_goal[goal_id] = by_goal.get(goal_id, 0) + 1
+
+    table = {
+        "columns": ["task_id", "goal_id", "score"],
+        "links": links,
+        "goals": {g['id']: g.get('title', '') for g in goals},
+        "tasks": {task_id: titles[task_id] for task_id, _, _ in links},
+        "by_goal": by_goal,
+        "tasks_scored": len(tasks),
+        "generated_at": format_datetime(get_current_time()),
+    }
+    if persist:
+        _save_goal_links(table)
+    return table
+
+def _save_goal_links(table: Dict[str, Any]) -> None:
+    """把关联表写入 GOAL_LINKS_PATH（先写临时文件再替换）"""
+    directory = os.path.dirname(GOAL_LINKS_PATH)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = GOAL_LINKS_PATH + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(table, f, ensure_ascii=False)
+    os.replace(tmp_path, GOAL_LINKS_PATH)
+
+def load_goal_links() -> Optional[Dict[str, Any]]:
+    """
+    读取最近一次持久化的任务-目标关联表
+
+    Returns:
+        关联表（结构同 link_tasks_with_goals_logic 的返回值），未生成过时返回 None
+    """
+    try:
+        with open(GOAL_LINKS_PATH, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
 
 # --- MCP工具注册 ---
 
@@ -509,6 +677,7 @@ def register_goal_tools(server: FastMCP, auth_info: Dict[str, Any]):
     """
     
     @server.tool()
+    @request_scoped
     def create_goal(
         title: str,
         type: str,
@@ -545,37 +714,49 @@ def register_goal_tools(server: FastMCP, auth_info: Dict[str, Any]):
             raise ValueError(f"创建目标时发生内部错误: {e}")
 
     @server.tool()
+    @request_scoped
     def get_goals(
         type: Optional[str] = None,
         status: Optional[str] = None,
-        keywords: Optional[str] = None
+        keywords: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        compact: bool = False
     ) -> List[Dict[str, Any]]:
         """
         获取目标列表
-        
+
         Args:
             type: 目标类型筛选 (phase/permanent/habit)
             status: 目标状态筛选 (active/completed)
             keywords: 关键词筛选 (匹配目标标题或关键词) - 字符串形式
-            
+            fields: 只返回这些字段（始终包含 id），如 ["title", "type", "due_date"]
+            compact: 紧凑模式，去掉 raw_task_data、描述中的元数据段与空值
+
         Returns:
             目标列表
         """
         # 直接调用逻辑函数
         try:
-            return get_goals_logic(type=type, status=status, keywords=keywords)
+            return get_goals_logic(type=type, status=status, keywords=keywords, fields=fields, compact=compact)
         except Exception as e:
             print(f"调用 get_goals 时发生意外错误: {e}")
             raise ValueError(f"获取目标列表时发生内部错误: {e}")
 
     @server.tool()
-    def get_goal(goal_id: str) -> Dict[str, Any]:
+    @request_scoped
+    def get_goal(
+        goal_id: str,
+        fields: Optional[List[str]] = None,
+        compact: bool = False
+    ) -> Dict[str, Any]:
         """
         获取目标详情
-        
+
         Args:
             goal_id: 目标ID (任务ID)
-            
+            fields: 只返回这些字段（始终包含 id）
+            compact: 紧凑模式，去掉 raw_task_data、描述中的元数据段与空值
+
         Returns:
             目标详情
         """
@@ -583,12 +764,13 @@ def register_goal_tools(server: FastMCP, auth_info: Dict[str, Any]):
             goal = get_goal_logic(goal_id)
             if not goal:
                 raise ValueError(f"未找到ID为 '{goal_id}' 的目标")
-            return goal
+            return _shape_goal_data(goal, fields, compact)
         except Exception as e:
             print(f"调用 get_goal 时发生意外错误: {e}")
             raise ValueError(f"获取目标 '{goal_id}' 时发生内部错误: {e}")
 
     @server.tool()
+    @request_scoped
     def update_goal(
         goal_id: str,
         title: Optional[str] = None,
@@ -631,6 +813,7 @@ def register_goal_tools(server: FastMCP, auth_info: Dict[str, Any]):
             raise ValueError(f"更新目标 '{goal_id}' 时发生内部错误: {e}")
 
     @server.tool()
+    @request_scoped
     def delete_goal(goal_id: str) -> Dict[str, Any]:
         """
         删除目标
@@ -650,29 +833,60 @@ def register_goal_tools(server: FastMCP, auth_info: Dict[str, Any]):
             raise ValueError(f"删除目标 '{goal_id}' 时发生内部错误: {e}")
 
     @server.tool()
+    @request_scoped
     def match_task_with_goals(
         task_title: str,
         task_content: Optional[str] = None,
-        project_id: Optional[str] = None
+        project_id: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        compact: bool = False
     ) -> List[Dict[str, Any]]:
         """
         匹配任务与目标
-        
+
         Args:
             task_title: 任务标题
             task_content: 任务内容 (可选)
             project_id: 任务所属项目ID (可选)
-            
+            fields: 只返回目标的这些字段（始终包含 id）
+            compact: 紧凑模式，去掉 raw_task_data 等冗余内容
+
         Returns:
             匹配的目标列表 (按匹配度排序)
         """
         # 直接调用逻辑函数
         try:
-            return match_task_with_goals_logic(task_title, task_content, project_id)
+            return match_task_with_goals_logic(task_title, task_content, project_id, fields=fields, compact=compact)
         except Exception as e:
             print(f"调用 match_task_with_goals 时发生意外错误: {e}")
             raise ValueError(f"匹配任务与目标时发生内部错误: {e}")
 
+    @server.tool()
+    @request_scoped
+    def link_tasks_with_goals(
+        min_score: float = 0.3,
+        top_k: int = 3,
+        persist: bool = False
+    ) -> Dict[str, Any]:
+        """
+        批量关联全部未完成任务与进行中的目标（一次调用完成整个账户的分类）
+
+        Args:
+            min_score: 最小匹配分数，默认 0.3
+            top_k: 每个任务最多关联的目标数，默认 3
+            persist: 是否保存关联表，供按目标统计进度等报告直接读取
+
+        Returns:
+            紧凑的关联表：links 为 [task_id, goal_id, score] 行，另含目标/任务标题与每个目标的关联数
+        """
+        try:
+            return link_tasks_with_goals_logic(min_score=min_score, top_k=top_k, persist=persist)
+        except ValueError as e:
+            raise e
+        except Exception as e:
+            print(f"调用 link_tasks_with_goals 时发生意外错误: {e}")
+            raise ValueError(f"批量关联任务与目标时发生内部错误: {e}")
+
 # 导出
 __all__ = [
     'create_goal_logic',
@@ -681,5 +895,7 @@ __all__ = [
     'update_goal_logic',
     'delete_goal_logic',
     'match_task_with_goals_logic',
+    'link_tasks_with_goals_logic',
+    'load_goal_links',
     'register_goal_tools'
 ]
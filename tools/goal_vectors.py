@@ -0,0 +1,190 @@
+"""
+目标向量索引
+
+为每个目标预先计算词频向量（L2 归一化），按 (目标ID, 版本) 缓存，目标未修改时不再重新分词；
+全部目标向量组成稀疏矩阵，任务与全部目标的余弦相似度由一次稀疏矩阵-向量乘法得到。
+全部目标的关键词编译为一个 Aho–Corasick 自动机，扫描一遍任务文本即得到全部关键词命中的目标。
+"""
+
+import math
+import threading
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+from utils.text.text_analysis import segment_text, segment_many
+from utils.text.keyword_automaton import KeywordAutomaton
+
+# 描述中元数据段的分隔符
+METADATA_SEPARATOR = "\n\n--- Metadata ---\n"
+
+
+def goal_match_text(goal: Dict[str, Any]) -> str:
+    """目标参与相似度计算的文本（标题 + 基础描述，统一小写）"""
+    title = goal.get('title', '')
+    desc = goal.get('description', '').split(METADATA_SEPARATOR)[0]  # 只用基础描述
+    return f"{title} {desc}".lower()
+
+
+def goal_keywords(goal: Dict[str, Any]) -> List[str]:
+    """目标元数据中的关键词（小写、去重）"""
+    return sorted(set(k.lower() for k in goal.get('keywords', '').split(',') if k))
+
+
+def _goal_version(goal: Dict[str, Any]) -> Tuple:
+    """目标版本：参与匹配的字段不变时视为同一版本"""
+    return (goal.get('modified_time'), goal.get('title', ''), goal.get('description', ''), goal.get('keywords', ''))
+
+
+class GoalVectorIndex:
+    """目标词频向量的稀疏矩阵与关键词自动机"""
+
+    def __init__(self):
+        # 目标ID -> (版本, 归一化词频向量 {词: 权重}, 关键词列表)
+        self._entries: Dict[str, Tuple[Tuple, Dict[str, float], List[str]]] = {}
+        # 当前矩阵对应的目标ID顺序
+        self._goal_ids: List[str] = []
+        self._vocab: Dict[str, int] = {}
+        self._matrix = None
+        self._keywords = KeywordAutomaton()
+        self._lock = threading.Lock()
+
+    def _vectorize(self, goals: List[Dict[str, Any]]) -> None:
+        """为新增或已修改的目标计算向量（批量分词）"""
+        stale = [g for g in goals if self._entries.get(g['id'], (None,))[0] != _goal_version(g)]
+        if not stale:
+            return
+        token_lists = segment_many([goal_match_text(g) for g in stale])
+        for goal, tokens in zip(stale, token_lists):
+            counts = Counter(tokens)
+            norm = math.sqrt(sum(v * v for v in counts.values()))
+            vector = {term: tf / norm for term, tf in counts.items()} if norm else {}
+            self._entries[goal['id']] = (_goal_version(goal), vector, goal_keywords(goal))
+
+    def _rebuild(self, goal_ids: List[str]) -> None:
+        """按目标顺序重建稀疏矩阵与关键词自动机（关键词关联到矩阵行号）"""
+        from scipy.sparse import csr_matrix
+
+        vocab: Dict[str, int] = {}
+        rows, cols, data = [], [], []
+        keywords = KeywordAutomaton()
+        for row, goal_id in enumerate(goal_ids):
+            _, vector, goal_kws = self._entries[goal_id]
+            for term, weight in vector.items():
+                rows.append(row)
+                cols.append(vocab.setdefault(term, len(vocab)))
+                data.append(weight)
+            for keyword in goal_kws:
+                keywords.add(keyword, row)
+        keywords.build()
+
+        self._matrix = csr_matrix((data, (rows, cols)), shape=(len(goal_ids), max(len(vocab), 1)))
+        self._vocab = vocab
+        self._keywords = keywords
+        self._goal_ids = goal_ids
+
+    def refresh(self, goals: List[Dict[str, Any]]) -> None:
+        """
+        与当前目标列表对齐：只为变化的目标重新分词，目标集合或内容变化时重建矩阵
+
+        Args:
+            goals: 目标列表（需包含 id、title、description、keywords、modified_time）
+        """
+        goals = [g for g in goals if g.get('id')]
+        goal_ids = [g['id'] for g in goals]
+        with self._lock:
+            versions_before = {gid: self._entries[gid][0] for gid in goal_ids if gid in self._entries}
+            self._vectorize(goals)
+            live = set(goal_ids)
+            for gid in [gid for gid in self._entries if gid not in live]:
+                del self._entries[gid]
+            changed = any(versions_before.get(gid) != self._entries[gid][0] for gid in goal_ids)
+            if changed or goal_ids != self._goal_ids or self._matrix is None:
+                self._rebuild(goal_ids)
+
+    def score(self, text: str, tokens: Optional[List[str]] = None):
+        """
+        计算文本与全部目标的匹配信号
+
+        Args:
+            text: 任务文本（小写）
+            tokens: 已有的分词结果，未提供时调用 segment_text
+
+        Returns:
+            (目标ID列表, 关键词命中 bool 数组, 余弦相似度数组)，三者按 refresh 时的目标顺序对齐
+        """
+        import numpy as np
+
+        with self._lock:
+            goal_ids, matrix, vocab, keywords = self._goal_ids, self._matrix, self._vocab, self._keywords
+
+        n = len(goal_ids)
+        keyword_hit = np.zeros(n, dtype=bool)
+        similarity = np.zeros(n, dtype=float)
+        if not n:
+            return goal_ids, keyword_hit, similarity
+
+        rows = keywords.find(text)
+        if rows:
+            keyword_hit[list(rows)] = True
+
+        counts = Counter(segment_text(text) if tokens is None else tokens)
+        norm = math.sqrt(sum(v * v for v in counts.values()))
+        if norm:
+            cols = [vocab[t] for t in counts if t in vocab]
+            if cols:
+                weights = np.array([counts[t] for t in counts if t in vocab], dtype=float) / norm
+                similarity = matrix[:, cols] @ weights
+        return goal_ids, keyword_hit, similarity
+
+    def score_many(self, texts: List[str], token_lists: List[List[str]]):
+        """
+        批量计算多条文本与全部目标的匹配信号（文本 × 目标 稀疏矩阵）
+
+        Args:
+            texts: 任务文本列表（小写）
+            token_lists: 与 texts 对应的分词结果
+
+        Returns:
+            (目标ID列表, 关键词命中矩阵, 余弦相似度矩阵)，两个矩阵均为 文本数 × 目标数 的 CSR 稀疏矩阵
+        """
+        import numpy as np
+        from scipy.sparse import csr_matrix
+
+        with self._lock:
+            goal_ids, matrix, vocab, keywords = self._goal_ids, self._matrix, self._vocab, self._keywords
+
+        shape = (len(texts), len(goal_ids))
+        if not texts or not goal_ids:
+            return goal_ids, csr_matrix(shape), csr_matrix(shape)
+
+        hit_rows, hit_cols = [], []
+        q_rows, q_cols, q_data = [], [], []
+        for i, (text, tokens) in enumerate(zip(texts, token_lists)):
+            goals_hit = keywords.find(text)
+            hit_rows.extend([i] * len(goals_hit))
+            hit_cols.extend(goals_hit)
+
+            counts = Counter(tokens)
+            norm = math.sqrt(sum(v * v for v in counts.values()))
+            for term, tf in counts.items():
+                col = vocab.get(term)
+                if col is not None:
+                    q_rows.append(i)
+                    q_cols.append(col)
+                    q_data.append(tf / norm)
+
+        keyword_hit = csr_matrix((np.ones(len(hit_rows)), (hit_rows, hit_cols)), shape=shape)
+        queries = csr_matrix((q_data, (q_rows, q_cols)), shape=(len(texts), matrix.shape[1]))
+        similarity = (queries @ matrix.T).tocsr()
+        return goal_ids, keyword_hit, similarity
+
+
+# 单例索引供目标工具复用
+goal_vectors = GoalVectorIndex()
+
+__all__ = [
+    "GoalVectorIndex",
+    "goal_vectors",
+    "goal_match_text",
+    "goal_keywords",
+]
@@ -11,6 +11,7 @@ import os
 import requests
 from typing import Dict, Any, Optional
 from pathlib import Path
+from utils.env import load_dotenv_once
 
 
 class APIError(Exception):
@@ -257,6 +258,19 @@ class DidaOfficialAPI:
 _api_client: Optional[DidaOfficialAPI] = None
 
 
+def ensure_api() -> DidaOfficialAPI:
+    """
+    获取已初始化的API客户端，尚未初始化时基于 .env 初始化一次
+
+    Returns:
+        DidaOfficialAPI: API客户端实例
+    """
+    if _api_client is not None:
+        return _api_client
+    load_dotenv_once()
+    return init_api()
+
+
 def init_api(
     client_id: Optional[str] = None,
     client_secret: Optional[str] = None,
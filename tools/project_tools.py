@@ -5,6 +5,8 @@
 from typing import Dict, List, Optional, Any
 from fastmcp import FastMCP
 from .adapter import adapter, APIError
+from .task_store import project_store
+from .request_context import request_scoped
 
 # --- 模块级核心逻辑函数 ---
 
@@ -16,6 +18,7 @@ def get_projects_logic() -> List[Dict[str, Any]]:
         项目列表 (包含 id, name, color, sortOrder, sortType, modifiedTime)
     """
     projects = adapter.list_projects()
+    project_store.sync_projects(projects)
     # 直接返回官方结构的精简版
     result: List[Dict[str, Any]] = []
     for p in projects:
@@ -200,6 +203,7 @@ def register_project_tools(server: FastMCP, auth_info: Dict[str, Any]):
     # 适配层按需初始化，无需在此显式初始化
 
     @server.tool()
+    @request_scoped
     def get_projects() -> List[Dict[str, Any]]:
         """
         获取所有项目列表
@@ -211,6 +215,7 @@ def register_project_tools(server: FastMCP, auth_info: Dict[str, Any]):
         return get_projects_logic()
     
     @server.tool()
+    @request_scoped
     def create_project(
         name: str,
         color: Optional[str] = None,
@@ -232,6 +237,7 @@ def register_project_tools(server: FastMCP, auth_info: Dict[str, Any]):
         return create_project_logic(name=name, color=color, view_mode=view_mode, kind=kind, sort_order=sort_order)
     
     @server.tool()
+    @request_scoped
     def update_project(
         project_id_or_name: str,
         name: Optional[str] = None,
@@ -255,6 +261,7 @@ def register_project_tools(server: FastMCP, auth_info: Dict[str, Any]):
         return update_project_logic(project_id_or_name=project_id_or_name, name=name, color=color, view_mode=view_mode, kind=kind, sort_order=sort_order)
     
     @server.tool()
+    @request_scoped
     def delete_project(project_id_or_name: str) -> Dict[str, Any]:
         """
         删除项目
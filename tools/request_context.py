@@ -0,0 +1,138 @@
+"""
+请求级数据快照
+
+一次工具调用内，嵌套的 *_logic 调用（如 update_goal -> get_goal_logic -> update_task_logic）
+共享同一份已拉取的项目与任务，避免重复访问上游接口。快照保存在 contextvar 中，
+只在 request_scope / request_scoped 包裹的调用内生效；作用域外按原样每次拉取。
+适配器的写操作会清除快照中受影响的数据，写入之后的读取会重新拉取；
+批量操作期间（defer_invalidation）清除推迟到批量结束，各项并发读取同一份数据。
+"""
+
+import functools
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Hashable, Iterator, Optional, Set
+
+
+class RequestSnapshot:
+    """单次工具调用内共享的数据：键 -> 已加载的值"""
+
+    def __init__(self):
+        self.values: Dict[Hashable, Any] = {}
+        # 批量操作的工作线程共享同一快照，同一键只加载一次
+        self.lock = threading.RLock()
+        # 推迟清除期间累积的待清除键类别（ALL_KINDS 表示全部），None 表示未推迟
+        self.deferred: Optional[Set[Hashable]] = None
+
+
+# 待清除类别中表示“全部数据”的标记
+ALL_KINDS = object()
+
+_current: ContextVar[Optional[RequestSnapshot]] = ContextVar("dida_request_snapshot", default=None)
+
+
+def current_snapshot() -> Optional[RequestSnapshot]:
+    """当前请求的快照，不在请求作用域内时返回 None"""
+    return _current.get()
+
+
+@contextmanager
+def request_scope() -> Iterator[RequestSnapshot]:
+    """
+    进入请求作用域；已在作用域内时复用外层快照（嵌套调用共享同一份数据）
+    """
+    snapshot = _current.get()
+    if snapshot is not None:
+        yield snapshot
+        return
+    token = _current.set(RequestSnapshot())
+    try:
+        yield _current.get()
+    finally:
+        _current.reset(token)
+
+
+def request_scoped(func: Callable) -> Callable:
+    """装饰器：整个函数调用处于同一个请求作用域内（用于 MCP 工具函数）"""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with request_scope():
+            return func(*args, **kwargs)
+    return wrapper
+
+
+def cached_in_request(key: Hashable, loader: Callable[[], Any]) -> Any:
+    """
+    在当前请求内按 key 缓存 loader 的结果；不在请求作用域内时直接调用 loader
+
+    Args:
+        key: 缓存键，如 'projects'、'all_tasks'
+        loader: 实际拉取数据的函数
+    """
+    snapshot = _current.get()
+    if snapshot is None:
+        return loader()
+    with snapshot.lock:
+        if key not in snapshot.values:
+            snapshot.values[key] = loader()
+        return snapshot.values[key]
+
+
+def invalidate_request(*kinds: str) -> None:
+    """
+    清除当前请求快照中的数据
+
+    Args:
+        kinds: 要清除的键；元组键按首元素匹配（如 'goal_tasks' 清除 ('goal_tasks', ...)），
+               不提供时清除全部
+    """
+    snapshot = _current.get()
+    if snapshot is None:
+        return
+    with snapshot.lock:
+        if snapshot.deferred is not None:
+            snapshot.deferred.update(kinds or (ALL_KINDS,))
+            return
+        if not kinds:
+            snapshot.values.clear()
+            return
+        for key in list(snapshot.values):
+            kind = key[0] if isinstance(key, tuple) else key
+            if kind in kinds:
+                del snapshot.values[key]
+
+
+@contextmanager
+def defer_invalidation() -> Iterator[None]:
+    """
+    推迟清除当前请求快照：期间的 invalidate_request 只记录类别，退出时统一清除
+    （用于批量操作：各项写入互不影响其余项读取的数据，首个写入不应让其余项重新拉取）。
+    不在请求作用域内或已在推迟中时不做处理。
+    """
+    snapshot = _current.get()
+    if snapshot is None or snapshot.deferred is not None:
+        yield
+        return
+    with snapshot.lock:
+        snapshot.deferred = set()
+    try:
+        yield
+    finally:
+        with snapshot.lock:
+            kinds, snapshot.deferred = snapshot.deferred, None
+        if ALL_KINDS in kinds:
+            invalidate_request()
+        elif kinds:
+            invalidate_request(*kinds)
+
+
+__all__ = [
+    "RequestSnapshot",
+    "current_snapshot",
+    "request_scope",
+    "request_scoped",
+    "cached_in_request",
+    "invalidate_request",
+    "defer_invalidation",
+]
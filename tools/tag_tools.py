@@ -5,6 +5,7 @@
 from typing import Dict, List, Optional, Any
 from fastmcp import FastMCP
 from .adapter import adapter, APIError
+from .request_context import request_scoped
 
 def register_tag_tools(server: FastMCP, auth_info: Dict[str, Any]):
     """
@@ -17,6 +18,7 @@ def register_tag_tools(server: FastMCP, auth_info: Dict[str, Any]):
     # 适配层初始化在首次调用时自动进行
     
     @server.tool()
+    @request_scoped
     def get_tags() -> List[Dict[str, Any]]:
         """
         获取所有标签列表
@@ -37,6 +39,7 @@ def register_tag_tools(server: FastMCP, auth_info: Dict[str, Any]):
         return list(agg.values())
     
     @server.tool()
+    @request_scoped
     def create_tag(
         name: str,
         color: Optional[str] = None
@@ -54,6 +57,7 @@ def register_tag_tools(server: FastMCP, auth_info: Dict[str, Any]):
         raise ValueError("标签创建在官方开放API中不可用或未开放：仅支持只读标签视图")
     
     @server.tool()
+    @request_scoped
     def update_tag(
         tag_id_or_name: str,
         name: Optional[str] = None,
@@ -73,6 +77,7 @@ def register_tag_tools(server: FastMCP, auth_info: Dict[str, Any]):
         raise ValueError("标签更新/重命名/颜色在官方开放API中不可用或未开放：仅支持只读标签视图")
     
     @server.tool()
+    @request_scoped
     def delete_tag(tag_id_or_name: str) -> Dict[str, Any]:
         """
         删除标签
@@ -86,6 +91,7 @@ def register_tag_tools(server: FastMCP, auth_info: Dict[str, Any]):
         raise ValueError("标签删除在官方开放API中不可用或未开放：仅支持只读标签视图")
     
     @server.tool()
+    @request_scoped
     def rename_tag(old_name: str, new_name: str) -> Dict[str, Any]:
         """
         重命名标签
@@ -100,6 +106,7 @@ def register_tag_tools(server: FastMCP, auth_info: Dict[str, Any]):
         raise ValueError("标签重命名在官方开放API中不可用或未开放：仅支持只读标签视图")
     
     @server.tool()
+    @request_scoped
     def merge_tags(source_name: str, target_name: str) -> Dict[str, Any]:
         """
         合并标签
@@ -0,0 +1,170 @@
+"""
+已完成任务本地归档
+
+已完成任务按完成月份分区追加写入 JSONL（data/archive/completed-YYYY-MM.jsonl），以任务ID为键，
+同一任务的后写记录覆盖先写记录。归档由任务快照（task_store）的变更推送驱动，
+长周期统计直接读取本地分区，无需重新从上游拉取。
+"""
+
+import os
+import json
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# 归档根目录
+DEFAULT_ARCHIVE_DIR = 'data/archive'
+
+_PARTITION_PREFIX = 'completed-'
+_PARTITION_SUFFIX = '.jsonl'
+
+
+def _task_month(task: Dict[str, Any]) -> Optional[str]:
+    """任务所属分区月份 YYYY-MM（按完成时间，缺失时按修改时间）"""
+    stamp = task.get('completedTime') or task.get('modifiedTime') or ''
+    return stamp[:7] if len(stamp) >= 7 and stamp[4] == '-' else None
+
+
+def _fingerprint(task: Dict[str, Any]) -> str:
+    return json.dumps(task, ensure_ascii=False, sort_keys=True, default=str)
+
+
+class TaskArchive:
+    """按月分区的已完成任务归档（仅追加）"""
+
+    def __init__(self, root: str = DEFAULT_ARCHIVE_DIR):
+        """
+        初始化归档
+
+        Args:
+            root: 归档根目录
+        """
+        self.root = root
+        self._lock = threading.RLock()
+        # 分区缓存：月份 -> ((mtime, size), {任务ID: 任务})
+        self._partitions: Dict[str, Tuple[Tuple[float, int], Dict[str, Dict[str, Any]]]] = {}
+        # 已归档记录指纹：任务ID -> 指纹，用于跳过重复写入
+        self._fingerprints: Optional[Dict[str, str]] = None
+
+    def _partition_path(self, month: str) -> str:
+        return os.path.join(self.root, f"{_PARTITION_PREFIX}{month}{_PARTITION_SUFFIX}")
+
+    def months(self) -> List[str]:
+        """已有分区月份（升序）"""
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(
+            name[len(_PARTITION_PREFIX):-len(_PARTITION_SUFFIX)]
+            for name in os.listdir(self.root)
+            if name.startswith(_PARTITION_PREFIX) and name.endswith(_PARTITION_SUFFIX)
+        )
+
+    def _load_partition(self, month: str) -> Dict[str, Dict[str, Any]]:
+        """读取分区（文件未变化时直接使用缓存）"""
+        path = self._partition_path(month)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            self._partitions.pop(month, None)
+            return {}
+        key = (stat.st_mtime, stat.st_size)
+        cached = self._partitions.get(month)
+        if cached and cached[0] == key:
+            return cached[1]
+        tasks: Dict[str, Dict[str, Any]] = {}
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    task = json.loads(line)
+                except ValueError:
+                    # 跳过写入中断产生的残缺行
+                    continue
+                if task.get('id'):
+                    tasks[task['id']] = task
+        self._partitions[month] = (key, tasks)
+        return tasks
+
+    def _load_fingerprints(self) -> Dict[str, str]:
+        if self._fingerprints is None:
+            self._fingerprints = {}
+            for month in self.months():
+                for task_id, task in self._load_partition(month).items():
+                    self._fingerprints[task_id] = _fingerprint(task)
+        return self._fingerprints
+
+    def append(self, tasks: Iterable[Dict[str, Any]]) -> int:
+        """
+        归档已完成任务（未完成任务与内容未变化的任务会被跳过）
+
+        Args:
+            tasks: 任务列表
+
+        Returns:
+            实际写入的记录数
+        """
+        with self._lock:
+            fingerprints = self._load_fingerprints()
+            by_month: Dict[str, List[Tuple[Dict[str, Any], str]]] = {}
+            for task in tasks:
+                task_id = task.get('id')
+                month = _task_month(task)
+                if not task_id or not month or not task.get('isCompleted'):
+                    continue
+                fp = _fingerprint(task)
+                if fingerprints.get(task_id) == fp:
+                    continue
+                by_month.setdefault(month, []).append((task, fp))
+            if not by_month:
+                return 0
+
+            os.makedirs(self.root, exist_ok=True)
+            written = 0
+            for month, records in by_month.items():
+                with open(self._partition_path(month), 'a', encoding='utf-8') as f:
+                    for task, fp in records:
+                        f.write(json.dumps(task, ensure_ascii=False, default=str) + '\n')
+                        fingerprints[task['id']] = fp
+                        written += 1
+            return written
+
+    def query(self, start: Optional[str] = None, end: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        查询归档任务，只读取与时间范围相交的月份分区
+
+        Args:
+            start: 完成时间下限（含），'YYYY-MM-DD' 或 'YYYY-MM-DD HH:MM:SS'
+            end: 完成时间上限（不含），格式同上
+
+        Returns:
+            任务列表，按完成时间升序
+        """
+        start_month = start[:7] if start else None
+        end_month = end[:7] if end else None
+        result: Dict[str, Dict[str, Any]] = {}
+        with self._lock:
+            for month in self.months():
+                if (start_month and month < start_month) or (end_month and month > end_month):
+                    continue
+                result.update(self._load_partition(month))
+        tasks = [
+            t for t in result.values()
+            if (not start or (t.get('completedTime') or '') >= start)
+            and (not end or (t.get('completedTime') or '') < end)
+        ]
+        tasks.sort(key=lambda t: t.get('completedTime') or '')
+        return tasks
+
+    def on_task_changes(self, upserted: List[Dict[str, Any]], removed: List[Dict[str, Any]]) -> None:
+        """任务快照订阅回调：归档新增或变化的已完成任务（删除不影响历史）"""
+        self.append(upserted)
+
+
+# 单例归档供工具层复用
+task_archive = TaskArchive()
+
+__all__ = [
+    "TaskArchive",
+    "task_archive",
+]
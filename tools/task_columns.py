@@ -0,0 +1,70 @@
+"""
+任务列式快照
+
+把任务列表一次性转换为列式数组（datetime64 的创建/完成/截止时间、整型状态与优先级、
+分类类型的项目），日期批量向量化解析，避免逐任务调用 strptime。
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+_DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+_DATE_FORMAT = "%Y-%m-%d"
+
+
+def _to_datetime64(values: List[Optional[str]]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    批量解析本地时间字符串（无法解析为 NaT）
+
+    Returns:
+        (完整时间 datetime64[ns]，仅含 'YYYY-MM-DD HH:MM:SS' / 'YYYY-MM-DDTHH:MM:SS...' 可解析的值；
+         日期 datetime64[D]，额外兼容仅日期 'YYYY-MM-DD')
+    """
+    series = pd.Series(values, dtype=object).fillna('').astype(str)
+    full = pd.to_datetime(
+        series.str.slice(0, 19).str.replace('T', ' ', regex=False),
+        format=_DATETIME_FORMAT,
+        errors='coerce',
+    )
+    day_only = pd.to_datetime(series.str.slice(0, 10), format=_DATE_FORMAT, errors='coerce')
+    return (
+        full.to_numpy(dtype='datetime64[ns]'),
+        day_only.to_numpy(dtype='datetime64[ns]').astype('datetime64[D]'),
+    )
+
+
+def _is_completed(task: Dict[str, Any]) -> bool:
+    return (task.get('status') == 2 or
+            task.get('isCompleted') == True or
+            str(task.get('completed')).lower() == 'true')
+
+
+class TaskColumns:
+    """任务列式快照"""
+
+    def __init__(self, tasks: List[Dict[str, Any]]):
+        """
+        构建列式快照
+
+        Args:
+            tasks: 任务列表（日期为本地时间字符串）
+        """
+        self.size = len(tasks)
+        self.ids = np.array([t.get('id') for t in tasks], dtype=object)
+        # created_day 为按天截断的创建日期，供日期范围筛选与按天计数
+        self.created, self.created_day = _to_datetime64([
+            t.get('createdTime', t.get('created', t.get('createTime'))) for t in tasks
+        ])
+        self.completed_time, self.completed_day = _to_datetime64([t.get('completedTime') for t in tasks])
+        self.due, self.due_day = _to_datetime64([t.get('dueDate') for t in tasks])
+        self.status = np.array([t.get('status') or 0 for t in tasks], dtype=np.int8)
+        self.priority = np.array([t.get('priority') or 0 for t in tasks], dtype=np.int8)
+        self.is_completed = np.fromiter((_is_completed(t) for t in tasks), dtype=bool, count=self.size)
+        self.project = pd.Categorical([t.get('projectName') or t.get('projectId') for t in tasks])
+
+
+__all__ = [
+    "TaskColumns",
+]
@@ -0,0 +1,182 @@
+"""
+任务按天聚合立方体
+
+按 创建日期 × 项目 × 优先级 物化聚合（创建数、其中已完成数、完成耗时小时和与计数），
+随任务快照（task_store）的变更增量维护：每个任务记录自己的贡献，变更时先撤销旧贡献再计入新贡献。
+统计读取 O(天数) 个单元格，不再扫描任务。
+"""
+
+import threading
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+# 单元格键：(创建日期 YYYY-MM-DD, 项目, 优先级)
+CellKey = Tuple[str, str, int]
+
+# 单元格度量
+CUBE_MEASURES = ("created", "completed", "hours_sum", "hours_count")
+
+
+def _empty_cell() -> List[float]:
+    return [0, 0, 0.0, 0]
+
+
+def _cell_dict(cell: List[float]) -> Dict[str, Any]:
+    created, completed, hours_sum, hours_count = cell
+    return {
+        "created": int(created),
+        "completed": int(completed),
+        "hours_sum": round(float(hours_sum), 4),
+        "hours_count": int(hours_count),
+    }
+
+
+class DailyTaskCube:
+    """增量维护的按天聚合"""
+
+    def __init__(self):
+        self._cells: Dict[CellKey, List[float]] = defaultdict(_empty_cell)
+        # 按天、按月汇总（与 _cells 同步维护），用于范围读取
+        self._by_day: Dict[str, List[float]] = defaultdict(_empty_cell)
+        self._by_month: Dict[str, List[float]] = defaultdict(_empty_cell)
+        # 任务ID -> (单元格键, 贡献)
+        self._contributions: Dict[str, Tuple[CellKey, Tuple[float, ...]]] = {}
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._contributions)
+
+    # ---------- 增量维护 ----------
+    @staticmethod
+    def _contributions_of(tasks: List[Dict[str, Any]]) -> List[Tuple[str, Optional[Tuple[CellKey, Tuple[float, ...]]]]]:
+        """批量计算任务贡献（日期解析走列式快照）；创建日期无法解析的任务贡献为 None"""
+        # pandas/numpy 导入较慢，只在实际聚合时导入
+        import numpy as np
+        import pandas as pd
+        from .task_columns import TaskColumns
+
+        columns = TaskColumns(tasks)
+        days = np.datetime_as_string(columns.created_day, unit='D')
+        valid_hours = columns.is_completed & ~np.isnat(columns.created) & ~np.isnat(columns.completed_time)
+        hours = np.where(
+            valid_hours,
+            (columns.completed_time - columns.created) / np.timedelta64(1, 'h'),
+            0.0,
+        )
+        projects = ['' if pd.isna(p) else str(p) for p in columns.project]
+        has_created = (~np.isnat(columns.created_day)).tolist()
+        # 转为 Python 列表后逐项组装，避免逐元素访问 numpy 标量
+        rows = zip(
+            tasks, has_created, days.tolist(), projects, columns.priority.tolist(),
+            columns.is_completed.tolist(), valid_hours.tolist(), hours.tolist(),
+        )
+        result = []
+        for task, created, day, project, priority, completed, has_hours, task_hours in rows:
+            if not created:
+                result.append((task['id'], None))
+                continue
+            contribution = (1, int(completed), task_hours if has_hours else 0.0, int(has_hours))
+            result.append((task['id'], ((day, project, priority), contribution)))
+        return result
+
+    def _apply(self, deltas: Dict[CellKey, List[float]]) -> None:
+        """把按单元格合并后的增量写入明细与按天、按月汇总"""
+        for key, values in deltas.items():
+            day = key[0]
+            for index, target_key in ((self._cells, key), (self._by_day, day), (self._by_month, day[:7])):
+                target = index[target_key]
+                for i, value in enumerate(values):
+                    target[i] += value
+                if not target[0]:
+                    del index[target_key]
+
+    def on_task_changes(self, upserted: List[Dict[str, Any]], removed: List[Dict[str, Any]]) -> None:
+        """任务快照订阅回调：撤销旧贡献并计入新贡献"""
+        upserted = [t for t in upserted if t.get('id')]
+        contributions = self._contributions_of(upserted) if upserted else []
+        deltas: Dict[CellKey, List[float]] = defaultdict(_empty_cell)
+
+        def add(contribution: Tuple[CellKey, Tuple[float, ...]], sign: int) -> None:
+            delta = deltas[contribution[0]]
+            for i, value in enumerate(contribution[1]):
+                delta[i] += sign * value
+
+        with self._lock:
+            for task in removed:
+                old = self._contributions.pop(task.get('id'), None)
+                if old:
+                    add(old, -1)
+            for task_id, contribution in contributions:
+                old = self._contributions.pop(task_id, None)
+                if old:
+                    add(old, -1)
+                if contribution:
+                    self._contributions[task_id] = contribution
+                    add(contribution, 1)
+            self._apply(deltas)
+
+    def seed(self, tasks: Iterable[Dict[str, Any]]) -> None:
+        """计入一批任务（如本地归档中的历史任务）"""
+        self.on_task_changes(list(tasks), [])
+
+    # ---------- 读取 ----------
+    def totals(self, start: Optional[str] = None, end: Optional[str] = None) -> Dict[str, Any]:
+        """
+        创建日期在 [start, end] 内的合计
+
+        Args:
+            start: 起始日期 YYYY-MM-DD（含），None 表示不设下限
+            end: 结束日期 YYYY-MM-DD（含），None 表示不设上限
+        """
+        total = _empty_cell()
+        with self._lock:
+            for day, cell in self._by_day.items():
+                if (start and day < start) or (end and day > end):
+                    continue
+                for i, value in enumerate(cell):
+                    total[i] += value
+        return _cell_dict(total)
+
+    def daily(self, days: List[str]) -> Dict[str, Dict[str, Any]]:
+        """指定日期列表的逐日聚合（无数据的日期为全 0）"""
+        with self._lock:
+            return {day: _cell_dict(self._by_day.get(day, _empty_cell())) for day in days}
+
+    def monthly(self, months: List[str]) -> Dict[str, Dict[str, Any]]:
+        """指定月份列表（YYYY-MM）的逐月聚合（无数据的月份为全 0）"""
+        with self._lock:
+            return {month: _cell_dict(self._by_month.get(month, _empty_cell())) for month in months}
+
+    def breakdown(self, dimension: str, start: Optional[str] = None, end: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        按项目或优先级分组的范围合计
+
+        Args:
+            dimension: 'project' 或 'priority'
+            start: 起始日期 YYYY-MM-DD（含）
+            end: 结束日期 YYYY-MM-DD（含）
+        """
+        if dimension not in ('project', 'priority'):
+            raise ValueError(f"不支持的分组维度: {dimension}")
+        index = 1 if dimension == 'project' else 2
+        groups: Dict[str, List[float]] = defaultdict(_empty_cell)
+        with self._lock:
+            for key, cell in self._cells.items():
+                day = key[0]
+                if (start and day < start) or (end and day > end):
+                    continue
+                group = groups[str(key[index])]
+                for i, value in enumerate(cell):
+                    group[i] += value
+        return {name: _cell_dict(cell) for name, cell in groups.items()}
+
+
+# 单例聚合供分析工具复用
+task_cube = DailyTaskCube()
+
+__all__ = [
+    "CUBE_MEASURES",
+    "DailyTaskCube",
+    "task_cube",
+]
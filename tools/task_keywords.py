@@ -0,0 +1,186 @@
+"""
+任务分词缓存与全局词频
+
+每个任务的分词结果按 (任务ID, modifiedTime) 缓存，任务未修改时不再重新分词；
+全账户词频 Counter 随任务快照（task_store）的变更增量维护，Top-N 查询直接读取。
+分词缓存可持久化到磁盘，重启后无需对全部任务重新分词；缓存文件在首次分词时才读取。
+"""
+
+import os
+import json
+import time
+import heapq
+import atexit
+import threading
+from collections import Counter
+from operator import itemgetter
+from typing import Any, Dict, List, Optional, Tuple
+
+from utils.text.text_analysis import segment_text, segment_many
+
+# 分词缓存文件，设为空字符串时不持久化
+DEFAULT_CACHE_PATH = os.environ.get("DIDA_TOKEN_CACHE", "data/task_tokens.json")
+# 两次落盘的最小间隔（秒）
+SAVE_INTERVAL = 30
+
+
+def task_text(task: Dict[str, Any]) -> str:
+    """任务参与分词的文本（标题 + 内容）"""
+    title = task.get('title', task.get('content', '')) or ''
+    content = task.get('content', task.get('note', '')) or ''
+    return f"{title} {content}"
+
+
+class TaskKeywordCounter:
+    """任务分词缓存与增量词频"""
+
+    def __init__(self, cache_path: Optional[str] = DEFAULT_CACHE_PATH):
+        """
+        初始化
+
+        Args:
+            cache_path: 分词缓存文件路径，None 或空字符串表示不持久化
+        """
+        self.cache_path = cache_path or None
+        # 任务ID -> (modifiedTime, 分词结果)
+        self._tokens: Dict[str, Tuple[Optional[str], List[str]]] = {}
+        # 已计入词频的任务ID -> 分词结果
+        self._counted: Dict[str, List[str]] = {}
+        self._counts: Counter = Counter()
+        self._lock = threading.RLock()
+        self._dirty = False
+        self._saved_at = 0.0
+        self._loaded = False
+
+    # ---------- 持久化 ----------
+    def _ensure_loaded(self) -> None:
+        """首次使用时读取分词缓存并注册退出时落盘（导入模块不触碰磁盘）"""
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            self._load()
+            if self.cache_path:
+                atexit.register(self.save)
+            self._loaded = True
+
+    def _load(self) -> None:
+        if not self.cache_path:
+            return
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self._tokens = {tid: (entry[0], entry[1]) for tid, entry in data.get('tasks', {}).items()}
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"读取分词缓存失败，将重新分词: {e}")
+
+    def save(self) -> None:
+        """把分词缓存写入磁盘（无变化时跳过）"""
+        if not self.cache_path or not self._dirty:
+            return
+        with self._lock:
+            data = {'tasks': {tid: list(entry) for tid, entry in self._tokens.items()}}
+            self._dirty = False
+            self._saved_at = time.monotonic()
+        try:
+            directory = os.path.dirname(self.cache_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = self.cache_path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.cache_path)
+        except Exception as e:
+            print(f"保存分词缓存失败: {e}")
+
+    # ---------- 分词 ----------
+    def tokens_for(self, task: Dict[str, Any]) -> List[str]:
+        """
+        任务的分词结果（按 ID + modifiedTime 命中缓存，未命中时分词并写入缓存）
+
+        Args:
+            task: 任务（需包含 id）
+        """
+        self._ensure_loaded()
+        task_id = task.get('id')
+        modified = task.get('modifiedTime')
+        with self._lock:
+            cached = self._tokens.get(task_id)
+        if cached is not None and cached[0] == modified and modified:
+            return cached[1]
+        tokens = segment_text(task_text(task))
+        if task_id:
+            with self._lock:
+                self._tokens[task_id] = (modified, tokens)
+                self._dirty = True
+        return tokens
+
+    def prime(self, tasks: List[Dict[str, Any]]) -> Dict[str, List[str]]:
+        """
+        对缓存未命中的任务批量分词（批量较大时走多进程）
+
+        Returns:
+            本次新分词的 {任务ID: 分词结果}
+        """
+        self._ensure_loaded()
+        with self._lock:
+            missing = [
+                task for task in tasks
+                if task.get('id') and not (
+                    task.get('modifiedTime')
+                    and self._tokens.get(task['id'], (None,))[0] == task.get('modifiedTime')
+                )
+            ]
+        if not missing:
+            return {}
+        segmented = segment_many([task_text(task) for task in missing])
+        with self._lock:
+            for task, tokens in zip(missing, segmented):
+                self._tokens[task['id']] = (task.get('modifiedTime'), tokens)
+            self._dirty = True
+        return {task['id']: tokens for task, tokens in zip(missing, segmented)}
+
+    # ---------- 增量词频 ----------
+    def on_task_changes(self, upserted: List[Dict[str, Any]], removed: List[Dict[str, Any]]) -> None:
+        """任务快照订阅回调：撤销旧任务的词频并计入新分词结果"""
+        primed = self.prime(upserted)
+        with self._lock:
+            for task in removed:
+                task_id = task.get('id')
+                old = self._counted.pop(task_id, None)
+                if old:
+                    self._counts.subtract(old)
+                self._tokens.pop(task_id, None)
+                self._dirty = True
+            for task in upserted:
+                task_id = task.get('id')
+                if not task_id:
+                    continue
+                tokens = primed[task_id] if task_id in primed else self.tokens_for(task)
+                old = self._counted.get(task_id)
+                if old is tokens:
+                    continue
+                if old:
+                    self._counts.subtract(old)
+                self._counts.update(tokens)
+                self._counted[task_id] = tokens
+        if self._dirty and time.monotonic() - self._saved_at > SAVE_INTERVAL:
+            self.save()
+
+    def top(self, limit: int = 20) -> List[Tuple[str, int]]:
+        """词频最高的 limit 个词（subtract 后可能残留计数为 0 的词，读取时跳过）"""
+        with self._lock:
+            return heapq.nlargest(limit, ((w, c) for w, c in self._counts.items() if c > 0), key=itemgetter(1))
+
+
+# 单例供工具层复用
+task_keywords = TaskKeywordCounter()
+
+__all__ = [
+    "TaskKeywordCounter",
+    "task_keywords",
+    "task_text",
+]
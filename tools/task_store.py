@@ -0,0 +1,159 @@
+"""
+本地任务快照（Task Store）
+
+按任务ID保存最近一次从官方接口拉取或写入的任务，维护数据版本号，
+并在任务新增、变更、删除时把增量推送给订阅者（检索索引等派生结构据此增量维护）。
+项目列表同样保存快照与版本号（ProjectStore），供派生缓存判断数据是否变化。
+"""
+
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+# 订阅者签名：listener(upserted_tasks, removed_tasks)
+TaskListener = Callable[[List[Dict[str, Any]], List[Dict[str, Any]]], None]
+
+
+class TaskStore:
+    """任务快照与变更分发"""
+
+    def __init__(self):
+        self._tasks: Dict[str, Dict[str, Any]] = {}
+        self._version = 0
+        self._listeners: List[TaskListener] = []
+        self._lock = threading.RLock()
+
+    @property
+    def version(self) -> int:
+        """数据版本号，每次有实际变更时递增"""
+        return self._version
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    def subscribe(self, listener: TaskListener) -> None:
+        """
+        订阅任务变更
+
+        新订阅者会立即收到一次当前全部任务作为 upserted，以便补齐已有数据。
+        """
+        with self._lock:
+            self._listeners.append(listener)
+            if self._tasks:
+                self._notify(listener, list(self._tasks.values()), [])
+
+    def get_task(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """按ID获取任务"""
+        return self._tasks.get(task_id)
+
+    def tasks(self) -> List[Dict[str, Any]]:
+        """当前全部任务"""
+        with self._lock:
+            return list(self._tasks.values())
+
+    def sync_tasks(
+        self,
+        tasks: Iterable[Dict[str, Any]],
+        project_ids: Optional[Iterable[str]] = None,
+        keep_completed: bool = False,
+    ) -> None:
+        """
+        用一次完整拉取的结果对齐快照
+
+        Args:
+            tasks: 拉取到的任务
+            project_ids: 本次拉取覆盖的项目范围，None 表示全部项目；
+                         范围内但未出现在 tasks 中的任务视为已删除
+            keep_completed: 拉取结果不含已完成任务时（如 /project/{id}/data），保留快照中的已完成任务
+        """
+        scope = set(project_ids) if project_ids is not None else None
+        with self._lock:
+            upserted = []
+            seen = set()
+            for task in tasks:
+                task_id = task.get('id')
+                if not task_id:
+                    continue
+                seen.add(task_id)
+                if self._tasks.get(task_id) != task:
+                    self._tasks[task_id] = task
+                    upserted.append(task)
+            removed = [
+                t for tid, t in self._tasks.items()
+                if tid not in seen
+                and (scope is None or t.get('projectId') in scope)
+                and not (keep_completed and t.get('isCompleted'))
+            ]
+            for task in removed:
+                del self._tasks[task['id']]
+            self._publish(upserted, removed)
+
+    def upsert_tasks(self, tasks: Iterable[Dict[str, Any]]) -> None:
+        """写入（新增或覆盖）任务"""
+        with self._lock:
+            upserted = []
+            for task in tasks:
+                task_id = task.get('id')
+                if task_id and self._tasks.get(task_id) != task:
+                    self._tasks[task_id] = task
+                    upserted.append(task)
+            self._publish(upserted, [])
+
+    def remove_tasks(self, task_ids: Iterable[str]) -> None:
+        """删除任务（不存在的ID忽略）"""
+        with self._lock:
+            removed = [self._tasks.pop(tid) for tid in task_ids if tid in self._tasks]
+            self._publish([], removed)
+
+    def _publish(self, upserted: List[Dict[str, Any]], removed: List[Dict[str, Any]]) -> None:
+        if not upserted and not removed:
+            return
+        self._version += 1
+        for listener in list(self._listeners):
+            self._notify(listener, upserted, removed)
+
+    @staticmethod
+    def _notify(listener: TaskListener, upserted, removed) -> None:
+        try:
+            listener(upserted, removed)
+        except Exception as e:
+            # 派生结构出错不应影响主流程
+            print(f"任务变更订阅者处理失败: {e}")
+
+
+class ProjectStore:
+    """项目列表快照，内容变化时递增版本号"""
+
+    def __init__(self):
+        self._projects: List[Dict[str, Any]] = []
+        self._version = 0
+        self._lock = threading.Lock()
+
+    @property
+    def version(self) -> int:
+        """数据版本号，每次项目列表实际变化时递增"""
+        return self._version
+
+    def projects(self) -> List[Dict[str, Any]]:
+        """最近一次同步的项目列表"""
+        return list(self._projects)
+
+    def sync_projects(self, projects: Iterable[Dict[str, Any]]) -> None:
+        """用一次完整拉取的项目列表对齐快照"""
+        projects = list(projects)
+        with self._lock:
+            if projects != self._projects:
+                self._projects = projects
+                self._version += 1
+
+
+# 单例快照供工具层复用
+task_store = TaskStore()
+project_store = ProjectStore()
+
+__all__ = [
+    "TaskStore",
+    "TaskListener",
+    "ProjectStore",
+    "task_store",
+    "project_store",
+]
@@ -2,16 +2,65 @@
 任务相关MCP工具
 """
 
-from typing import Dict, List, Optional, Any, Union
+import os
+import itertools
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Any, Union, Tuple
 from datetime import datetime, timedelta
 import pytz
 from fastmcp import FastMCP
 from .adapter import adapter, APIError
+from .task_store import task_store, project_store
+from .completed_sync import completed_syncer
+from .task_archive import task_archive
+from .request_context import cached_in_request, defer_invalidation, request_scoped
+from utils.text.search_index import InvertedIndex
 
 # --- 模块级辅助函数 ---
 
 _completed_columns = set()
 
+# aggregate_tasks_logic 支持的分组维度
+TASK_GROUP_KEYS = ('project', 'priority', 'due_day', 'completed', 'tag')
+
+# 任务标题/内容的倒排索引（字符 n-gram，不分词），随 task_store 变更增量维护，用于关键词筛选的候选与排序
+_task_search_index = InvertedIndex(segment=False)
+# 任务ID -> 建立索引时的 (标题, 内容)；与当前任务一致时才以索引缩小候选范围
+_task_search_sources: Dict[str, Tuple[str, str]] = {}
+
+def _task_search_source(task: Dict[str, Any]) -> Tuple[str, str]:
+    """任务参与检索的 (标题, 内容)"""
+    return (task.get('title') or '', task.get('content') or '')
+
+def _task_search_text(task: Dict[str, Any]) -> str:
+    """任务参与检索的文本"""
+    return ' '.join(_task_search_source(task))
+
+def _index_task_changes(upserted: List[Dict[str, Any]], removed: List[Dict[str, Any]]) -> None:
+    """task_store 订阅者：同步检索索引"""
+    for task in removed:
+        _task_search_index.remove(task['id'])
+        _task_search_sources.pop(task['id'], None)
+    for task in upserted:
+        _task_search_index.add(task['id'], _task_search_text(task))
+        _task_search_sources[task['id']] = _task_search_source(task)
+
+_search_index_lock = threading.Lock()
+_search_index_subscribed = False
+
+def _ensure_task_search_index() -> None:
+    """首次关键词检索时再订阅检索索引（订阅时补齐快照中已有任务），启动与普通查询不建立索引"""
+    global _search_index_subscribed
+    with _search_index_lock:
+        if not _search_index_subscribed:
+            task_store.subscribe(_index_task_changes)
+            _search_index_subscribed = True
+
+# 已完成任务随快照变更写入本地归档
+task_store.subscribe(task_archive.on_task_changes)
+
 def _parse_date(date_str: Optional[str]) -> Optional[datetime]:
     """解析日期字符串为datetime对象，将UTC时间转换为北京时间"""
     if not date_str:
@@ -96,33 +145,49 @@ def _format_date_for_api(date_str: Optional[str]) -> Optional[str]:
         print(f"日期格式转换错误: {str(e)}")
         return date_str
             
-def _simplify_task_data(task_data: Dict[str, Any], projects_data: List[Dict[str, Any]] = None) -> Dict[str, Any]:
-    """简化任务数据，保留重要字段并格式化日期"""
-    # 格式化日期函数
-    def format_date(date_str, is_due_date=False):
-        if not date_str:
-            return None
-            
-        dt = _parse_date(date_str)
-        if not dt:
-            return date_str
-            
-        # 如果是截止日期且时间是0点，考虑添加一天
-        if is_due_date and dt.hour == 0 and dt.minute == 0 and dt.second == 0:
-            dt = dt + timedelta(days=1)
-            
-        return dt.strftime("%Y-%m-%d %H:%M:%S")
-    
+def _format_task_date(date_str: Optional[str], is_due_date: bool = False) -> Optional[str]:
+    """将任务日期格式化为本地 'YYYY-MM-DD HH:MM:SS'，截止日期为0点时顺延一天"""
+    if not date_str:
+        return None
+
+    dt = _parse_date(date_str)
+    if not dt:
+        return date_str
+
+    # 如果是截止日期且时间是0点，考虑添加一天
+    if is_due_date and dt.hour == 0 and dt.minute == 0 and dt.second == 0:
+        dt = dt + timedelta(days=1)
+
+    return dt.strftime("%Y-%m-%d %H:%M:%S")
+
+def _simplify_task_data(
+    task_data: Dict[str, Any],
+    projects_data: List[Dict[str, Any]] = None,
+    fields: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """
+    简化任务数据，保留重要字段并格式化日期
+
+    Args:
+        task_data: 原始任务数据
+        projects_data: 项目列表，用于补齐项目名称
+        fields: 字段投影，仅计算并返回这些字段（始终包含 id）；None 表示全部字段
+    """
+    wanted = set(fields) | {"id"} if fields else None
+
+    def want(key: str) -> bool:
+        return wanted is None or key in wanted
+
     # 如果提供了项目数据列表，且当前任务只有projectId但没有projectName，则匹配项目名称
     if projects_data and task_data.get('projectId') and not task_data.get('projectName'):
         task_data = _merge_project_info_logic(task_data, projects_data)
-    
-    # 处理子任务
+
+    # 处理子任务（未请求 items/children 时跳过递归）
     children = []
-    if task_data.get('items'):
+    if task_data.get('items') and (want("items") or want("children")):
         for item in task_data['items']:
             # 递归调用，同时传递项目数据
-            child_task = _simplify_task_data(item, projects_data)
+            child_task = _simplify_task_data(item, projects_data, fields)
             children.append(child_task)
     # 创建基础任务数据
     simplified = {
@@ -138,11 +203,11 @@ def _simplify_task_data(task_data: Dict[str, Any], projects_data: List[Dict[str,
         "columnId": task_data.get("columnId"),
         "tags": task_data.get("tags", []),
         "tagDetails": task_data.get("tagDetails", []),
-        "startDate": format_date(task_data.get("startDate")),
-        "dueDate": format_date(task_data.get("dueDate"), is_due_date=True),
-        "completedTime": format_date(task_data.get("completedTime")),
-        "createdTime": format_date(task_data.get("createdTime")),
-        "modifiedTime": format_date(task_data.get("modifiedTime")),
+        "startDate": _format_task_date(task_data.get("startDate")) if want("startDate") else None,
+        "dueDate": _format_task_date(task_data.get("dueDate"), is_due_date=True) if want("dueDate") else None,
+        "completedTime": _format_task_date(task_data.get("completedTime")) if want("completedTime") else None,
+        "createdTime": _format_task_date(task_data.get("createdTime")) if want("createdTime") else None,
+        "modifiedTime": _format_task_date(task_data.get("modifiedTime")) if want("modifiedTime") else None,
         "isAllDay": task_data.get("isAllDay", False),
         "reminder": task_data.get("reminder"),
         "progress": task_data.get("progress", 0),
@@ -156,11 +221,69 @@ def _simplify_task_data(task_data: Dict[str, Any], projects_data: List[Dict[str,
         "parentId": task_data.get("parentId"),
         "children": children
     }
-    
-    # 移除None值
-    simplified = {k: v for k, v in simplified.items() if v is not None}
+
+    # 移除None值与未请求的字段
+    simplified = {k: v for k, v in simplified.items() if v is not None and want(k)}
     return simplified
 
+# 紧凑模式下等于默认值即可省略的字段
+_COMPACT_TASK_DEFAULTS = {
+    "status": 0,
+    "completed": False,
+    "isAllDay": False,
+    "progress": 0,
+    "sortOrder": 0,
+    "tags": [],
+    "tagDetails": [],
+    "reminders": [],
+    "items": [],
+}
+# 紧凑模式下始终省略的冗余字段：children 与 items 相同，isCompleted 与 completed 相同，timeZone 恒为 Asia/Shanghai
+_COMPACT_TASK_REDUNDANT = ("children", "isCompleted", "timeZone")
+
+def _compact_task_data(task: Dict[str, Any]) -> Dict[str, Any]:
+    """紧凑编码：去除冗余字段与默认值，子任务递归处理"""
+    compacted = {}
+    for key, value in task.items():
+        if key in _COMPACT_TASK_REDUNDANT:
+            continue
+        if key in _COMPACT_TASK_DEFAULTS and value == _COMPACT_TASK_DEFAULTS[key]:
+            continue
+        if value == "" or value == [] or value == {}:
+            continue
+        # 子任务没有 projectId，其 projectName 只是兜底的“默认清单”
+        if key == "projectName" and not task.get("projectId"):
+            continue
+        if key == "items":
+            value = [_compact_task_data(item) for item in value]
+        compacted[key] = value
+    return compacted
+
+def _encode_task_projects(tasks: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    对重复的项目信息做字典编码：项目只在 projects 表中出现一次，
+    任务中以 projectRef（projects 下标）引用，去掉 projectId/projectName/projectKind
+
+    Returns:
+        {"projects": [{"id", "name", "kind"}...], "tasks": [...]}
+    """
+    projects: List[Dict[str, Any]] = []
+    refs: Dict[Any, int] = {}
+    encoded_tasks = []
+    for task in tasks:
+        key = (task.get("projectId"), task.get("projectName"))
+        if key == (None, None):
+            encoded_tasks.append(task)
+            continue
+        if key not in refs:
+            refs[key] = len(projects)
+            project = {"id": key[0], "name": key[1], "kind": task.get("projectKind")}
+            projects.append({k: v for k, v in project.items() if v is not None})
+        encoded = {k: v for k, v in task.items() if k not in ("projectId", "projectName", "projectKind")}
+        encoded["projectRef"] = refs[key]
+        encoded_tasks.append(encoded)
+    return {"projects": projects, "tasks": encoded_tasks}
+
 def _get_completed_tasks_info_logic() -> Dict[str, Any]:
     """(已废弃路径) 兼容占位：官方API不提供旧批量接口，返回空。"""
     return {}
@@ -201,13 +324,31 @@ def _merge_tag_info_logic(task_data: Dict[str, Any], tags: List[Dict[str, Any]])
     task_data['tagDetails'] = tag_details
     return task_data
 
+def _find_task_logic(all_tasks: List[Dict[str, Any]], task_id_or_title: str) -> Optional[Dict[str, Any]]:
+    """按ID查找任务，找不到再按标题查找"""
+    for t in all_tasks:
+        if t.get('id') == task_id_or_title:
+            return t
+    for t in all_tasks:
+        if t.get('title') == task_id_or_title:
+            return t
+    return None
+
 def _get_all_tasks_logic() -> tuple[List[Dict[str, Any]], List[Dict[str, Any]], List[Dict[str, Any]]]:
-    """获取所有任务，包括已完成和未完成的任务，并合并相关信息 (逻辑部分)"""
+    """
+    获取所有任务，包括已完成和未完成的任务，并合并相关信息 (逻辑部分)
+    同一次工具调用内（请求作用域）只拉取一次，嵌套调用复用同一份结果
+    """
+    return cached_in_request('all_tasks', _load_all_tasks)
+
+def _load_all_tasks() -> tuple[List[Dict[str, Any]], List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """从上游拉取全部任务与项目，并对齐本地快照"""
     global _completed_columns
     # 使用官方接口获取项目与任务
     projects_data = []
     try:
         projects_data = adapter.list_projects()
+        project_store.sync_projects(projects_data)
     except Exception:
         projects_data = []
 
@@ -215,13 +356,25 @@ def _get_all_tasks_logic() -> tuple[List[Dict[str, Any]], List[Dict[str, Any]],
     tasks_data: List[Dict[str, Any]] = []
     tags_data: List[Dict[str, Any]] = []  # 若官方没有标签API，则保留空集合
     try:
-        # 遍历项目聚合任务（官方无全局列表端点）
-        incomplete = adapter.list_tasks(completed=False)
-        complete = adapter.list_tasks(completed=True)
-        tasks_data = (incomplete or []) + (complete or [])
+        # 遍历项目聚合任务（官方无全局列表端点；/data 只含未完成任务，一次遍历即可）
+        tasks_data = adapter.list_tasks() or []
+        fetched = True
     except Exception as e:
         print(f"获取任务列表失败: {e}")
         tasks_data = []
+        fetched = False
+
+    # 已完成任务来自 /task/completed：增量同步后从快照合并历史
+    if fetched:
+        try:
+            completed_syncer.sync([p.get('id') for p in projects_data if p.get('id')])
+        except Exception as e:
+            print(f"同步已完成任务失败: {e}")
+        active_ids = {t.get('id') for t in tasks_data}
+        tasks_data = tasks_data + [
+            t for t in task_store.tasks()
+            if t.get('isCompleted') and t.get('id') not in active_ids
+        ]
     
     # 更新栏目信息 (使用全局变量)
     _update_column_info_logic(projects_data, _completed_columns)
@@ -249,9 +402,144 @@ def _get_all_tasks_logic() -> tuple[List[Dict[str, Any]], List[Dict[str, Any]],
         all_tasks.append(task)
     
     # 不再需要从已完成任务列表补充，adapter 已统一返回
-    
+
+    # 拉取成功时对齐本地快照（失败时保留旧快照，避免误删）
+    if fetched:
+        task_store.sync_tasks(all_tasks, keep_completed=True)
+
     return all_tasks, projects_data, tags_data
 
+def _is_today_task(task: Dict[str, Any]) -> bool:
+    """检查任务是否为今天"""
+    local_tz = pytz.timezone('Asia/Shanghai')
+    now = datetime.now(local_tz)
+    today = now.date()
+
+    # 解析日期并获取日期部分
+    start_date = _parse_date(task.get('startDate'))
+    due_date = _parse_date(task.get('dueDate'))
+
+    # 简化判断逻辑：使用截止日期或开始日期判断
+    task_date = due_date or start_date
+
+    # 判断日期是否为今天
+    if task_date and task_date.date() == today:
+        return True
+
+    # 如果任务跨越今天(开始日期在今天之前，截止日期在今天之后或无截止日期)
+    if start_date and start_date.date() < today:
+        if not due_date or due_date.date() >= today:
+            return True
+
+    return False
+
+def _is_yesterday_task(task: Dict[str, Any]) -> bool:
+    """检查任务是否为昨天"""
+    local_tz = pytz.timezone('Asia/Shanghai')
+    now = datetime.now(local_tz)
+    yesterday = (now - timedelta(days=1)).date()
+
+    # 解析日期
+    start_date = _parse_date(task.get('startDate'))
+    due_date = _parse_date(task.get('dueDate'))
+
+    # 简化判断逻辑：使用截止日期或开始日期判断
+    task_date = due_date or start_date
+
+    return bool(task_date and task_date.date() == yesterday)
+
+def _is_recent_7_days_task(task: Dict[str, Any]) -> bool:
+    """检查任务是否属于最近7天"""
+    local_tz = pytz.timezone('Asia/Shanghai')
+    now = datetime.now(local_tz)
+    seven_days_ago = (now - timedelta(days=7))
+
+    # 解析日期
+    start_date = _parse_date(task.get('startDate'))
+    due_date = _parse_date(task.get('dueDate'))
+
+    # 简化判断逻辑：使用截止日期或开始日期判断
+    task_date = due_date or start_date
+
+    # 最近7天的任务
+    if task_date and task_date >= seven_days_ago:
+        return True
+
+    # 跨越这7天的任务
+    if start_date and start_date < seven_days_ago:
+        if due_date and due_date >= seven_days_ago:
+            return True
+
+    return False
+
+def _filter_tasks_logic(
+    all_tasks: List[Dict[str, Any]],
+    projects_data: List[Dict[str, Any]],
+    mode: Optional[str] = "all",
+    keyword: Optional[str] = None,
+    priority: Optional[int] = None,
+    project_name: Optional[str] = None,
+    completed: Optional[bool] = None
+) -> List[Dict[str, Any]]:
+    """按 get_tasks 的筛选条件过滤原始任务 (逻辑部分)，返回未简化的任务"""
+    # 如果是查询今天的任务，默认只显示未完成的任务
+    if mode == "today" and completed is None:
+        completed = False
+
+    # 确保所有任务都有正确的project_name (在过滤之前)
+    for task in all_tasks:
+        if task.get('projectId') and not task.get('projectName'):
+            _merge_project_info_logic(task, projects_data)
+
+    # 关键词以子串匹配为准：倒排索引给出包含关键词全部字符 n-gram 的候选（不会漏掉子串命中），
+    # 只对候选做子串确认；索引内容与当前任务不一致（或未建立索引）的任务直接做子串匹配
+    keyword_scores = None
+    keyword_lower = keyword.lower() if keyword else None
+    if keyword:
+        _ensure_task_search_index()
+        keyword_scores = _task_search_index.candidates(keyword)
+
+    result = []
+    for task in all_tasks:
+        # 根据完成状态筛选
+        if completed is not None:
+            is_task_completed = task.get('isCompleted', False)
+            if is_task_completed != completed:
+                continue
+
+        # 根据模式筛选
+        if mode == "today" and not _is_today_task(task):
+            continue
+        elif mode == "yesterday" and not _is_yesterday_task(task):
+            continue
+        elif mode == "recent_7_days" and not _is_recent_7_days_task(task):
+            continue
+
+        # 根据其他条件筛选
+        if keyword:
+            source = _task_search_source(task)
+            if (
+                keyword_scores is not None
+                and task.get('id') not in keyword_scores
+                and _task_search_sources.get(task.get('id')) == source
+            ):
+                continue
+            if keyword_lower not in source[0].lower() and keyword_lower not in source[1].lower():
+                continue
+
+        if priority is not None and task.get('priority') != priority:
+            continue
+
+        # 根据项目名称筛选 (现在任务已经有了正确的project_name)
+        if project_name and project_name not in task.get('projectName', ''):
+            continue
+        result.append(task)
+
+    # 关键词检索结果按相关度排序（未建立索引的任务排在后面，保持原顺序）
+    if keyword_scores:
+        result.sort(key=lambda t: keyword_scores.get(t.get('id'), 0.0), reverse=True)
+    return result
+
 # --- 模块级核心逻辑函数 ---
 
 def get_tasks_logic(
@@ -259,135 +547,119 @@ def get_tasks_logic(
     keyword: Optional[str] = None,
     priority: Optional[int] = None,
     project_name: Optional[str] = None,
-    completed: Optional[bool] = None
+    completed: Optional[bool] = None,
+    fields: Optional[List[str]] = None,
+    compact: bool = False
 ) -> List[Dict[str, Any]]:
     """
     获取任务列表 (逻辑部分)
-    
+
     Args:
         mode: 任务模式，支持 'all'(所有), 'today'(今天), 'yesterday'(昨天), 'recent_7_days'(最近7天)
         keyword: 关键词筛选
         priority: 优先级筛选 (0-最低, 1-低, 3-中, 5-高)
         project_name: 项目名称筛选
         completed: 是否已完成，True表示已完成，False表示未完成，None表示全部
-        
+        fields: 只返回这些字段（始终包含 id），如 ["title", "dueDate"]
+        compact: 紧凑模式，去除冗余字段与默认值
+
     Returns:
         符合条件的任务列表
     """
     try:
-        # 如果是查询今天的任务，默认只显示未完成的任务
-        if mode == "today" and completed is None:
-            completed = False
-            
         # 获取所有任务
         all_tasks, projects_data, tags_data = _get_all_tasks_logic()
-        
-        # 确保所有任务都有正确的project_name (在过滤之前)
-        for task in all_tasks:
-            if task.get('projectId') and not task.get('projectName'):
-                _merge_project_info_logic(task, projects_data)
-        
-        def is_today(task):
-            # 检查任务是否为今天
-            local_tz = pytz.timezone('Asia/Shanghai')
-            now = datetime.now(local_tz)
-            today = now.date()
-            
-            # 解析日期并获取日期部分
-            start_date = _parse_date(task.get('startDate'))
-            due_date = _parse_date(task.get('dueDate'))
-            
-            # 简化判断逻辑：使用截止日期或开始日期判断
-            task_date = due_date or start_date
-            
-            # 判断日期是否为今天
-            if task_date and task_date.date() == today:
-                return True
-                
-            # 如果任务跨越今天(开始日期在今天之前，截止日期在今天之后或无截止日期)
-            if start_date and start_date.date() < today:
-                if not due_date or due_date.date() >= today:
-                    return True
-                    
-            return False
-            
-        def is_yesterday(task):
-            # 检查任务是否为昨天
-            local_tz = pytz.timezone('Asia/Shanghai')
-            now = datetime.now(local_tz)
-            yesterday = (now - timedelta(days=1)).date()
-            
-            # 解析日期
-            start_date = _parse_date(task.get('startDate'))
-            due_date = _parse_date(task.get('dueDate'))
-            
-            # 简化判断逻辑：使用截止日期或开始日期判断
-            task_date = due_date or start_date
-            
-            return task_date and task_date.date() == yesterday
-            
-        def is_recent_7_days(task):
-            # 检查任务是否属于最近7天
-            local_tz = pytz.timezone('Asia/Shanghai')
-            now = datetime.now(local_tz)
-            seven_days_ago = (now - timedelta(days=7))
-            
-            # 解析日期
-            start_date = _parse_date(task.get('startDate'))
-            due_date = _parse_date(task.get('dueDate'))
-            
-            # 简化判断逻辑：使用截止日期或开始日期判断
-            task_date = due_date or start_date
-            
-            # 最近7天的任务
-            if task_date and task_date >= seven_days_ago:
-                return True
-                
-            # 跨越这7天的任务
-            if start_date and start_date < seven_days_ago:
-                if due_date and due_date >= seven_days_ago:
-                    return True
-                    
-            return False
-            
+
         # 过滤任务
         result = []
-        for task in all_tasks:
-            # 根据完成状态筛选
-            if completed is not None:
-                is_task_completed = task.get('isCompleted', False)
-                if is_task_completed != completed:
-                    continue
-                
-            # 根据模式筛选
-            if mode == "today" and not is_today(task):
-                continue
-            elif mode == "yesterday" and not is_yesterday(task):
-                continue
-            elif mode == "recent_7_days" and not is_recent_7_days(task):
-                continue
-                
-            # 根据其他条件筛选
-            if keyword and keyword.lower() not in task.get('title', '').lower() and keyword.lower() not in task.get('content', '').lower():
-                continue
-                
-            if priority is not None and task.get('priority') != priority:
-                continue
-            
-                
-
-            # 根据项目名称筛选 (现在任务已经有了正确的project_name)
-            if project_name and project_name not in task.get('projectName', ''):
-                continue
+        for task in _filter_tasks_logic(all_tasks, projects_data, mode, keyword, priority, project_name, completed):
             # 保留简化后的任务数据，传递项目数据
-            simplified_task = _simplify_task_data(task, projects_data)
+            simplified_task = _simplify_task_data(task, projects_data, fields)
+            if compact:
+                simplified_task = _compact_task_data(simplified_task)
             result.append(simplified_task)
-        
+
         return result
     except Exception as e:
         print(f"获取任务列表时发生错误: {str(e)}")
         return []
 
+def aggregate_tasks_logic(
+    group_by: List[str],
+    mode: Optional[str] = "all",
+    keyword: Optional[str] = None,
+    priority: Optional[int] = None,
+    project_name: Optional[str] = None,
+    completed: Optional[bool] = None
+) -> Dict[str, Any]:
+    """
+    按维度聚合任务 (逻辑部分)，一次遍历得到各分组的计数，不返回任务明细
+
+    Args:
+        group_by: 分组维度，可选 'project', 'priority', 'due_day', 'completed', 'tag'
+                  （多标签任务会计入每个标签分组；无标签/无截止日期的分组键为 None）
+        mode/keyword/priority/project_name/completed: 与 get_tasks 相同的筛选条件
+
+    Returns:
+        {"group_by": [...], "total": 匹配任务数, "groups": [{<维度>: 值, "count", "completed_count",
+         "overdue", "min_due", "max_due"}, ...]}，groups 按 count 降序
+    """
+    invalid = [g for g in group_by if g not in TASK_GROUP_KEYS]
+    if invalid:
+        raise ValueError(f"不支持的分组维度: {invalid}，应为 {list(TASK_GROUP_KEYS)} 中的值")
+
+    all_tasks, projects_data, _ = _get_all_tasks_logic()
+    tasks = _filter_tasks_logic(all_tasks, projects_data, mode, keyword, priority, project_name, completed)
+
+    now_str = datetime.now(pytz.timezone('Asia/Shanghai')).strftime("%Y-%m-%d %H:%M:%S")
+    groups: Dict[tuple, Dict[str, Any]] = {}
+    for task in tasks:
+        # 与 get_tasks 返回的 dueDate 保持一致（0点截止顺延一天）
+        due = _format_task_date(task.get('dueDate'), is_due_date=True)
+        is_done = bool(task.get('isCompleted', False))
+
+        dims = []
+        for g in group_by:
+            if g == 'project':
+                dims.append((task.get('projectName'),))
+            elif g == 'priority':
+                dims.append((task.get('priority'),))
+            elif g == 'due_day':
+                raw_due = _parse_date(task.get('dueDate'))
+                dims.append((raw_due.strftime("%Y-%m-%d") if raw_due else None,))
+            elif g == 'completed':
+                dims.append((is_done,))
+            elif g == 'tag':
+                dims.append(tuple(task.get('tags') or []) or (None,))
+
+        for key in itertools.product(*dims):
+            bucket = groups.get(key)
+            if bucket is None:
+                bucket = groups[key] = {"count": 0, "completed_count": 0, "overdue": 0, "min_due": None, "max_due": None}
+            bucket["count"] += 1
+            if is_done:
+                bucket["completed_count"] += 1
+            if due:
+                if not is_done and due < now_str:
+                    bucket["overdue"] += 1
+                if bucket["min_due"] is None or due < bucket["min_due"]:
+                    bucket["min_due"] = due
+                if bucket["max_due"] is None or due > bucket["max_due"]:
+                    bucket["max_due"] = due
+
+    result_groups = []
+    for key, bucket in groups.items():
+        row = dict(zip(group_by, key))
+        row.update({k: v for k, v in bucket.items() if v is not None})
+        result_groups.append(row)
+    result_groups.sort(key=lambda r: r["count"], reverse=True)
+
+    return {
+        "group_by": list(group_by),
+        "total": len(tasks),
+        "groups": result_groups
+    }
+
 def create_task_logic(
     title: Optional[str] = None,
     content: Optional[str] = None,
@@ -406,7 +678,8 @@ def create_task_logic(
     reminders: Optional[List[str]] = None,
     repeat_flag: Optional[str] = None,
     sort_order: Optional[int] = None,
-    items: Optional[List[Dict[str, Any]]] = None
+    items: Optional[List[Dict[str, Any]]] = None,
+    projects_data: Optional[List[Dict[str, Any]]] = None
 ) -> Dict[str, Any]:
     """
     创建新任务 (逻辑部分)
@@ -421,12 +694,14 @@ def create_task_logic(
         due_date: 截止日期，格式 'YYYY-MM-DD HH:MM:SS'
         is_all_day: 是否为全天任务
         reminder: 提醒选项，如 "0"(准时), "-5M"(提前5分钟), "-1H"(提前1小时), "-1D"(提前1天)
+        projects_data: 已获取的项目列表（批量调用时复用），未提供时重新拉取
         
     Returns:
         创建的任务信息
     """
     resolved_project_id = project_id
-    projects_data = adapter.list_projects()
+    if projects_data is None:
+        projects_data = adapter.list_projects()
     
     if not resolved_project_id and project_name:
         # 尝试精确匹配
@@ -491,10 +766,35 @@ def create_task_logic(
     
     # 发送创建请求
     response = adapter.create_task(task_data)
+    if response.get('kind', 'TEXT') == 'TEXT':
+        task_store.upsert_tasks([_merge_project_info_logic(dict(response), projects_data)])
     
     # 返回简化后的响应，同时传递项目数据
     return _simplify_task_data(response, projects_data)
 
+# 比较时需统一为API格式的日期字段
+_TASK_DATE_FIELDS = ('startDate', 'dueDate')
+
+def _diff_task_fields(task: Dict[str, Any], requested: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    计算相对缓存任务实际发生变化的字段
+
+    Args:
+        task: 缓存中的任务（日期为本地格式）
+        requested: 待写入的字段（日期为API格式）
+
+    Returns:
+        仅包含变化字段的字典
+    """
+    changes = {}
+    for key, value in requested.items():
+        current = task.get(key)
+        if key in _TASK_DATE_FIELDS:
+            current = adapter.to_api_datetime(current)
+        if current != value:
+            changes[key] = value
+    return changes
+
 def update_task_logic(
     task_id_or_title: str,
     title: Optional[str] = None,
@@ -514,7 +814,8 @@ def update_task_logic(
     reminders: Optional[List[str]] = None,
     repeat_flag: Optional[str] = None,
     sort_order: Optional[int] = None,
-    items: Optional[List[Dict[str, Any]]] = None
+    items: Optional[List[Dict[str, Any]]] = None,
+    prefetched: Optional[Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]] = None
 ) -> Dict[str, Any]:
     """
     更新任务 (逻辑部分)
@@ -531,28 +832,17 @@ def update_task_logic(
         is_all_day: 是否为全天任务
         reminder: 新提醒选项
         status: 新状态，0表示未完成，2表示已完成
+        prefetched: 已获取的 (任务列表, 项目列表)（批量调用时复用），未提供时重新拉取
         
     Returns:
         更新后的任务信息字典 (包含 success, info, data)
     """
     try:
         # 获取所有任务
-        all_tasks, projects_data, _ = _get_all_tasks_logic()
+        all_tasks, projects_data = prefetched or _get_all_tasks_logic()[:2]
         
         # 查找任务
-        task = None
-        # 先尝试按ID查找
-        for t in all_tasks:
-            if t.get('id') == task_id_or_title:
-                task = t
-                break
-        
-        # 如果没找到，按标题查找
-        if not task:
-            for t in all_tasks:
-                if t.get('title') == task_id_or_title:
-                    task = t
-                    break
+        task = _find_task_logic(all_tasks, task_id_or_title)
         
         if not task:
             return {
@@ -571,45 +861,25 @@ def update_task_logic(
                     project_id = project.get('id')
                     break
                     
-        # 准备更新数据
-        update_data = {
-            "id": task_id,
-            "title": title if title is not None else task.get('title'),
-            "content": content if content is not None else task.get('content'),
-            "priority": priority if priority is not None else task.get('priority'),
+        # 只收集调用方显式给出的字段，再与缓存任务逐字段比较
+        requested = {
+            "title": title,
+            "content": content,
+            "priority": priority,
             "projectId": project_id,
             # 官方未公开 tags 写入，去除发送
-            "isAllDay": is_all_day if is_all_day is not None else task.get('isAllDay'),
-            "status": status if status is not None else task.get('status'),
+            "isAllDay": is_all_day,
             # 官方字段
-            "desc": desc if desc is not None else task.get('desc'),
-            "timeZone": time_zone if time_zone is not None else task.get('timeZone'),
-            "reminders": reminders if reminders is not None else task.get('reminders'),
-            "repeatFlag": repeat_flag if repeat_flag is not None else task.get('repeatFlag'),
-            "sortOrder": sort_order if sort_order is not None else task.get('sortOrder'),
-            "items": items if items is not None else task.get('items'),
+            "desc": desc,
+            "timeZone": time_zone,
+            "reminders": [reminder] if reminder is not None and reminders is None else reminders,
+            "repeatFlag": repeat_flag,
+            "sortOrder": sort_order,
+            "items": items,
+            "startDate": _format_date_for_api(start_date) if start_date is not None else None,
+            "dueDate": _format_date_for_api(due_date) if due_date is not None else None,
         }
-        
-        # 处理日期和提醒
-        if start_date is not None:
-            # 转换为API所需的格式
-            update_data["startDate"] = _format_date_for_api(start_date)
-        elif 'startDate' in task:
-            update_data["startDate"] = task['startDate']
-            
-        if due_date is not None:
-            # 转换为API所需的格式
-            update_data["dueDate"] = _format_date_for_api(due_date)
-        elif 'dueDate' in task:
-            update_data["dueDate"] = task['dueDate']
-            
-        if reminder is not None:
-            update_data["reminder"] = reminder
-        elif 'reminder' in task:
-            update_data["reminder"] = task['reminder']
-            
-        # 移除None值的字段
-        update_data = {k: v for k, v in update_data.items() if v is not None}
+        changes = _diff_task_fields(task, {k: v for k, v in requested.items() if v is not None})
 
         # 状态变更：对齐官方逻辑（仅支持完成）
         if status is not None:
@@ -626,6 +896,7 @@ def update_task_logic(
                     refreshed = adapter.list_tasks(project_id=project_id)
                     fresh = next((t for t in refreshed if t.get('id') == task_id), None)
                     if fresh:
+                        task_store.upsert_tasks([fresh])
                         return {
                             "success": True,
                             "info": "任务已完成",
@@ -641,6 +912,7 @@ def update_task_logic(
                 task_after = dict(task)
                 task_after['status'] = 2
                 task_after['isCompleted'] = True
+                task_store.upsert_tasks([task_after])
                 return {
                     "success": True,
                     "info": "任务已完成",
@@ -653,15 +925,26 @@ def update_task_logic(
                     "data": None
                 }
 
-        # 非状态变更：走常规更新
+        # 无实际变化：不调用上游
+        if not changes:
+            return {
+                "success": True,
+                "info": "任务无变化，未发起更新",
+                "data": _simplify_task_data(task, projects_data)
+            }
+
+        # 非状态变更：仅发送变化字段与必需的ID
+        update_data = {"id": task_id, "projectId": project_id, **changes}
         print(f"更新数据: {update_data}")
         response = adapter.update_task(task_id, update_data)
+        updated = _merge_project_info_logic({**task, **response}, projects_data)
+        task_store.upsert_tasks([updated])
         
         # 返回更新结果
         return {
             "success": True,
             "info": "任务更新成功",
-            "data": _simplify_task_data(response, projects_data)
+            "data": _simplify_task_data(updated, projects_data)
         }
     except Exception as e:
         print(f"更新任务失败: {str(e)}")
@@ -671,33 +954,25 @@ def update_task_logic(
             "data": None
         }
 
-def delete_task_logic(task_id_or_title: str) -> Dict[str, Any]:
+def delete_task_logic(
+    task_id_or_title: str,
+    prefetched: Optional[Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]] = None
+) -> Dict[str, Any]:
     """
     删除任务 (逻辑部分)
     
     Args:
         task_id_or_title: 任务ID或任务标题
+        prefetched: 已获取的 (任务列表, 项目列表)（批量调用时复用），未提供时重新拉取
         
     Returns:
         删除操作的响应字典 (包含 success, info, data)
     """
     try:
         # 获取所有任务
-        all_tasks, projects_data, _ = _get_all_tasks_logic()
+        all_tasks, projects_data = prefetched or _get_all_tasks_logic()[:2]
         
-        task = None
-        # 先尝试按ID查找
-        for t in all_tasks:
-            if t.get('id') == task_id_or_title:
-                task = t
-                break
-                
-        # 如果没找到，按标题查找
-        if not task:
-            for t in all_tasks:
-                if t.get('title') == task_id_or_title:
-                    task = t
-                    break
+        task = _find_task_logic(all_tasks, task_id_or_title)
         
         if not task:
             return {
@@ -712,6 +987,7 @@ def delete_task_logic(task_id_or_title: str) -> Dict[str, Any]:
         # 发送删除请求
         # 官方删除需要 projectId
         adapter.delete_task(project_id, task_id)
+        task_store.remove_tasks([task_id])
         
         # 返回删除结果
         return {
@@ -729,17 +1005,23 @@ def delete_task_logic(task_id_or_title: str) -> Dict[str, Any]:
         }
 
 
-def complete_task_logic(task_id_or_title: str) -> Dict[str, Any]:
+def complete_task_logic(
+    task_id_or_title: str,
+    prefetched: Optional[Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]] = None,
+    refresh: bool = True
+) -> Dict[str, Any]:
     """
     完成任务（调用官方 complete 接口）
     
     Args:
         task_id_or_title: 任务ID或任务标题
+        prefetched: 已获取的 (任务列表, 项目列表)（批量调用时复用），未提供时重新拉取
+        refresh: 完成后是否重新拉取该项目任务以返回最新数据
     Returns:
         操作结果字典
     """
     try:
-        all_tasks, projects_data, _ = _get_all_tasks_logic()
+        all_tasks, projects_data = prefetched or _get_all_tasks_logic()[:2]
         task = None
         for t in all_tasks:
             if t.get('id') == task_id_or_title or t.get('title') == task_id_or_title:
@@ -761,9 +1043,10 @@ def complete_task_logic(task_id_or_title: str) -> Dict[str, Any]:
             }
         adapter.complete_task(project_id, task_id)
         # 刷新该项目任务，返回最新数据
-        refreshed = adapter.list_tasks(project_id=project_id)
+        refreshed = adapter.list_tasks(project_id=project_id) if refresh else []
         fresh = next((t for t in refreshed if t.get('id') == task_id), None)
         if fresh:
+            task_store.upsert_tasks([fresh])
             return {
                 "success": True,
                 "info": "任务已完成",
@@ -773,6 +1056,7 @@ def complete_task_logic(task_id_or_title: str) -> Dict[str, Any]:
         task_after = dict(task)
         task_after['status'] = 2
         task_after['isCompleted'] = True
+        task_store.upsert_tasks([task_after])
         return {
             "success": True,
             "info": "任务已完成",
@@ -786,6 +1070,169 @@ def complete_task_logic(task_id_or_title: str) -> Dict[str, Any]:
         }
 
 
+def sync_completed_tasks_logic(project_name: Optional[str] = None, full: bool = False) -> Dict[str, Any]:
+    """
+    同步已完成任务历史 (逻辑部分)
+
+    Args:
+        project_name: 只同步指定项目，None 表示全部项目
+        full: 是否清除高水位后重新回溯
+
+    Returns:
+        同步结果字典 (包含 success, info, data)
+    """
+    try:
+        project_ids = None
+        if project_name:
+            project_ids = [p.get('id') for p in adapter.list_projects() if p.get('name') == project_name]
+            if not project_ids:
+                return {"success": False, "info": f"未找到项目 '{project_name}'", "data": None}
+        if full:
+            completed_syncer.reset(project_ids)
+        result = completed_syncer.sync(project_ids)
+        return {
+            "success": True,
+            "info": f"同步完成，新拉取 {result['fetched']} 个已完成任务",
+            "data": {"fetched": result['fetched'], "projects": result['projects']}
+        }
+    except Exception as e:
+        return {"success": False, "info": f"同步已完成任务失败: {e}", "data": None}
+
+
+# --- 批量操作 ---
+
+# 批量操作对上游的并发上限
+BATCH_MAX_WORKERS = int(os.environ.get("DIDA_BATCH_CONCURRENCY", "4"))
+
+# 批量创建/更新时单项允许的字段（与 create_task / update_task 参数一致）
+_BATCH_CREATE_FIELDS = (
+    'title', 'content', 'priority', 'project_name', 'tag_names', 'start_date', 'due_date',
+    'is_all_day', 'reminder', 'kind', 'project_id', 'desc', 'time_zone', 'reminders',
+    'repeat_flag', 'sort_order', 'items',
+)
+_BATCH_UPDATE_FIELDS = (
+    'title', 'content', 'priority', 'project_name', 'tag_names', 'start_date', 'due_date',
+    'is_all_day', 'reminder', 'status', 'project_id', 'desc', 'time_zone', 'reminders',
+    'repeat_flag', 'sort_order', 'items',
+)
+
+def _run_batch(items: List[Any], func) -> Dict[str, Any]:
+    """
+    以有限并发逐项执行 func，单项失败不影响其他项
+
+    Returns:
+        {"total", "succeeded", "failed", "results": [{"index", "success", "info", "data"}...]}，results 与输入顺序一致
+    """
+    def run_one(indexed_item):
+        index, item = indexed_item
+        try:
+            result = func(item)
+        except Exception as e:
+            return {"index": index, "success": False, "info": str(e), "data": None}
+        if isinstance(result, dict) and 'success' in result:
+            return {"index": index, **result}
+        return {"index": index, "success": True, "info": "ok", "data": result}
+
+    results: List[Dict[str, Any]] = []
+    if items:
+        workers = max(1, min(BATCH_MAX_WORKERS, len(items)))
+        # 工作线程不继承 contextvar，每项在调用方上下文的副本中执行，共享同一份请求快照；
+        # 各项写入造成的快照清除推迟到全部完成后
+        with defer_invalidation(), ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(contextvars.copy_context().run, run_one, indexed_item)
+                for indexed_item in enumerate(items)
+            ]
+            results = [future.result() for future in futures]
+    succeeded = sum(1 for r in results if r['success'])
+    return {
+        "total": len(items),
+        "succeeded": succeeded,
+        "failed": len(items) - succeeded,
+        "results": results
+    }
+
+def _check_batch_fields(spec: Dict[str, Any], allowed: Tuple[str, ...]) -> None:
+    """校验单项字段"""
+    if not isinstance(spec, dict):
+        raise ValueError("每一项必须是对象")
+    unknown = sorted(set(spec) - set(allowed))
+    if unknown:
+        raise ValueError(f"不支持的字段: {unknown}")
+
+def batch_create_tasks_logic(tasks: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    批量创建任务 (逻辑部分)：项目列表只拉取一次，上游请求有限并发执行
+
+    Args:
+        tasks: 任务列表，每项字段与 create_task 参数相同
+
+    Returns:
+        批量结果 {"total", "succeeded", "failed", "results"}
+    """
+    projects_data = adapter.list_projects()
+
+    def create_one(spec: Dict[str, Any]) -> Dict[str, Any]:
+        _check_batch_fields(spec, _BATCH_CREATE_FIELDS)
+        return create_task_logic(**spec, projects_data=projects_data)
+
+    return _run_batch(tasks, create_one)
+
+def batch_update_tasks_logic(updates: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    批量更新任务 (逻辑部分)：任务与项目只拉取一次，上游请求有限并发执行
+
+    Args:
+        updates: 更新列表，每项需包含 task_id_or_title，其余字段与 update_task 参数相同
+
+    Returns:
+        批量结果 {"total", "succeeded", "failed", "results"}
+    """
+    prefetched = _get_all_tasks_logic()[:2]
+
+    def update_one(spec: Dict[str, Any]) -> Dict[str, Any]:
+        spec = dict(spec) if isinstance(spec, dict) else spec
+        target = spec.pop('task_id_or_title', None) if isinstance(spec, dict) else None
+        if not target:
+            raise ValueError("缺少 task_id_or_title")
+        _check_batch_fields(spec, _BATCH_UPDATE_FIELDS)
+        return update_task_logic(target, **spec, prefetched=prefetched)
+
+    return _run_batch(updates, update_one)
+
+def batch_complete_tasks_logic(task_ids_or_titles: List[str]) -> Dict[str, Any]:
+    """
+    批量完成任务 (逻辑部分)：任务与项目只拉取一次，完成后不逐项刷新
+
+    Args:
+        task_ids_or_titles: 任务ID或标题列表
+
+    Returns:
+        批量结果 {"total", "succeeded", "failed", "results"}
+    """
+    prefetched = _get_all_tasks_logic()[:2]
+    return _run_batch(
+        task_ids_or_titles,
+        lambda target: complete_task_logic(target, prefetched=prefetched, refresh=False)
+    )
+
+def batch_delete_tasks_logic(task_ids_or_titles: List[str]) -> Dict[str, Any]:
+    """
+    批量删除任务 (逻辑部分)：任务与项目只拉取一次，上游请求有限并发执行
+
+    Args:
+        task_ids_or_titles: 任务ID或标题列表
+
+    Returns:
+        批量结果 {"total", "succeeded", "failed", "results"}
+    """
+    prefetched = _get_all_tasks_logic()[:2]
+    return _run_batch(
+        task_ids_or_titles,
+        lambda target: delete_task_logic(target, prefetched=prefetched)
+    )
+
+
 # --- MCP工具注册 ---
 
 def register_task_tools(server: FastMCP, auth_info: Dict[str, Any]):
@@ -799,30 +1246,47 @@ def register_task_tools(server: FastMCP, auth_info: Dict[str, Any]):
     # 适配层按需初始化，无需在此显式初始化
     
     @server.tool()
+    @request_scoped
     def get_tasks(
         mode: Optional[str] = "all",
         keyword: Optional[str] = None,
         priority: Optional[int] = None,
         project_name: Optional[str] = None,
-        completed: Optional[bool] = None
-    ) -> List[Dict[str, Any]]:
+        completed: Optional[bool] = None,
+        fields: Optional[List[str]] = None,
+        compact: bool = False,
+        encode_projects: bool = False,
+        group_by: Optional[List[str]] = None
+    ) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
         """
         获取任务列表
         (调用模块级逻辑函数)
-        
+
         Args:
             mode: 任务模式，支持 'all'(所有), 'today'(今天), 'yesterday'(昨天), 'recent_7_days'(最近7天)
             keyword: 关键词筛选
             priority: 优先级筛选 (0-最低, 1-低, 3-中, 5-高)
             project_name: 项目名称筛选
             completed: 是否已完成，True表示已完成，False表示未完成，None表示全部
-            
+            fields: 只返回这些字段（始终包含 id），如 ["title", "dueDate", "priority"]
+            compact: 紧凑模式，去除冗余字段（children/isCompleted/timeZone）与默认值
+            encode_projects: 对项目信息做字典编码，返回 {"projects": [...], "tasks": [...]}，任务以 projectRef 引用项目
+            group_by: 仅聚合模式，按维度分组计数而不返回任务明细，可选 'project', 'priority', 'due_day', 'completed', 'tag'，
+                      如 ["project"] 统计每个项目的任务数/逾期数；此时 fields/compact/encode_projects 不生效
+
         Returns:
-            符合条件的任务列表
+            符合条件的任务列表；encode_projects=True 时为包含 projects 与 tasks 的字典；
+            group_by 非空时为 {"group_by", "total", "groups": [{维度值..., count, completed_count, overdue, min_due, max_due}]}
         """
-        return get_tasks_logic(mode=mode, keyword=keyword, priority=priority, project_name=project_name, completed=completed)
+        if group_by:
+            return aggregate_tasks_logic(group_by=group_by, mode=mode, keyword=keyword, priority=priority, project_name=project_name, completed=completed)
+        tasks = get_tasks_logic(mode=mode, keyword=keyword, priority=priority, project_name=project_name, completed=completed, fields=fields, compact=compact)
+        if encode_projects:
+            return _encode_task_projects(tasks)
+        return tasks
     
     @server.tool()
+    @request_scoped
     def create_task(
         title: Optional[str] = None,
         content: Optional[str] = None,
@@ -863,6 +1327,7 @@ def register_task_tools(server: FastMCP, auth_info: Dict[str, Any]):
         return create_task_logic(title=title, content=content, priority=priority, project_name=project_name, tag_names=tag_names, start_date=start_date, due_date=due_date, is_all_day=is_all_day, reminder=reminder, project_id=project_id, desc=desc, time_zone=time_zone, reminders=reminders, repeat_flag=repeat_flag, sort_order=sort_order, items=items)
     
     @server.tool()
+    @request_scoped
     def update_task(
         task_id_or_title: str,
         title: Optional[str] = None,
@@ -899,6 +1364,7 @@ def register_task_tools(server: FastMCP, auth_info: Dict[str, Any]):
         return update_task_logic(task_id_or_title=task_id_or_title, title=title, content=content, priority=priority, project_name=project_name, tag_names=tag_names, start_date=start_date, due_date=due_date, is_all_day=is_all_day, reminder=reminder, status=status)
     
     @server.tool()
+    @request_scoped
     def delete_task(task_id_or_title: str) -> Dict[str, Any]:
         """
         删除任务
@@ -913,6 +1379,7 @@ def register_task_tools(server: FastMCP, auth_info: Dict[str, Any]):
         return delete_task_logic(task_id_or_title=task_id_or_title)
 
     @server.tool()
+    @request_scoped
     def complete_task(task_id_or_title: str) -> Dict[str, Any]:
         """
         完成任务（官方：POST /open/v1/project/{projectId}/task/{taskId}/complete）
@@ -923,13 +1390,92 @@ def register_task_tools(server: FastMCP, auth_info: Dict[str, Any]):
         """
         return complete_task_logic(task_id_or_title)
 
+    @server.tool()
+    @request_scoped
+    def sync_completed_tasks(project_name: Optional[str] = None, full: bool = False) -> Dict[str, Any]:
+        """
+        同步已完成任务历史（GET /project/{id}/task/completed，按完成时间分窗口增量拉取）
+
+        Args:
+            project_name: 只同步指定项目，不填表示全部项目
+            full: 是否忽略已记录的同步进度，重新回溯历史
+
+        Returns:
+            同步结果，data 中包含本次拉取数量与各项目数量
+        """
+        return sync_completed_tasks_logic(project_name, full)
+
+    @server.tool()
+    @request_scoped
+    def batch_create_tasks(tasks: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        批量创建任务（项目只解析一次，并发调用上游，逐项返回结果，单项失败不影响其他项）
+
+        Args:
+            tasks: 任务列表，每项字段与 create_task 参数相同，如
+                   [{"title": "整理会议纪要", "project_name": "工作", "due_date": "2025-01-01 18:00:00"}]
+
+        Returns:
+            {"total", "succeeded", "failed", "results": [{"index", "success", "info", "data"}]}
+        """
+        return batch_create_tasks_logic(tasks)
+
+    @server.tool()
+    @request_scoped
+    def batch_update_tasks(updates: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        批量更新任务（任务列表只拉取一次，并发调用上游，单项失败不影响其他项）
+
+        Args:
+            updates: 更新列表，每项需包含 task_id_or_title，其余字段与 update_task 参数相同，如
+                     [{"task_id_or_title": "xxx", "priority": 5}]
+
+        Returns:
+            {"total", "succeeded", "failed", "results": [{"index", "success", "info", "data"}]}
+        """
+        return batch_update_tasks_logic(updates)
+
+    @server.tool()
+    @request_scoped
+    def batch_complete_tasks(task_ids_or_titles: List[str]) -> Dict[str, Any]:
+        """
+        批量完成任务（任务列表只拉取一次，并发调用上游，单项失败不影响其他项）
+
+        Args:
+            task_ids_or_titles: 任务ID或任务标题列表
+
+        Returns:
+            {"total", "succeeded", "failed", "results": [{"index", "success", "info", "data"}]}
+        """
+        return batch_complete_tasks_logic(task_ids_or_titles)
+
+    @server.tool()
+    @request_scoped
+    def batch_delete_tasks(task_ids_or_titles: List[str]) -> Dict[str, Any]:
+        """
+        批量删除任务（任务列表只拉取一次，并发调用上游，单项失败不影响其他项）
+
+        Args:
+            task_ids_or_titles: 任务ID或任务标题列表
+
+        Returns:
+            {"total", "succeeded", "failed", "results": [{"index", "success", "info", "data"}]}
+        """
+        return batch_delete_tasks_logic(task_ids_or_titles)
+
 # 导出可供外部引用的函数
 __all__ = [
     'get_tasks_logic', 
+    'aggregate_tasks_logic',
     'create_task_logic', 
     'update_task_logic', 
     'delete_task_logic', 
     'complete_task_logic',
+    'sync_completed_tasks_logic',
+    'batch_create_tasks_logic',
+    'batch_update_tasks_logic',
+    'batch_complete_tasks_logic',
+    'batch_delete_tasks_logic',
     'register_task_tools',
     '_get_all_tasks_logic' # 如果需要外部访问
 ] 
\ No newline at end of file
@@ -1,6 +1,13 @@
 """
 CSV文件处理工具
 提供CSV文件的读取、写入、验证和备份功能
+
+日志模式（journal=True）下，单行的追加/更新/删除只向 `<文件>.journal`（JSONL）追加一条操作，
+读取时在 CSV 基础数据上重放日志；日志条数达到阈值时压缩：合并写回 CSV（压缩前备份一次，
+按保留数量清理旧备份）并清空日志。任何模式下读取都会合并已有的日志。
+
+解析后的数据缓存在内存中，按 CSV 与日志文件的 (mtime, size) 判断是否需要重新读取；
+缓存上建有主键索引（默认 id）和可选的二级索引，按键查找为 O(1)。
 """
 
 import os
@@ -9,7 +16,14 @@ import uuid
 import json
 import shutil
 import datetime
-from typing import List, Dict, Any, Optional, Callable
+from typing import List, Dict, Any, Optional, Callable, Tuple
+
+# 日志模式下触发压缩的日志条数
+DEFAULT_COMPACT_THRESHOLD = 200
+# 日志模式下保留的备份数量
+DEFAULT_BACKUP_RETENTION = 10
+# 以 JSON 形式存储的字段
+JSON_FIELDS = ['metrics']
 
 
 class CSVHandler:
@@ -17,7 +31,10 @@ class CSVHandler:
     CSV文件处理类，提供读写、验证和备份功能
     """
     
-    def __init__(self, file_path: str, backup_dir: str = None, required_fields: List[str] = None):
+    def __init__(self, file_path: str, backup_dir: str = None, required_fields: List[str] = None,
+                 journal: bool = False, compact_threshold: int = DEFAULT_COMPACT_THRESHOLD,
+                 backup_retention: Optional[int] = None,
+                 key_field: str = 'id', index_fields: Optional[List[str]] = None):
         """
         初始化CSV处理器
         
@@ -25,9 +42,30 @@ class CSVHandler:
             file_path: CSV文件路径
             backup_dir: 备份目录路径，默认为文件所在目录下的backups文件夹
             required_fields: 必填字段列表
+            journal: 是否使用日志模式（单行操作追加到日志，达到阈值后压缩）
+            compact_threshold: 日志模式下触发压缩的日志条数
+            backup_retention: 保留的备份数量，None 表示不清理；日志模式下默认为 DEFAULT_BACKUP_RETENTION
+            key_field: 主键字段，建立唯一索引（重复时指向第一行）
+            index_fields: 需要建立二级索引的字段
         """
         self.file_path = file_path
         self.required_fields = required_fields or []
+        self.journal = journal
+        self.journal_path = file_path + '.journal'
+        self.compact_threshold = max(1, compact_threshold)
+        if backup_retention is None and journal:
+            backup_retention = DEFAULT_BACKUP_RETENTION
+        self.backup_retention = backup_retention
+        # 日志条数（首次需要时统计）
+        self._journal_entries: Optional[int] = None
+        self.key_field = key_field
+        self.index_fields = [f for f in (index_fields or []) if f != key_field]
+        # 解析缓存：对应的文件状态、表头、行、主键索引（值 -> 行）、二级索引（字段 -> 值 -> 行列表）
+        self._cache_key: Optional[Tuple] = None
+        self._headers: List[str] = []
+        self._rows: List[Dict[str, Any]] = []
+        self._primary: Dict[Any, Dict[str, Any]] = {}
+        self._secondary: Dict[str, Dict[Any, List[Dict[str, Any]]]] = {}
         
         # 设置备份目录
         if backup_dir is None:
@@ -70,42 +108,227 @@ class CSVHandler:
             
     def read_data(self) -> List[Dict[str, Any]]:
         """
-        读取CSV文件数据
+        读取CSV文件数据（存在日志时合并日志中的行操作；文件未变化时直接使用缓存）
         
         Returns:
-            字典列表，每个字典代表一行数据
+            字典列表，每个字典代表一行数据（副本，修改不影响缓存）
         """
+        return [dict(row) for row in self._load()]
+
+    # ---------- 缓存与索引 ----------
+    @staticmethod
+    def _stat(path: str) -> Optional[Tuple[float, int]]:
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def stat_key(self) -> Tuple:
+        """CSV 与日志文件的 (mtime, size)，任一变化即表示数据已变化"""
+        return (self._stat(self.file_path), self._stat(self.journal_path))
+
+    def _load(self) -> List[Dict[str, Any]]:
+        """返回缓存的行（文件变化时重新解析并重建索引）"""
+        key = self.stat_key()
+        if key == self._cache_key:
+            return self._rows
+        headers, data = self._read_base()
+        if key[1] is not None:
+            data = self._replay_journal(data, headers)
+        self._headers, self._rows = headers, data
+        self._primary, self._secondary = {}, {field: {} for field in self.index_fields}
+        for row in data:
+            self._index_row(row)
+        self._cache_key = key
+        return self._rows
+
+    def _index_row(self, row: Dict[str, Any]) -> None:
+        self._primary.setdefault(row.get(self.key_field), row)
+        for field, index in self._secondary.items():
+            index.setdefault(row.get(field), []).append(row)
+
+    def _unindex_row(self, row: Dict[str, Any], fields: Optional[List[str]] = None) -> None:
+        """从索引中移除行（fields 为 None 时移除全部索引字段）"""
+        fields = [self.key_field] + self.index_fields if fields is None else fields
+        if self.key_field in fields:
+            value = row.get(self.key_field)
+            if self._primary.get(value) is row:
+                del self._primary[value]
+                # 主键重复时改为指向剩余的第一行
+                other = next((r for r in self._rows if r is not row and r.get(self.key_field) == value), None)
+                if other is not None:
+                    self._primary[value] = other
+        for field in fields:
+            rows = self._secondary.get(field, {}).get(row.get(field))
+            if rows:
+                rows[:] = [r for r in rows if r is not row]
+
+    def _reindex_value(self, field: str, value: Any) -> None:
+        """按行顺序重建字段某个取值的索引（行改为该值后，与重新读取文件时的索引一致）"""
+        matches = [row for row in self._rows if row.get(field) == value]
+        if field == self.key_field:
+            if matches:
+                self._primary[value] = matches[0]
+        elif field in self._secondary:
+            self._secondary[field][value] = matches
+
+    def _lookup(self, key_field: str, key_value: Any) -> Optional[Dict[str, Any]]:
+        """按字段值查找第一行（主键与二级索引字段为 O(1)，其他字段顺序扫描）"""
+        self._load()
+        return self._find_cached(key_field, key_value)
+
+    def _find_cached(self, key_field: str, key_value: Any) -> Optional[Dict[str, Any]]:
+        """在当前缓存中查找（不检查文件是否变化）"""
+        if key_field == self.key_field:
+            return self._primary.get(key_value)
+        if key_field in self._secondary:
+            matches = self._secondary[key_field].get(key_value)
+            return matches[0] if matches else None
+        return next((row for row in self._rows if row.get(key_field) == key_value), None)
+
+    def _apply_cached(self, entry: Dict[str, Any]) -> None:
+        """把刚写入日志的行操作应用到缓存，避免重新读取文件"""
+        op = entry.get('op')
+        if op == 'append':
+            row = {field: None for field in self._headers}
+            row.update(self._process_row(entry.get('row', {})))
+            self._rows.append(row)
+            self._index_row(row)
+        elif op == 'update':
+            target = self._find_cached(entry['key_field'], entry['key_value'])
+            if target is not None:
+                changes = self._process_row(entry.get('data', {}))
+                fields = [f for f in [self.key_field] + self.index_fields if f in changes and changes[f] != target.get(f)]
+                self._unindex_row(target, fields)
+                target.update(changes)
+                for field in fields:
+                    self._reindex_value(field, target.get(field))
+        elif op == 'delete':
+            key_field, key_value = entry['key_field'], entry['key_value']
+            removed = [row for row in self._rows if row.get(key_field) == key_value]
+            self._rows[:] = [row for row in self._rows if row.get(key_field) != key_value]
+            for row in removed:
+                self._unindex_row(row)
+
+    def _read_base(self) -> Tuple[List[str], List[Dict[str, Any]]]:
+        """读取CSV基础数据，返回 (表头, 行列表)"""
         if not self.file_exists():
-            return []
+            return [], []
             
         data = []
         with open(self.file_path, 'r', encoding='utf-8') as f:
             reader = csv.DictReader(f)
             for row in reader:
-                # 处理可能的空字符串
-                processed_row = {}
-                for key, value in row.items():
-                    if value == '':
-                        processed_row[key] = None
-                    else:
-                        # 尝试解析JSON字段
-                        if key in ['metrics'] and value:
-                            try:
-                                processed_row[key] = json.loads(value)
-                            except json.JSONDecodeError:
-                                processed_row[key] = value
-                        else:
-                            processed_row[key] = value
-                data.append(processed_row)
+                data.append(self._process_row(row))
+            headers = list(reader.fieldnames or [])
+        return headers, data
+
+    @staticmethod
+    def _process_row(row: Dict[str, Any]) -> Dict[str, Any]:
+        """把一行原始值转换为读取结果（空字符串为 None，JSON 字段解析为对象）"""
+        # 处理可能的空字符串
+        processed_row = {}
+        for key, value in row.items():
+            if value == '' or value is None:
+                processed_row[key] = None
+            else:
+                # 尝试解析JSON字段
+                if key in JSON_FIELDS and isinstance(value, str):
+                    try:
+                        processed_row[key] = json.loads(value)
+                    except json.JSONDecodeError:
+                        processed_row[key] = value
+                elif key in JSON_FIELDS and isinstance(value, (dict, list)):
+                    processed_row[key] = value
+                elif isinstance(value, (str, list)):
+                    processed_row[key] = value
+                else:
+                    # 日志中的数字等值转为字符串，与写入CSV再读回的结果一致
+                    processed_row[key] = str(value)
+        return processed_row
+
+    # ---------- 日志模式 ----------
+    def _replay_journal(self, data: List[Dict[str, Any]], headers: List[str]) -> List[Dict[str, Any]]:
+        """在基础数据上按顺序重放日志中的行操作"""
+        with open(self.journal_path, 'r', encoding='utf-8') as f:
+            entries = 0
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # 跳过写入中断产生的残缺行
+                    continue
+                entries += 1
+                op = entry.get('op')
+                if op == 'append':
+                    row = {field: None for field in headers}
+                    row.update(self._process_row(entry.get('row', {})))
+                    data.append(row)
+                elif op == 'update':
+                    key_field, key_value = entry.get('key_field'), entry.get('key_value')
+                    for i, row in enumerate(data):
+                        if row.get(key_field) == key_value:
+                            data[i] = {**row, **self._process_row(entry.get('data', {}))}
+                            break
+                elif op == 'delete':
+                    key_field, key_value = entry.get('key_field'), entry.get('key_value')
+                    data = [row for row in data if row.get(key_field) != key_value]
+        self._journal_entries = entries
         return data
+
+    def _count_journal(self) -> int:
+        if self._journal_entries is None:
+            try:
+                with open(self.journal_path, 'r', encoding='utf-8') as f:
+                    self._journal_entries = sum(1 for line in f if line.strip())
+            except FileNotFoundError:
+                self._journal_entries = 0
+        return self._journal_entries
+
+    def _append_journal(self, entry: Dict[str, Any]) -> None:
+        """追加一条行操作，日志条数达到阈值时压缩"""
+        count = self._count_journal()
+        cache_fresh = self._cache_key is not None and self._cache_key == self.stat_key()
+        with open(self.journal_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, ensure_ascii=False, default=str) + '\n')
+        self._journal_entries = count + 1
+        if cache_fresh:
+            # 缓存与写入前的文件一致：增量应用本次操作
+            self._apply_cached(entry)
+            self._cache_key = self.stat_key()
+        if self._journal_entries >= self.compact_threshold:
+            self.compact()
+
+    def compact(self) -> None:
+        """
+        压缩日志：把合并后的数据写回CSV（写入前备份一次），然后清空日志
+        """
+        if not os.path.exists(self.journal_path):
+            return
+        headers, _ = self._read_base()
+        data = self.read_data()
+        self.write_data(data, validate=False, headers=headers)
+
+    def _clear_journal(self) -> None:
+        try:
+            os.remove(self.journal_path)
+        except FileNotFoundError:
+            pass
+        self._journal_entries = 0
         
-    def write_data(self, data: List[Dict[str, Any]], validate: bool = True) -> None:
+    def write_data(self, data: List[Dict[str, Any]], validate: bool = True,
+                   headers: Optional[List[str]] = None) -> None:
         """
-        写入数据到CSV文件
+        写入数据到CSV文件（整体覆盖，已有日志随之清空）
         
         Args:
             data: 要写入的数据，字典列表
             validate: 是否验证数据
+            headers: 表头顺序，未提供时由数据字段决定
         """
         if validate:
             self._validate_data(data)
@@ -115,6 +338,13 @@ class CSVHandler:
         
         # 准备写入，如果文件不存在则创建
         if not data:
+            if os.path.exists(self.journal_path) and self.file_exists():
+                # 日志中的行已被全部删除：只保留表头
+                base_headers, _ = self._read_base()
+                with open(self.file_path, 'w', newline='', encoding='utf-8') as f:
+                    csv.writer(f).writerow(headers or base_headers)
+                self._clear_journal()
+                self._cache_key = None
             return
             
         # 获取所有字段（表头）
@@ -127,10 +357,14 @@ class CSVHandler:
             if field not in all_fields:
                 raise ValueError(f"必填字段 '{field}' 缺失")
                 
-        headers = list(all_fields)
+        if headers:
+            headers = list(headers) + [field for field in all_fields if field not in headers]
+        else:
+            headers = list(all_fields)
         
-        # 写入数据
-        with open(self.file_path, 'w', newline='', encoding='utf-8') as f:
+        # 写入数据（先写临时文件再替换，避免写入中断损坏原文件）
+        tmp_path = self.file_path + '.tmp'
+        with open(tmp_path, 'w', newline='', encoding='utf-8') as f:
             writer = csv.DictWriter(f, fieldnames=headers)
             writer.writeheader()
             
@@ -140,11 +374,15 @@ class CSVHandler:
                 for key, value in row.items():
                     if value is None:
                         processed_row[key] = ''
-                    elif key in ['metrics'] and isinstance(value, (dict, list)):
+                    elif key in JSON_FIELDS and isinstance(value, (dict, list)):
                         processed_row[key] = json.dumps(value, ensure_ascii=False)
                     else:
                         processed_row[key] = value
                 writer.writerow(processed_row)
+        os.replace(tmp_path, self.file_path)
+        # 基础数据已包含日志中的全部操作
+        self._clear_journal()
+        self._cache_key = None
                 
     def _validate_data(self, data: List[Dict[str, Any]]) -> None:
         """
@@ -180,6 +418,22 @@ class CSVHandler:
         
         # 复制文件
         shutil.copy2(self.file_path, backup_path)
+        self._prune_backups()
+
+    def _prune_backups(self) -> None:
+        """按保留数量删除最旧的备份（backup_retention 为 None 时不清理）"""
+        if self.backup_retention is None:
+            return
+        name, ext = os.path.splitext(os.path.basename(self.file_path))
+        backups = sorted(
+            f for f in os.listdir(self.backup_dir)
+            if f.startswith(f"{name}_") and f.endswith(ext)
+        )
+        for stale in backups[:max(len(backups) - self.backup_retention, 0)]:
+            try:
+                os.remove(os.path.join(self.backup_dir, stale))
+            except OSError:
+                pass
         
     def validate_file(self) -> bool:
         """
@@ -206,6 +460,11 @@ class CSVHandler:
             row: 要追加的数据行
             validate: 是否验证数据
         """
+        if self.journal:
+            if validate:
+                self._validate_data([row])
+            self._append_journal({"op": "append", "row": row})
+            return
         data = self.read_data()
         data.append(row)
         self.write_data(data, validate=validate)
@@ -224,6 +483,16 @@ class CSVHandler:
         Returns:
             是否成功更新了数据
         """
+        if self.journal:
+            # 日志模式只需按索引确认目标行存在
+            row = self._lookup(key_field, key_value)
+            if row is None:
+                return False
+            if validate:
+                self._validate_data([{**row, **new_data}])
+            self._append_journal({"op": "update", "key_field": key_field, "key_value": key_value, "data": new_data})
+            return True
+
         data = self.read_data()
         updated = False
         
@@ -250,6 +519,12 @@ class CSVHandler:
         Returns:
             是否成功删除了数据
         """
+        if self.journal:
+            if self._lookup(key_field, key_value) is None:
+                return False
+            self._append_journal({"op": "delete", "key_field": key_field, "key_value": key_value})
+            return True
+
         data = self.read_data()
         original_len = len(data)
         
@@ -271,8 +546,27 @@ class CSVHandler:
         Returns:
             满足条件的行列表
         """
-        data = self.read_data()
-        return [row for row in data if filter_func(row)]
+        return [dict(row) for row in self._load() if filter_func(row)]
+
+    def find_by(self, field: str, value: Any) -> List[Dict[str, Any]]:
+        """
+        查找字段等于指定值的全部行（主键与二级索引字段直接读取索引；主键按唯一处理）
+        
+        Args:
+            field: 字段名
+            value: 字段值
+            
+        Returns:
+            满足条件的行列表
+        """
+        rows = self._load()
+        if field == self.key_field:
+            matches = [self._primary[value]] if value in self._primary else []
+        elif field in self._secondary:
+            matches = self._secondary[field].get(value, [])
+        else:
+            matches = [row for row in rows if row.get(field) == value]
+        return [dict(row) for row in matches]
     
     def get_row(self, key_field: str, key_value: str) -> Optional[Dict[str, Any]]:
         """
@@ -285,11 +579,27 @@ class CSVHandler:
         Returns:
             找到的行数据，未找到则返回None
         """
-        data = self.read_data()
-        for row in data:
-            if row.get(key_field) == key_value:
-                return row
-        return None
+        row = self._lookup(key_field, key_value)
+        return dict(row) if row is not None else None
+
+
+# 目标CSV的必填字段与表头
+GOAL_REQUIRED_FIELDS = ['id', 'title', 'type', 'status', 'created_time',
+                        'modified_time', 'keywords', 'progress']
+GOAL_HEADERS = ['id', 'title', 'description', 'type', 'status',
+                'created_time', 'modified_time', 'start_date', 'due_date',
+                'frequency', 'keywords', 'progress', 'related_projects', 'metrics']
+
+
+def goal_csv_handler(file_path: str = 'data/goals.csv') -> CSVHandler:
+    """
+    目标CSV的处理器：日志模式（单行写入只追加日志），以 id 为主键，按 type、status 建立二级索引
+    
+    Args:
+        file_path: CSV文件路径
+    """
+    return CSVHandler(file_path, required_fields=GOAL_REQUIRED_FIELDS, journal=True,
+                      key_field='id', index_fields=['type', 'status'])
 
 
 def create_default_goal_csv(file_path: str = 'data/goals.csv') -> None:
@@ -299,17 +609,10 @@ def create_default_goal_csv(file_path: str = 'data/goals.csv') -> None:
     Args:
         file_path: CSV文件路径
     """
-    required_fields = ['id', 'title', 'type', 'status', 'created_time', 
-                      'modified_time', 'keywords', 'progress']
-    
-    headers = ['id', 'title', 'description', 'type', 'status', 
-              'created_time', 'modified_time', 'start_date', 'due_date',
-              'frequency', 'keywords', 'progress', 'related_projects', 'metrics']
-    
-    handler = CSVHandler(file_path, required_fields=required_fields)
+    handler = goal_csv_handler(file_path)
     
     if not handler.file_exists():
-        handler.create_file(headers)
+        handler.create_file(GOAL_HEADERS)
         print(f"已创建默认目标CSV文件: {file_path}")
     else:
         print(f"目标CSV文件已存在: {file_path}")
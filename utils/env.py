@@ -0,0 +1,24 @@
+"""
+.env 加载
+
+入口模块在导入 tools 之前调用 load_dotenv_once()：各模块在导入时读取环境变量
+（如 DIDA_BATCH_CONCURRENCY、DIDA_ANALYTICS_TTL），之后再加载 .env 不会生效。
+本模块不依赖 tools 包，导入不会触发工具模块的初始化。
+"""
+
+_dotenv_loaded = False
+
+
+def load_dotenv_once() -> None:
+    """加载 .env（进程内只执行一次，多个入口模块可安全重复调用）"""
+    global _dotenv_loaded
+    if _dotenv_loaded:
+        return
+    import dotenv
+    dotenv.load_dotenv()
+    _dotenv_loaded = True
+
+
+__all__ = [
+    "load_dotenv_once",
+]
@@ -0,0 +1,100 @@
+"""
+多关键词匹配（Aho–Corasick 自动机）
+一次扫描文本即可找出全部命中的关键词及其关联对象，耗时与关键词数量无关
+"""
+
+from collections import deque
+from typing import Dict, Hashable, Iterable, List, Set, Tuple
+
+
+class KeywordAutomaton:
+    """
+    Aho–Corasick 自动机：关键词 -> 关联值（如目标ID）
+
+    先 add 全部关键词再 build；build 之后 find 在一次遍历中返回所有命中关键词的关联值。
+    匹配为子串语义，与 `keyword in text` 一致（调用方负责统一大小写）。
+    """
+
+    def __init__(self, keywords: Iterable[Tuple[str, Hashable]] = ()):
+        """
+        Args:
+            keywords: 可选的 (关键词, 关联值) 序列，提供时直接构建
+        """
+        # 每个状态：子节点转移、失败指针、输出（本状态及其后缀状态上的关联值）
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Set[Hashable]] = [set()]
+        self._built = False
+        self._size = 0
+        pairs = list(keywords)
+        if pairs:
+            for keyword, value in pairs:
+                self.add(keyword, value)
+            self.build()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, keyword: str, value: Hashable) -> None:
+        """
+        添加关键词（空关键词忽略）
+
+        Args:
+            keyword: 关键词
+            value: 命中时返回的关联值
+        """
+        if not keyword:
+            return
+        state = 0
+        for ch in keyword:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(set())
+            state = nxt
+        self._out[state].add(value)
+        self._size += 1
+        self._built = False
+
+    def build(self) -> None:
+        """按广度优先计算失败指针，并把后缀状态的输出合并到各状态"""
+        queue = deque(self._goto[0].values())
+        for state in queue:
+            self._fail[state] = 0
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt] |= self._out[self._fail[nxt]]
+                queue.append(nxt)
+        self._built = True
+
+    def find(self, text: str) -> Set[Hashable]:
+        """
+        扫描文本
+
+        Args:
+            text: 待匹配文本
+
+        Returns:
+            所有命中关键词的关联值集合
+        """
+        if not self._built:
+            self.build()
+        goto, fail, out = self._goto, self._fail, self._out
+        found: Set[Hashable] = set()
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                found |= out[state]
+        return found
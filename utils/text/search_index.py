@@ -0,0 +1,254 @@
+"""
+全文检索倒排索引
+以 jieba 分词结果加中文字符 unigram/bigram、英文数字 trigram 作为词项，支持增量增删与 TF-IDF 排序。
+子串检索（candidates）只依赖字符 n-gram：文本包含查询串时必然包含查询串的全部 n-gram，
+因此候选集合不会漏掉子串命中，调用方再以子串匹配确认即可。
+"""
+
+import re
+import math
+import threading
+from collections import Counter
+from typing import Dict, List, Optional, Set, Tuple
+
+from .text_analysis import segment_text
+
+# 连续中文字符片段
+_CJK_RUN = re.compile(r'[一-龥]+')
+# 英文单词与数字
+_WORD = re.compile(r'[a-z0-9]+')
+
+
+def _char_grams(text: str) -> List[str]:
+    """中文片段的字符 unigram 与 bigram"""
+    grams = []
+    for run in _CJK_RUN.findall(text):
+        grams.extend(run)
+        grams.extend(run[i:i + 2] for i in range(len(run) - 1))
+    return grams
+
+
+def _word_grams(text: str) -> List[str]:
+    """英文数字片段的字符 trigram（不足 3 个字符的片段不产生 trigram）"""
+    grams = []
+    for run in _WORD.findall(text):
+        grams.extend(run[i:i + 3] for i in range(len(run) - 2))
+    return grams
+
+
+def index_terms(text: str, tokens: Optional[List[str]] = None, segment: bool = True) -> List[str]:
+    """
+    生成文档词项：jieba 分词结果 + 中文字符 unigram/bigram + 英文单词与 trigram（统一小写）
+
+    Args:
+        text: 文档文本
+        tokens: 已有的分词结果（如来自缓存），未提供时调用 segment_text
+        segment: 是否加入分词结果（False 时不加载 jieba，只生成字符 n-gram 与英文单词）
+
+    Returns:
+        词项列表（含重复，用于计算词频）
+    """
+    if not text:
+        return []
+    lowered = text.lower()
+    terms = []
+    if segment:
+        if tokens is None:
+            tokens = segment_text(lowered)
+        terms = [t.lower() for t in tokens]
+    terms.extend(_char_grams(lowered))
+    terms.extend(_WORD.findall(lowered))
+    terms.extend(_word_grams(lowered))
+    return terms
+
+
+def substring_terms(query: str) -> Set[str]:
+    """
+    子串匹配必需的词项：包含 query（忽略大小写）作为子串的文本一定包含这些词项
+
+    Returns:
+        中文片段的 bigram（单字片段为 unigram）与英文数字片段的 trigram；
+        为空时（如查询只有 1-2 个英文字母）索引无法缩小候选范围
+    """
+    lowered = (query or '').lower()
+    terms: Set[str] = set()
+    for run in _CJK_RUN.findall(lowered):
+        if len(run) == 1:
+            terms.add(run)
+        else:
+            terms.update(run[i:i + 2] for i in range(len(run) - 1))
+    terms.update(_word_grams(lowered))
+    return terms
+
+
+def query_terms(query: str, segment: bool = True) -> Tuple[Set[str], Set[str]]:
+    """
+    解析查询
+
+    Args:
+        query: 查询文本
+        segment: 是否对查询分词生成 optional 词项
+
+    Returns:
+        (required, optional)：required 为必须全部命中的词项（中文 bigram，单字时为 unigram；英文单词），
+        optional 为仅参与打分的分词结果
+    """
+    lowered = (query or '').lower()
+    required: Set[str] = set()
+    for run in _CJK_RUN.findall(lowered):
+        if len(run) == 1:
+            required.add(run)
+        else:
+            required.update(run[i:i + 2] for i in range(len(run) - 1))
+    required.update(_WORD.findall(lowered))
+    optional = set(t.lower() for t in segment_text(lowered)) - required if segment else set()
+    return required, optional
+
+
+class InvertedIndex:
+    """
+    倒排索引：词项 -> {文档ID: 词频}
+
+    search：required 词项全部命中的文档才算匹配，再按 TF-IDF 对全部查询词项打分排序
+    （中文 bigram 全命中不保证连续、英文按整词匹配，结果只是子串匹配的近似）。
+    candidates：子串检索的候选集合，保证不漏，需以子串匹配确认。
+    """
+
+    def __init__(self, segment: bool = True):
+        """
+        初始化
+
+        Args:
+            segment: 是否以 jieba 分词结果作为词项（False 时不加载 jieba，search 只按字符 n-gram 与单词打分）
+        """
+        self.segment = segment
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._doc_terms: Dict[str, Counter] = {}
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._doc_terms)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._doc_terms
+
+    def add(self, doc_id: str, text: str, tokens: Optional[List[str]] = None) -> None:
+        """
+        新增或替换文档
+
+        Args:
+            doc_id: 文档ID
+            text: 文档文本
+            tokens: 已有的分词结果，可选
+        """
+        self.add_terms(doc_id, index_terms(text, tokens, self.segment))
+
+    def add_terms(self, doc_id: str, terms: List[str]) -> None:
+        """以已生成的词项新增或替换文档"""
+        counts = Counter(terms)
+        with self._lock:
+            self._remove_locked(doc_id)
+            self._doc_terms[doc_id] = counts
+            for term, tf in counts.items():
+                self._postings.setdefault(term, {})[doc_id] = tf
+
+    def remove(self, doc_id: str) -> None:
+        """删除文档（不存在时忽略）"""
+        with self._lock:
+            self._remove_locked(doc_id)
+
+    def _remove_locked(self, doc_id: str) -> None:
+        counts = self._doc_terms.pop(doc_id, None)
+        if not counts:
+            return
+        for term in counts:
+            posting = self._postings.get(term)
+            if posting is not None:
+                posting.pop(doc_id, None)
+                if not posting:
+                    del self._postings[term]
+
+    def clear(self) -> None:
+        """清空索引"""
+        with self._lock:
+            self._postings.clear()
+            self._doc_terms.clear()
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[Tuple[str, float]]:
+        """
+        检索文档
+
+        Args:
+            query: 查询文本
+            limit: 返回数量上限，None 表示全部
+
+        Returns:
+            [(文档ID, 得分)]，按得分降序
+        """
+        required, optional = query_terms(query, self.segment)
+        if not required and not optional:
+            return []
+
+        with self._lock:
+            total_docs = len(self._doc_terms) or 1
+
+            # 从最短的倒排表开始求交集
+            if required:
+                postings = [self._postings.get(term) for term in required]
+                if any(not p for p in postings):
+                    return []
+                postings.sort(key=len)
+                candidates = set(postings[0])
+                for posting in postings[1:]:
+                    candidates.intersection_update(posting)
+                    if not candidates:
+                        return []
+            else:
+                candidates = set()
+                for term in optional:
+                    candidates.update(self._postings.get(term, ()))
+
+            scores: Dict[str, float] = dict.fromkeys(candidates, 0.0)
+            for term in required | optional:
+                posting = self._postings.get(term)
+                if not posting:
+                    continue
+                idf = math.log(1 + total_docs / len(posting))
+                for doc_id in candidates.intersection(posting) if len(posting) > len(candidates) else posting:
+                    if doc_id in scores:
+                        scores[doc_id] += posting[doc_id] * idf
+
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        return ranked[:limit] if limit else ranked
+
+    def candidates(self, query: str) -> Optional[Dict[str, float]]:
+        """
+        子串检索的候选文档
+
+        Args:
+            query: 查询串
+
+        Returns:
+            {文档ID: TF-IDF 得分}，包含全部 substring_terms 的文档（子串命中的文档必在其中）；
+            查询没有可用词项时返回 None，调用方需逐个文档匹配
+        """
+        terms = substring_terms(query)
+        if not terms:
+            return None
+        with self._lock:
+            postings = [self._postings.get(term) for term in terms]
+            if any(not p for p in postings):
+                return {}
+            postings.sort(key=len)
+            matched = set(postings[0])
+            for posting in postings[1:]:
+                matched.intersection_update(posting)
+                if not matched:
+                    return {}
+            total_docs = len(self._doc_terms) or 1
+            scores = dict.fromkeys(matched, 0.0)
+            for posting in postings:
+                idf = math.log(1 + total_docs / len(posting))
+                for doc_id in matched:
+                    scores[doc_id] += posting[doc_id] * idf
+        return scores
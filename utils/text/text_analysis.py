@@ -3,16 +3,88 @@
 提供分词、关键词提取和相似度计算功能
 """
 
+import os
 import re
 import math
-import jieba
-import jieba.analyse
+import atexit
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from typing import List, Dict, Tuple, Set, Optional, Union, Any
 from collections import Counter
 
 
-# 确保jieba加载完成
-jieba.setLogLevel(20)  # 设置日志级别为INFO，避免过多的输出
+# jieba 前缀词典缓存文件（默认放在可写的 data/ 卷中，跨重启复用；置空则使用 jieba 默认的临时目录）
+JIEBA_CACHE_FILE = os.getenv("DIDA_JIEBA_CACHE", "data/jieba.cache")
+
+_jieba = None
+# 最近一次初始化失败的原因（仅用于错误信息；失败后下次调用会重新初始化）
+_jieba_error: Optional[Exception] = None
+_jieba_thread: Optional[threading.Thread] = None
+_jieba_lock = threading.Lock()
+
+
+def _configure_jieba_cache(jieba) -> None:
+    """把前缀词典缓存指向 JIEBA_CACHE_FILE；目录无法创建时沿用 jieba 默认的临时目录"""
+    if not JIEBA_CACHE_FILE:
+        return
+    cache_path = os.path.abspath(JIEBA_CACHE_FILE)
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    except OSError as e:
+        print(f"jieba 缓存目录不可用，使用默认临时目录: {e}")
+        return
+    jieba.dt.tmp_dir = os.path.dirname(cache_path)
+    jieba.dt.cache_file = os.path.basename(cache_path)
+
+
+def _load_jieba() -> None:
+    """导入 jieba 并构建前缀词典（含 TF-IDF 关键词提取所需的 IDF 词典）；失败时允许下次重新初始化"""
+    global _jieba, _jieba_error, _jieba_thread
+    try:
+        import jieba
+        jieba.setLogLevel(20)  # 设置日志级别为INFO，避免过多的输出
+        _configure_jieba_cache(jieba)
+        jieba.initialize()
+        import jieba.analyse  # noqa: F401
+        _jieba = jieba
+    except Exception as e:
+        _jieba_error = e
+        print(f"jieba 初始化失败: {e}")
+        with _jieba_lock:
+            _jieba_thread = None
+
+
+def preload_jieba() -> threading.Thread:
+    """
+    在后台线程中初始化 jieba（同一时间只有一个初始化线程），服务启动时调用，
+    避免首次分词的词典构建耗时落在用户请求上
+    
+    Returns:
+        初始化线程
+    """
+    global _jieba_thread
+    with _jieba_lock:
+        if _jieba_thread is None:
+            _jieba_thread = threading.Thread(target=_load_jieba, name="jieba-preload", daemon=True)
+            _jieba_thread.start()
+        return _jieba_thread
+
+
+def get_jieba():
+    """
+    获取已初始化的 jieba 模块
+    
+    初始化进行中时等待其完成，不会重复初始化；未初始化或上次初始化失败时在此重新触发。
+    
+    Returns:
+        jieba 模块
+    """
+    if _jieba is None:
+        preload_jieba().join()
+    if _jieba is None:
+        raise RuntimeError(f"jieba 初始化失败: {_jieba_error}")
+    return _jieba
 
 # 停用词集
 STOP_WORDS = set([
@@ -65,7 +137,7 @@ def segment_text(text: str, stop_words: Optional[Set[str]] = None) -> List[str]:
     text = clean_text(text)
     
     # 使用jieba分词
-    seg_list = jieba.cut(text)
+    seg_list = get_jieba().cut(text)
     
     # 过滤停用词和空字符
     filtered_words = []
@@ -76,6 +148,77 @@ def segment_text(text: str, stop_words: Optional[Set[str]] = None) -> List[str]:
     return filtered_words
 
 
+# 批量分词时启用多进程的最小文本数（小批量直接在当前进程分词，避免进程间传输开销）
+PARALLEL_SEGMENT_MIN_TEXTS = int(os.environ.get("DIDA_PARALLEL_SEGMENT_MIN", "2000"))
+# 分词进程数，默认使用全部 CPU
+SEGMENT_WORKERS = int(os.environ.get("DIDA_SEGMENT_WORKERS", "0")) or (os.cpu_count() or 1)
+
+_segment_pool: Optional[ProcessPoolExecutor] = None
+_segment_pool_lock = threading.Lock()
+
+
+def _init_segment_worker() -> None:
+    """分词进程初始化：每个进程只加载一次 jieba 词典（读取共享的词典缓存）"""
+    get_jieba()
+
+
+def _segment_chunk(texts: List[str], stop_words: Optional[Set[str]] = None) -> List[List[str]]:
+    return [segment_text(text, stop_words) for text in texts]
+
+
+def _get_segment_pool() -> ProcessPoolExecutor:
+    global _segment_pool
+    with _segment_pool_lock:
+        if _segment_pool is None:
+            # 使用 spawn，避免在多线程服务进程中 fork
+            _segment_pool = ProcessPoolExecutor(
+                max_workers=SEGMENT_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_segment_worker,
+            )
+            atexit.register(_segment_pool.shutdown, wait=False)
+        return _segment_pool
+
+
+def _discard_segment_pool() -> None:
+    global _segment_pool
+    with _segment_pool_lock:
+        if _segment_pool is not None:
+            _segment_pool.shutdown(wait=False)
+            _segment_pool = None
+
+
+def segment_many(texts: List[str], stop_words: Optional[Set[str]] = None) -> List[List[str]]:
+    """
+    批量分词，文本数达到 PARALLEL_SEGMENT_MIN_TEXTS 时按块分发到进程池并行处理
+    
+    Args:
+        texts: 文本列表
+        stop_words: 停用词集合，如果未提供则使用默认停用词
+    
+    Returns:
+        与 texts 一一对应的分词结果列表
+    """
+    texts = list(texts)
+    if len(texts) < PARALLEL_SEGMENT_MIN_TEXTS or SEGMENT_WORKERS <= 1:
+        return _segment_chunk(texts, stop_words)
+    
+    # 每个进程分到若干块，兼顾负载均衡与传输次数
+    chunk_size = max(1, math.ceil(len(texts) / (SEGMENT_WORKERS * 4)))
+    chunks = [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+    try:
+        pool = _get_segment_pool()
+        results: List[List[str]] = []
+        for chunk_result in pool.map(_segment_chunk, chunks, [stop_words] * len(chunks)):
+            results.extend(chunk_result)
+        return results
+    except Exception as e:
+        # 进程池不可用（如受限环境或工作进程异常退出）时丢弃进程池并退回单进程
+        print(f"并行分词失败，退回单进程: {e}")
+        _discard_segment_pool()
+        return _segment_chunk(texts, stop_words)
+
+
 def clean_text(text: str) -> str:
     """
     清理文本，去除特殊字符和多余空格
@@ -114,7 +257,7 @@ def extract_keywords(text: str, top_k: int = 10, with_weight: bool = False) -> U
         return [] if not with_weight else []
     
     # 使用TF-IDF算法提取关键词
-    keywords = jieba.analyse.extract_tags(text, topK=top_k, withWeight=with_weight)
+    keywords = get_jieba().analyse.extract_tags(text, topK=top_k, withWeight=with_weight)
     
     return keywords
 
@@ -132,18 +275,16 @@ def extract_keywords_from_tasks(tasks: List[Dict[str, Any]], fields: List[str] =
     Returns:
         关键词频率字典
     """
-    # 合并所有文本
-    all_text = ""
-    for task in tasks:
-        for field in fields:
-            if field in task and task[field]:
-                all_text += task[field] + " "
-    
-    # 分词
-    words = segment_text(all_text)
-    
-    # 统计词频
-    word_counts = Counter(words)
+    # 逐任务拼接文本
+    texts = [
+        " ".join(task[field] for field in fields if field in task and task[field])
+        for task in tasks
+    ]
+    
+    # 批量分词并统计词频
+    word_counts = Counter()
+    for words in segment_many(texts):
+        word_counts.update(words)
     
     # 返回出现频率最高的词
     return dict(word_counts.most_common(top_k))